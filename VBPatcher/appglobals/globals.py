@@ -1,90 +1,5 @@
 from datetime import datetime
 
-import bs4
-import requests as req
-from requests import Response
-
-
-class _PatcherAssets:
-    """Wrapper for retrieving necessary patcher assets.
-
-    ---
-
-    Contained Methods:
-
-        - :func:`_get_stable_assets(url, mode) -> str`
-            - Send GET request to retrieve BepInEx stable build assets, depending on value passed to :param:`mode`.
-            - Static method.
-
-        - :func:`_get_dev_assets(url, mode) -> str`
-            - Send GET request to retrieve BepInEx dev/bleeding-edge build assets, depending on value passed to :param:`mode`.
-            - Static method.
-    """
-
-    @staticmethod
-    def _get_stable_assets(url: str, mode: int) -> str:
-        """Send GET request to retrieve BepInEx stable build assets, depending on value passed to :param:`mode`.
-
-        - If :param:`mode` == `1`, get patch archive download link.
-        - If :param:`mode` != `1`, get patch version number as string.
-
-        ---
-
-        :param url: URL for the new :class:`Request` object.
-        :type url: :class:`str` | :class:`PathLike`
-        :param mode: specifies which values to retrieve from response.
-        :type mode: :class:`int`
-        :return: response content from GET request.
-        :rtype: :class:`str`
-        """
-
-        r: Response = req.get(url, 'html.parser')  # Send GET request.
-        r.raise_for_status()  # Raise exception if response is not 200.
-
-        dl_link: str = r.json()['assets'][1][
-            'browser_download_url']  # Get download link.
-        patch_ver: str = r.json()['assets'][1]['name'][
-            12:20]  # Get patch version.
-
-        return dl_link if mode == 1 else patch_ver
-
-    @staticmethod
-    def _get_dev_assets(url: str, mode: int) -> str:
-        """Send GET request to retrieve BepInEx dev/bleeding-edge build assets, depending on value passed to :param:`mode`.
-
-        - If :param:`mode` == `1`, get patch archive download link.
-        - If :param:`mode` != `1`, get patch version number as string.
-
-        ---
-
-        :param url: URL for the new :class:`Request` object.
-        :type url: :class:`str` | :class:`PathLike`
-        :param mode: specifies values to retrieve from response.
-        :type mode: :class:`int`
-        :return: response content from GET request.
-        :rtype: :class:`str`
-        """
-
-        retrieved: int = 0
-
-        r: Response = req.get(url)  # Send GET request.
-        r.raise_for_status()  # Raise exception if error code is returned.
-
-        soup = bs4.BeautifulSoup(r.content,
-                                 'html.parser')  # Parse response HTML.
-        results = soup.find_all(
-            'div', class_="artifacts-list"
-        )  # Get all <div> tags with class="artifacts-list".
-
-        for result in results:
-            if retrieved < 1:  # Only get 2nd <div> tag.
-                link = result.find_all('a')[1]['href']  # Get download link.
-                retrieved += 1
-
-        dl_link = (f'{url[:26]}{link}')  # Combine URL and download link.
-
-        return dl_link if mode == 1 else dl_link[93:100]
-
 
 class _Getch:
     """Retrieve single character from standard input. Does not echo to the screen.
@@ -137,33 +52,98 @@ __version__: str = '0.9.0'  # Current program version number
 
 getch: _Getch = _Getch()  # Initialized `_Getch` instance.
 
-patch_stable: str = r'.\patch-files\stable'  # Stable patch file location
+patch_stable: str = './patch-files/stable'  # Stable patch download location
+
+patch_dev: str = './patch-files/development'  # Development patch download location
+
+patch_store: str = './patch-files/store'  # Content-addressed patch file store
+
+patch_hotfix: list[str] = []  # Hotfix directories overlaid by full patch
 
-url_stable: str = _PatcherAssets._get_stable_assets(
-    'http://api.github.com/repos/BepInEx/BepInEx/releases/latest',
-    1)  # stable release download link
+store_max_bytes: int = 512 * 1024 * 1024  # Size limit of stored patch files (512 MB)
 
-ver_stable: str = _PatcherAssets._get_stable_assets(
-    'http://api.github.com/repos/BepInEx/BepInEx/releases/latest',
-    2)  # stable release version
+store_max_age: int = 30 * 24 * 60 * 60  # Seconds before an unused stored patch version is evicted (30 days)
 
-patch_dev: str = r'.\patch-files\development'  # Development patch file location
+api_stable: str = 'http://api.github.com/repos/BepInEx/BepInEx/releases/latest'  # stable release metadata source
 
-url_dev: str = _PatcherAssets._get_dev_assets(
-    'https://builds.bepinex.dev/projects/bepinex_be',
-    1)  # dev/bleeding-edge build download link
+api_dev: str = 'https://builds.bepinex.dev/projects/bepinex_be'  # dev/bleeding-edge build metadata source
 
-ver_dev: str = _PatcherAssets._get_dev_assets(
-    'https://builds.bepinex.dev/projects/bepinex_be',
-    2)  # dev/bleeding-edge build number
+metadata_cache: str = './cache/metadata.json'  # Release metadata cache file
+
+metadata_ttl: int = 900  # Seconds before cached release metadata is revalidated
+
+http_connect_timeout: float = 5  # Seconds to wait for a connection to any server
+
+http_read_timeout: float = 30  # Seconds to wait for each read from a server
+
+http_retries: int = 4  # Retries of a failed request (connection error, timeout, 5xx, rate limit)
+
+http_backoff: float = 0.5  # Seconds before the first retry, doubled (with jitter) for each further one
+
+http_backoff_max: float = 30  # Longest wait before a retry; servers asking for longer aren't retried
+
+mirror_url: str = ''  # Base URL of a LAN mirror started with `vbpatcher serve` (e.g. 'http://192.168.1.10:8765'), '' for upstream only
+
+mirror_port: int = 8765  # Port `vbpatcher serve` listens on
+
+extract_workers: int = 4  # Archive members decompressed concurrently during extraction
+
+extract_parallel_min: int = 8 * 1024 * 1024  # Uncompressed bytes to extract before members are decompressed concurrently (always sequential on one CPU)
+
+deploy_cache: str = './cache/targets'  # Cached manifests of deployed target directories
+
+deploy_workers: int = 8  # Patch files copied concurrently during deployment
+
+deploy_mode: str = 'copy'  # 'link' to reflink/hardlink patch files from the patch store where possible
+
+snapshot_keep: int = 3  # Deployments that can be rolled back, per target directory
 
 patch_targetDir: str = r'C:\Program Files (x86)\Steam\steamapps\common\Valheim'  # target directory to patch
 
+patch_targets: list[str] = []  # Further Valheim installs (e.g. dedicated servers) patched along with `patch_targetDir`, in the same pass
+
+launch_cmd: str = r'"C:\Program Files (x86)\Steam\Steam.exe" -applaunch 892970'  # Command starting Valheim through Steam; quote paths containing spaces
+
 log_fh: str = r'.\logs\VBPatcherLog.log'  # Log file path
 
+log_max_bytes: int = 1024 * 1024  # Size at which the log file is rotated (1 MB)
+
+log_backups: int = 5  # Rotated, gzip-compressed log segments kept
+
 datefmt: str = datetime.now().strftime(
     "%Y-%m-%d %H:%M:%S"
 )  # Date and time format to display when starting program.
 
 textborder: str = "=".ljust((78),
                             "=")  # Text border for log file organization.
+
+_lazy_assets: dict[str, tuple[str, int]] = {
+    'url_stable': ('stable', 0),  # stable release download link
+    'ver_stable': ('stable', 1),  # stable release version
+    'url_dev': ('dev', 0),  # dev/bleeding-edge build download link
+    'ver_dev': ('dev', 1),  # dev/bleeding-edge build number
+}
+
+
+def __getattr__(name: str) -> str:
+    """Lazily resolve release metadata globals (`url_stable`, `ver_stable`, `url_dev`, `ver_dev`) on first access.
+
+    - Metadata is only requested once a value is actually needed, then cached on the module for the rest of the process.
+
+    ---
+
+    :param name: name of the requested module attribute.
+    :type name: :class:`str`
+    :return: resolved release metadata value.
+    :rtype: :class:`str`
+    """
+
+    if name not in _lazy_assets:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    from VBPatcher.metadata.metadata import resolver
+
+    source, index = _lazy_assets[name]
+    value: str = getattr(resolver, source)()[index]
+    globals()[name] = value
+    return value
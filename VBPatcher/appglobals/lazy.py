@@ -0,0 +1,58 @@
+import importlib
+import threading
+
+
+class _LazyInstance:
+    """Stand-in for a module-level singleton, importing its module & creating it on first use.
+
+    - Keeps heavy dependencies (e.g. `requests`, `tqdm`, `PyLoadBar`) and costly constructors off start-up paths that never use the instance, such as headless `launch` or an up-to-date `ensure`.
+    - Every attribute access is forwarded to the real instance, which is created once, even if first used by several threads at once.
+
+    ---
+
+    - Contains the following methods:
+
+        - :func:`resolve(self) -> object`
+            - Return the real instance, creating it if needed.
+    """
+
+    def __init__(self, module: str, name: str, *args, **kwargs) -> None:
+        """Initialize lazy instance.
+
+        ---
+
+        :param module: dotted name of the module defining the class.
+        :type module: :class:`str`
+        :param name: name of the class within :param:`module`.
+        :type name: :class:`str`
+        :param args: positional arguments of the class constructor.
+        :type args: :class:`Any`
+        :param kwargs: keyword arguments of the class constructor.
+        :type kwargs: :class:`Any`
+        :return: new lazy instance.
+        :rtype: `None`
+        """
+
+        self._target: tuple = (module, name, args, kwargs)
+        self._instance: object | None = None
+        self._lock = threading.Lock()
+
+    def resolve(self) -> object:
+        """Return the real instance, creating it if needed.
+
+        ---
+
+        :return: real instance.
+        :rtype: :class:`object`
+        """
+
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    module, name, args, kwargs = self._target
+                    cls = getattr(importlib.import_module(module), name)
+                    self._instance = cls(*args, **kwargs)
+        return self._instance
+
+    def __getattr__(self, attr: str):
+        return getattr(self.resolve(), attr)
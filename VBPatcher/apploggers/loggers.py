@@ -1,30 +1,43 @@
+import atexit
+import gzip
 import logging
+import os
+import queue
+import shutil
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
-from VBPatcher.appglobals.globals import log_fh
+from VBPatcher.appglobals.globals import log_backups, log_fh, log_max_bytes
 
 
 class _LogGenerator():
     """Wrapper for application logging.
 
     - Uses built-in Python `logging` module.
+    - Records are handed to a queue and written to the log file by a single background :class:`QueueListener`, so logging never blocks on file I/O.
+        - All instances share one rotating log file, rotated once it reaches :attr:`log_max_bytes`, keeping :attr:`log_backups` gzip-compressed segments.
+        - Instances created with :param:`stream` also print synchronously to the console, so messages always appear before any prompt that follows them.
+    - Messages may be passed with `%`-style :param:`args`, which are only formatted if the level is enabled; guard costly f-strings with :func:`enabled`.
 
     ---
 
     - Contains the following logging methods:
 
-        - :func:`debug(self, msg) -> None`
+        - :func:`enabled(self, level) -> bool`
+            - Check whether messages of :param:`level` are logged.
+
+        - :func:`debug(self, msg, *args) -> None`
             - Logs a message with level `DEBUG`.
 
-        - :func:`info(self, msg) -> None`
+        - :func:`info(self, msg, *args) -> None`
             - Logs a message with level `INFO`.
 
-        - :func:`warning(self, msg) -> None`
+        - :func:`warning(self, msg, *args) -> None`
             - Logs a message with level `WARNING`.
 
-        - :func:`error(self, msg) -> None`
+        - :func:`error(self, msg, *args) -> None`
             - Logs a message with level `ERROR`.
 
-        - :func:`critical(self, msg) -> None`
+        - :func:`critical(self, msg, *args) -> None`
             - Logs a message with level `CRITICAL`.
     """
 
@@ -37,6 +50,9 @@ class _LogGenerator():
     DEBUG = 10
     NOTSET = 0
 
+    _queue: queue.SimpleQueue = queue.SimpleQueue()  # Records awaiting output
+    _listener: QueueListener | None = None  # Background writer of queued records
+
     def __init__(self,
                  name: str,
                  log_file: str,
@@ -56,6 +72,8 @@ class _LogGenerator():
             - DEBUG = 10
             - NOTSET = 0
 
+        - The shared sinks are created by the first instance, so :param:`log_file` & :param:`log_format` of later instances are ignored.
+
         ---
 
         :param name: Name of logger.
@@ -81,74 +99,145 @@ class _LogGenerator():
         self.level = level
         self.formatter = logging.Formatter(log_format, datefmt=datefmt)
         self.log_file = log_file
-        self.fhandler = logging.FileHandler(log_file)
-        self.logger.addHandler(self.fhandler)
-        self.fhandler.setFormatter(self.formatter)
+        self.logger.addHandler(QueueHandler(self._queue))
         self.logger.setLevel(level)
+        self.logger.propagate = False
         self.stream = stream
 
         if stream:  # if stream is True, then toggle logging stream to stdout
             self.logger.addHandler(logging.StreamHandler())
 
-    def debug(self, msg) -> None:
+        if _LogGenerator._listener is None:
+            _LogGenerator._listener = self._listen(log_file, self.formatter)
+
+    @classmethod
+    def _listen(cls, log_file: str,
+                formatter: logging.Formatter) -> QueueListener:
+        """Start the background listener writing queued records to the shared log file.
+
+        ---
+
+        :param log_file: file to create log entries.
+        :type log_file: :class:`str`
+        :param formatter: formatter of log file entries.
+        :type formatter: :class:`logging.Formatter`
+        :return: started listener, stopped (flushing any queued records) at exit.
+        :rtype: :class:`QueueListener`
+        """
+
+        fhandler = RotatingFileHandler(log_file,
+                                       maxBytes=log_max_bytes,
+                                       backupCount=log_backups,
+                                       delay=True)
+        fhandler.setFormatter(formatter)
+        fhandler.namer = lambda name: f'{name}.gz'
+        fhandler.rotator = cls._compress
+
+        listener = QueueListener(cls._queue, fhandler)
+        listener.start()
+        atexit.register(listener.stop)
+        return listener
+
+    @staticmethod
+    def _compress(source: str, dest: str) -> None:
+        """Gzip-compress a rotated log segment.
+
+        ---
+
+        :param source: path of the full log file.
+        :type source: :class:`str`
+        :param dest: path of the compressed segment.
+        :type dest: :class:`str`
+        :return: compressed segment, with :param:`source` removed.
+        :rtype: `None`
+        """
+
+        with open(source, 'rb') as fsrc, gzip.open(dest, 'wb') as fdst:
+            shutil.copyfileobj(fsrc, fdst)
+        os.remove(source)
+
+    def enabled(self, level: int) -> bool:
+        """Check whether messages of :param:`level` are logged.
+
+        ---
+
+        :param level: logging level.
+        :type level: :class:`int`
+        :return: `True` if messages of :param:`level` are logged.
+        :rtype: :class:`bool`
+        """
+
+        return self.logger.isEnabledFor(level)
+
+    def debug(self, msg, *args) -> None:
         """Logs a message with level `DEBUG`.
 
         ---
 
         :param msg: message to be logged.
         :type msg: :class:`str`
+        :param args: `%`-style arguments merged into :param:`msg` if the message is logged.
+        :type args: :class:`Any`
         :return: creates log entry.
         :rtype: `None`
         """
-        return self.logger.debug(msg)
+        return self.logger.debug(msg, *args)
 
-    def info(self, msg) -> None:
+    def info(self, msg, *args) -> None:
         """Logs a message with level `INFO`.
 
         ---
 
         :param msg: message to be logged.
         :type msg: :class:`str`
+        :param args: `%`-style arguments merged into :param:`msg` if the message is logged.
+        :type args: :class:`Any`
         :return: creates log entry.
         :rtype: `None`
         """
-        return self.logger.info(msg)
+        return self.logger.info(msg, *args)
 
-    def warning(self, msg) -> None:
+    def warning(self, msg, *args) -> None:
         """Logs a message with level `WARNING`.
 
         ---
 
         :param msg: message to be logged.
         :type msg: :class:`str`
+        :param args: `%`-style arguments merged into :param:`msg` if the message is logged.
+        :type args: :class:`Any`
         :return: creates log entry.
         :rtype: `None`
         """
-        return self.logger.warning(msg)
+        return self.logger.warning(msg, *args)
 
-    def error(self, msg) -> None:
+    def error(self, msg, *args) -> None:
         """Logs a message with level `ERROR`.
 
         ---
 
         :param msg: message to be logged.
         :type msg: :class:`str`
+        :param args: `%`-style arguments merged into :param:`msg` if the message is logged.
+        :type args: :class:`Any`
         :return: creates log entry.
         :rtype: `None`
         """
-        return self.logger.error(msg, exc_info=True)
+        return self.logger.error(msg, *args, exc_info=True)
 
-    def critical(self, msg) -> None:
+    def critical(self, msg, *args) -> None:
         """Logs a message with level `CRITICAL`.
 
         ---
 
         :param msg: message to be logged.
         :type msg: :class:`str`
+        :param args: `%`-style arguments merged into :param:`msg` if the message is logged.
+        :type args: :class:`Any`
         :return: creates log entry.
         :rtype: `None`
         """
-        return self.logger.critical(msg)
+        return self.logger.critical(msg, *args)
 
 
 logger: _LogGenerator = _LogGenerator('MAIN', log_fh)  # Main logging instance
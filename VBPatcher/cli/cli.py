@@ -0,0 +1,443 @@
+import os
+import sys
+from argparse import ArgumentParser, Namespace
+
+import VBPatcher.appglobals.globals
+from VBPatcher.apploggers.loggers import logger, logger_stream
+from VBPatcher.metadata.metadata import resolver
+from VBPatcher.patching.patching import _Patcher, deployer
+from VBPatcher.progress.progress import _BarRenderer, progress
+from VBPatcher.store.store import store
+from VBPatcher.subprocessing.subprocessing import _launchValheim
+from VBPatcher.tracing.tracing import _Tracer, tracer
+from VBPatcher.validation.validation import _Validate
+
+EXIT_OK: int = 0  # Success, or nothing to do
+EXIT_FAILED: int = 1  # Deployment, verification, launch or rollback failed
+EXIT_USAGE: int = 2  # Invalid arguments (raised by argparse)
+EXIT_UNAVAILABLE: int = 3  # Release metadata or patch archive unavailable
+
+_channels: dict = {
+    'stable': ['stable'],
+    'dev': ['dev'],
+    'full': ['stable', 'dev']
+}  # Stored channels deployed by each `--channel` choice
+
+
+def _parser() -> ArgumentParser:
+    """Build the headless command-line parser.
+
+    ---
+
+    :return: argument parser with `ensure`, `update`, `verify`, `launch`, `rollback` & `serve` subcommands.
+    :rtype: :class:`ArgumentParser`
+    """
+
+    parser = ArgumentParser(
+        prog='vbpatcher',
+        description=
+        'Patch BepInEx for Valheim without prompts. Run without arguments for the interactive menu.'
+    )
+    parser.add_argument(
+        '--progress',
+        choices=['bars', 'none'],
+        default='bars' if sys.stdout.isatty() else 'none',
+        help=
+        'render download, extraction & deployment progress (defaults to bars on a terminal)'
+    )
+    parser.add_argument('--trace',
+                        metavar='FILE',
+                        default=None,
+                        help='write timing spans of each phase to FILE')
+    parser.add_argument(
+        '--trace-format',
+        choices=_Tracer.formats,
+        default=None,
+        help=
+        'trace file format, defaults to chrome for .json files, otherwise jsonl'
+    )
+    parser.add_argument(
+        '--mirror',
+        metavar='URL',
+        default=None,
+        help=
+        'resolve & download patches through the LAN mirror at URL, falling back to upstream'
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    ensure = commands.add_parser(
+        'ensure',
+        help=
+        'Make sure the target holds the latest patch, downloading & deploying only what is missing.'
+    )
+    update = commands.add_parser(
+        'update',
+        help='Check for new releases now, downloading any not yet stored.')
+    verify = commands.add_parser(
+        'verify',
+        help='Verify stored patch files and, with --target, deployed files.')
+    commands.add_parser('launch', help='Start Valheim through Steam.')
+    rollback = commands.add_parser(
+        'rollback', help='Undo the last deployment to the target.')
+    serve = commands.add_parser(
+        'serve',
+        help=
+        'Serve stored patches & release metadata to other patchers on the LAN.'
+    )
+
+    for command in (ensure, update, verify):
+        command.add_argument('--channel',
+                             choices=sorted(_channels),
+                             default='full',
+                             help='patch channel(s), defaults to full')
+
+    ensure.add_argument(
+        '--target',
+        nargs='+',
+        default=_Patcher._targets(),
+        help=
+        'Valheim directories, all deployed in one pass, defaults to the configured ones'
+    )
+    rollback.add_argument(
+        '--target',
+        default=VBPatcher.appglobals.globals.patch_targetDir,
+        help='Valheim directory, defaults to the configured one')
+    verify.add_argument('--target',
+                        default=None,
+                        help='also verify files deployed to this directory')
+
+    for command in (ensure, verify):
+        command.add_argument('--deep',
+                             action='store_true',
+                             help='rehash every file, ignoring stat caches')
+    ensure.add_argument(
+        '--offline',
+        action='store_true',
+        help='use cached release metadata without revalidating it')
+
+    serve.add_argument('--bind',
+                       default='0.0.0.0',
+                       help='address to listen on, defaults to all interfaces')
+    serve.add_argument(
+        '--port',
+        type=int,
+        default=VBPatcher.appglobals.globals.mirror_port,
+        help='port to listen on, defaults to the configured one')
+
+    return parser
+
+
+def _versions(channel: str) -> list[tuple[str, str]]:
+    """Resolve the `(channel, version)` layers deployed by a `--channel` choice.
+
+    ---
+
+    :param channel: `stable`, `dev` or `full`.
+    :type channel: :class:`str`
+    :return: `(channel, version)` pairs, from bottom to top.
+    :rtype: :class:`list[tuple[str, str]]`
+    """
+
+    return [(ch, getattr(VBPatcher.appglobals.globals, f'ver_{ch}'))
+            for ch in _channels[channel]]
+
+
+def _plan(channel: str, layers: list) -> dict | None:
+    """Return the deployment plan of a `--channel` choice, including hotfix layers for `full`.
+
+    ---
+
+    :param channel: `stable`, `dev` or `full`.
+    :type channel: :class:`str`
+    :param layers: `(channel, version)` pairs, as returned by :func:`_versions`.
+    :type layers: :class:`list[tuple[str, str]]`
+    :return: deployment plan, or `None` if any version isn't stored.
+    :rtype: :class:`dict` | `None`
+    """
+
+    if channel == 'full':
+        return _Patcher._overlay(layers,
+                                 VBPatcher.appglobals.globals.patch_hotfix)
+    return _Patcher._overlay(layers)
+
+
+def _fetch(channel: str, deep: bool) -> bool:
+    """Validate the stored patches of a `--channel` choice, downloading any that are missing or corrupt.
+
+    ---
+
+    :param channel: `stable`, `dev` or `full`.
+    :type channel: :class:`str`
+    :param deep: rehash every stored patch file.
+    :type deep: :class:`bool`
+    :return: `True` if every patch is ready for deployment.
+    :rtype: :class:`bool`
+    """
+
+    validate: _Validate = _Validate()
+
+    if channel == 'full':
+        return all(ok for ok, _ in validate._readiness(deep).values())
+    if channel == 'stable':
+        return validate._validate_stable(
+            VBPatcher.appglobals.globals.url_stable, deep)
+    return validate._validate_dev(VBPatcher.appglobals.globals.url_dev, deep)
+
+
+def _ensure(args: Namespace) -> int:
+    """Make sure every directory of :param:`args.target` holds the latest patch of :param:`args.channel`.
+
+    - If a target is already up to date, this costs a metadata cache read and one `stat` call per patch file.
+    - Targets needing files are deployed in one pass, reading each patch file once (see :func:`_Deployer.deploy_many`).
+
+    ---
+
+    :param args: parsed arguments.
+    :type args: :class:`Namespace`
+    :return: exit code.
+    :rtype: :class:`int`
+    """
+
+    if args.offline:
+        resolver.ttl = float('inf')  # Trust any cached metadata
+
+    try:
+        layers: list = _versions(args.channel)
+    except Exception:
+        logger_stream.error('Unable to resolve BepInEx release metadata...\n')
+        return EXIT_UNAVAILABLE
+
+    if not _fetch(args.channel, args.deep):
+        return EXIT_UNAVAILABLE
+
+    label: str = ' + '.join(ver for _, ver in layers)
+
+    try:
+        results: dict = deployer.deploy_many(_plan(args.channel, layers),
+                                             args.target,
+                                             label=label)
+    except Exception:
+        logger_stream.error(
+            'Failed to deploy BepInEx build %s to location(s): %s...\n', label,
+            ', '.join(args.target))
+        return EXIT_FAILED
+
+    code: int = EXIT_OK
+
+    for target, report in results.items():
+        if isinstance(report, Exception):
+            logger_stream.warning(
+                '>> Failed to deploy BepInEx build %s to location: %s (%s)',
+                label, target, report)
+            code = EXIT_FAILED
+        elif report.written:
+            logger_stream.info(
+                '>> Deployed BepInEx build %s to %s: wrote %d files (%d bytes), %d unchanged.',
+                label, target, report.written, report.written_bytes,
+                report.skipped)
+        else:
+            logger.info('BepInEx build %s already up to date at %s.', label,
+                        target)
+    return code
+
+
+def _update(args: Namespace) -> int:
+    """Check for new releases of :param:`args.channel` now, downloading any not yet stored.
+
+    ---
+
+    :param args: parsed arguments.
+    :type args: :class:`Namespace`
+    :return: exit code.
+    :rtype: :class:`int`
+    """
+
+    resolver.ttl = 0  # Revalidate cached metadata
+
+    try:
+        layers: list = _versions(args.channel)
+    except Exception:
+        logger_stream.error('Unable to resolve BepInEx release metadata...\n')
+        return EXIT_UNAVAILABLE
+
+    if not _fetch(args.channel, False):
+        return EXIT_UNAVAILABLE
+
+    logger_stream.info(
+        '>> Latest patches stored: %s',
+        ', '.join(f'{channel} {ver}' for channel, ver in layers))
+    return EXIT_OK
+
+
+def _verify(args: Namespace) -> int:
+    """Verify stored patch files of :param:`args.channel` and, if given, files deployed to :param:`args.target`.
+
+    - Nothing is downloaded or deployed.
+    - For a healthy target, reports how many deployed files still share data with the patch store (see :func:`_Deployer.shared`).
+
+    ---
+
+    :param args: parsed arguments.
+    :type args: :class:`Namespace`
+    :return: exit code.
+    :rtype: :class:`int`
+    """
+
+    resolver.ttl = float('inf')  # Verify the versions last resolved
+
+    try:
+        layers: list = _versions(args.channel)
+    except Exception:
+        logger_stream.error('Unable to resolve BepInEx release metadata...\n')
+        return EXIT_UNAVAILABLE
+
+    ok: bool = True
+
+    for channel, ver in layers:
+        failed: list | None = store.verify(channel, ver, args.deep)
+        if failed is None:
+            logger_stream.warning('>> %s %s: not stored', channel, ver)
+            ok = False
+        elif failed:
+            logger_stream.warning('>> %s %s: %d files missing or corrupt: %s',
+                                  channel, ver, len(failed), ', '.join(failed))
+            ok = False
+        else:
+            logger_stream.info('>> %s %s: ok', channel, ver)
+
+    if args.target and ok:
+        stale: list = deployer.check(_plan(args.channel, layers), args.target,
+                                     args.deep)
+        if stale:
+            logger_stream.warning('>> %s: %d files missing or outdated: %s',
+                                  args.target, len(stale), ', '.join(stale))
+            ok = False
+        else:
+            linked: dict = deployer.shared(args.target)
+            logger_stream.info(
+                '>> %s: ok (%d files linked to the patch store)', args.target,
+                len(linked))
+
+    return EXIT_OK if ok else EXIT_FAILED
+
+
+def _launch(args: Namespace) -> int:
+    """Start Valheim through Steam.
+
+    ---
+
+    :param args: parsed arguments.
+    :type args: :class:`Namespace`
+    :return: exit code.
+    :rtype: :class:`int`
+    """
+
+    return EXIT_OK if _launchValheim() else EXIT_FAILED
+
+
+def _rollback(args: Namespace) -> int:
+    """Undo the last deployment to :param:`args.target`.
+
+    ---
+
+    :param args: parsed arguments.
+    :type args: :class:`Namespace`
+    :return: exit code.
+    :rtype: :class:`int`
+    """
+
+    try:
+        snapshot: dict | None = deployer.rollback(args.target)
+    except Exception:
+        logger_stream.error(
+            'Failed to roll back last deployment to location: %s...\n',
+            args.target)
+        return EXIT_FAILED
+
+    if snapshot is None:
+        logger_stream.warning('>> No previous deployment to roll back at %s',
+                              args.target)
+        return EXIT_FAILED
+
+    logger_stream.info(
+        '>> Rolled back deployment of BepInEx build %s, restored %d files.',
+        snapshot['label'], len(snapshot['files']))
+    return EXIT_OK
+
+
+def _serve(args: Namespace) -> int:
+    """Serve stored patches & release metadata to other patchers on the LAN until interrupted.
+
+    ---
+
+    :param args: parsed arguments.
+    :type args: :class:`Namespace`
+    :return: exit code.
+    :rtype: :class:`int`
+    """
+
+    from VBPatcher.mirror.mirror import _Mirror  # Imports the downloader
+
+    VBPatcher.appglobals.globals.mirror_url = ''  # A mirror always pulls from upstream
+
+    logger_stream.info(
+        '>> Serving patch mirror on http://%s:%s/ (Ctrl+C to stop)', args.bind,
+        args.port)
+    try:
+        _Mirror(store, resolver).serve(args.bind, args.port)
+    except OSError:
+        logger_stream.error('Unable to serve patch mirror on %s:%s...\n',
+                            args.bind, args.port)
+        return EXIT_FAILED
+    return EXIT_OK
+
+
+def main(argv: list[str], cwd: str) -> int:
+    """Run a headless command.
+
+    - Never prompts, sleeps or plays loading animations.
+    - With `--trace FILE`, every phase (metadata resolution, download, extraction, validation, deployment) is timed, and the spans written to FILE once the command ends.
+    - Real progress is rendered as progress bars only with `--progress bars`, the default on a terminal; otherwise no renderer is subscribed, and progress events cost nothing.
+
+    ---
+
+    :param argv: command-line arguments, without the program name.
+    :type argv: :class:`list[str]`
+    :param cwd: working directory the patcher was started from, used to resolve relative `--target` paths.
+    :type cwd: :class:`str`
+    :return: exit code.
+    :rtype: :class:`int`
+    """
+
+    args: Namespace = _parser().parse_args(argv)
+
+    if args.progress == 'bars':
+        progress.subscribe(_BarRenderer())
+
+    if isinstance(getattr(args, 'target', None), list):
+        args.target = [os.path.join(cwd, target) for target in args.target]
+    elif getattr(args, 'target', None):
+        args.target = os.path.join(cwd, args.target)
+
+    if args.mirror is not None:
+        VBPatcher.appglobals.globals.mirror_url = args.mirror.rstrip('/')
+
+    if args.trace:
+        tracer.enable(os.path.join(cwd, args.trace), args.trace_format)
+
+    logger.info('Running headless command: %s', ' '.join(argv))
+
+    try:
+        with tracer.span('command', command=args.command) as span:
+            code: int = {
+                'ensure': _ensure,
+                'update': _update,
+                'verify': _verify,
+                'launch': _launch,
+                'rollback': _rollback,
+                'serve': _serve
+            }[args.command](args)
+            span.note(exit_code=code)
+        return code
+    finally:
+        tracer.close()  # Write trace file, if enabled
@@ -0,0 +1,94 @@
+import hashlib
+import threading
+
+
+class _DigestTracker:
+    """Compute the SHA-256 digest of a partial file while its bytes arrive, even when byte ranges arrive out of order.
+
+    - Bytes received at the hashing position are hashed straight from memory.
+    - Bytes that arrived ahead of the hashing position are read back from the (page-cached) partial file once everything before them has been written.
+
+    ---
+
+    - Contains the following methods:
+
+        - :func:`feed(self, offset, data, watermark) -> None`
+            - Report :param:`data` written at :param:`offset`.
+
+        - :func:`finish(self, length) -> str`
+            - Hash any remaining bytes and return the file's hex digest.
+    """
+
+    def __init__(self, part: str) -> None:
+        """Initialize digest tracker.
+
+        ---
+
+        :param part: path of partial file being written.
+        :type part: :class:`str`
+        :return: new digest tracker instance.
+        :rtype: `None`
+        """
+
+        self.part = part
+        self.pos: int = 0  # Bytes hashed so far
+        self._hash = hashlib.sha256()
+        self._lock = threading.Lock()
+
+    def feed(self, offset: int, data: memoryview | bytes,
+             watermark: int) -> None:
+        """Report :param:`data` written at :param:`offset`.
+
+        ---
+
+        :param offset: position of :param:`data` within the file.
+        :type offset: :class:`int`
+        :param data: bytes just written.
+        :type data: :class:`memoryview` | :class:`bytes`
+        :param watermark: length of the fully written prefix of the file, including :param:`data`.
+        :type watermark: :class:`int`
+        :return: updated digest.
+        :rtype: `None`
+        """
+
+        with self._lock:
+            if self.pos < offset <= watermark:
+                self._catch_up(offset)  # Earlier bytes are on disk already
+            if offset == self.pos:
+                self._hash.update(data)
+                self.pos += len(data)
+
+    def finish(self, length: int) -> str:
+        """Hash any remaining bytes and return the file's hex digest.
+
+        ---
+
+        :param length: final length of file.
+        :type length: :class:`int`
+        :return: hex SHA-256 digest.
+        :rtype: :class:`str`
+        """
+
+        with self._lock:
+            self._catch_up(length)
+            return self._hash.hexdigest()
+
+    def _catch_up(self, end: int) -> None:
+        """Hash bytes between the hashing position and :param:`end` by reading them back from the partial file.
+
+        ---
+
+        :param end: position to hash up to.
+        :type end: :class:`int`
+        :return: updated digest.
+        :rtype: `None`
+        """
+
+        with open(self.part, 'rb') as fh:
+            fh.seek(self.pos)
+            while self.pos < end:
+                block: bytes = fh.read(min(1024 * 1024, end - self.pos))
+                if not block:
+                    break
+                self._hash.update(block)
+                self.pos += len(block)
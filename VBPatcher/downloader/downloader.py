@@ -1,14 +1,22 @@
+import json
 import os
-import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from os import PathLike
-from urllib.error import HTTPError
+from time import sleep
 from zipfile import ZipFile
 
 import requests
-import tqdm
 import VBPatcher.appglobals.globals
 from requests import Response
 from VBPatcher.apploggers.loggers import logger, logger_stream
+from VBPatcher.downloader.digest import _DigestTracker
+from VBPatcher.downloader.extractor import _ParallelExtract
+from VBPatcher.downloader.segmented import _RangeIgnored, _SegmentedDownload
+from VBPatcher.network.network import client
+from VBPatcher.progress.progress import _Task, progress
+from VBPatcher.store.store import store
+from VBPatcher.tracing.tracing import tracer
 
 
 class _Downloader:
@@ -26,107 +34,444 @@ class _Downloader:
 			- Download latest BepInEx development build.
             - Static method.
 
-		- :func:`_unzip_patch(self, filename, stable) -> None`
-			- Unzip downloaded patch files before deleting patch `.zip` archive.
+		- :func:`_unzip_patch(self, filename, mode, digest, version) -> bool`
+			- Unzip downloaded patch files straight into the artifact store before deleting patch `.zip` archive.
+            - Class method.
+
+		- :func:`_download(url, filename, desc, task) -> bool`
+			- Stream a patch archive from :param:`url` to :param:`filename`, resuming any earlier partial download.
+            - Class method.
+
+		- :func:`_download_mirrored(channel, version, url, filename, desc, task) -> str`
+			- Download a patch archive from the LAN mirror, falling back to upstream.
+            - Class method.
+
+		- :func:`_stream(url, part, journal, entries, report) -> None`
+			- Stream an archive over a single connection, resuming from the bytes recorded in :param:`entries`.
+            - Class method.
+
+		- :func:`_read_journal(journal) -> dict`
+			- Read the sidecar journal of a partial download.
+            - Static method.
+
+		- :func:`_write_journal(journal, entries) -> None`
+			- Atomically write the sidecar journal of a partial download.
+            - Static method.
+
+		- :func:`_archive(mode) -> str`
+			- Return local path of the patch archive for the given channel.
             - Static method.
 
-		- :func:`update_check(self) -> None`
+		- :func:`_fetch_patch(self, mode, task) -> bool`
+			- Download and immediately unzip the patch archive for the given channel.
+
+		- :func:`update_check(self, concurrent) -> None`
 			- Process to retrieve latest available patch files using class methods.
 	"""
 
+    _progress_lock = threading.Lock(
+    )  # Serializes byte counts reported to a progress task
+    _retries: int = 3  # Resume attempts per download after an interrupted transfer
+    _connections: int = 4  # Parallel connections per segmented download
+    _segment_min: int = 512 * 1024  # Smallest byte range worth its own connection (512 KB)
+    _exclude: frozenset = frozenset({'doorstop_config.ini'
+                                     })  # Archive members never extracted
+    _keep_archive: bool = False  # Keep zip archives after extraction
+
+    @staticmethod
+    def _archive(mode: int) -> str:
+        """Return local path of the patch archive for the given channel.
+
+		---
+
+		:param mode: set to 1 for the stable release archive, or 2 for the dev-build archive.
+		:type mode: :class:`int`
+		:return: path of zip archive.
+		:rtype: :class:`str`
+		"""
+
+        if mode == 1:
+            return f'{VBPatcher.appglobals.globals.patch_stable}/BepInEx_stable_{VBPatcher.appglobals.globals.ver_stable}.zip'
+        return f'{VBPatcher.appglobals.globals.patch_dev}/BepInEx_dev_{VBPatcher.appglobals.globals.ver_dev}.zip'
+
+    @staticmethod
+    def _read_journal(journal: str) -> dict:
+        """Read the sidecar journal of a partial download.
+
+		---
+
+		:param journal: path of journal file.
+		:type journal: :class:`str`
+		:return: journal entries (`url`, `etag`, `length`, `received`), or an empty dict if no valid journal exists.
+		:rtype: :class:`dict`
+		"""
+
+        try:
+            with open(journal, 'r') as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return {}
+
     @staticmethod
-    def _dl_stable(url):
+    def _write_journal(journal: str, entries: dict) -> None:
+        """Atomically write the sidecar journal of a partial download.
+
+		---
+
+		:param journal: path of journal file.
+		:type journal: :class:`str`
+		:param entries: journal entries (`url`, `etag`, `length`, `received`).
+		:type entries: :class:`dict`
+		:return: updated journal file.
+		:rtype: `None`
+		"""
+
+        with open(f'{journal}.tmp', 'w') as fh:
+            json.dump(entries, fh)
+        os.replace(f'{journal}.tmp', journal)
+
+    @classmethod
+    def _download(cls,
+                  url: str,
+                  filename: PathLike | str,
+                  desc: str,
+                  task: _Task | None = None,
+                  retries: int | None = None) -> str:
+        """Stream a patch archive from :param:`url` to :param:`filename`, resuming any earlier partial download.
+
+        - Bytes are written to `{filename}.part`, alongside a `{filename}.part.json` journal recording the URL, `ETag`, expected length and bytes received.
+        - Archives served with `Accept-Ranges: bytes` are split into up to :attr:`_connections` byte ranges fetched in parallel (see :class:`_SegmentedDownload`), otherwise they are streamed over one connection.
+        - Requests go through the shared :data:`client`, which retries failed connections & server errors with backoff.
+        - Transfers interrupted after receiving data are retried up to :attr:`_retries` times, after a jittered backoff, resuming with a `Range` request.
+        - :param:`retries` overrides both the retries of :data:`client` and :attr:`_retries`, e.g. `0` to fail at once when another source can be tried.
+            - Falls back to a full download if the server ignores `Range`, or the archive's `ETag` has changed.
+        - The completed archive is atomically renamed into place, so :param:`filename` never holds a truncated file.
+        - The archive's size and received bytes are reported to progress :param:`task`, allowing several downloads to share one progress display.
+            - Otherwise, a progress task is opened for this download alone (see :data:`progress`).
+
+		---
+
+		:param url: URL from which to download zip archive.
+		:type url: :class:`str`
+		:param filename: destination of zip archive.
+		:type filename: :class:`str` | :class:`PathLike`
+		:param desc: description of a standalone progress task.
+		:type desc: :class:`str`
+		:param task: shared progress task to report to, defaults to `None`.
+		:type task: :class:`_Task` | `None`, optional
+		:param retries: retries of each request & resumes of the transfer, defaults to those of :data:`client` & :attr:`_retries`.
+		:type retries: :class:`int` | `None`, optional
+		:return: hex SHA-256 digest of the completed archive, computed while it was received.
+		:rtype: :class:`str`
+		"""
+
+        part: str = f'{filename}.part'  # Partial download
+        journal: str = f'{part}.json'  # Partial download journal
+        resumes: int = cls._retries if retries is None else retries
+
+        owned: bool = task is None
+        if owned:
+            task = progress.task(desc)
+
+        counted_total: int = 0  # Bytes this download added to the task's total
+        counted: int = 0  # Bytes this download reported to the task
+
+        def report(total: int, received: int) -> None:
+            nonlocal counted_total, counted
+            with cls._progress_lock:
+                task.expect(total - counted_total)
+                task.advance(received - counted)
+                counted_total, counted = total, received
+
+        def advance(n: int) -> None:
+            nonlocal counted
+            with cls._progress_lock:
+                task.advance(n)
+                counted += n
+
+        with tracer.span('download', url=url) as span:
+            try:
+                attempt: int = 0
+                ranged: bool = True  # Whether segmented transfers may be attempted
+                while True:
+                    entries: dict = cls._read_journal(journal)
+                    if entries.get('url') != url or not os.path.exists(
+                            part) or ('segments' in entries and not ranged):
+                        entries = {}
+
+                    tracker = _DigestTracker(part)  # Hash bytes as they arrive
+                    before: int = counted
+
+                    try:
+                        if ranged and not entries:
+                            entries = _SegmentedDownload.plan(
+                                url, cls._connections, cls._segment_min,
+                                retries)
+                            if entries:
+                                _SegmentedDownload.preallocate(
+                                    part, entries['length'])
+                                cls._write_journal(journal, entries)
+
+                        if 'segments' in entries:
+                            report(entries['length'], entries['received'])
+                            try:
+                                _SegmentedDownload(url, part, entries, advance,
+                                                   tracker, retries).run()
+                            finally:
+                                cls._write_journal(journal, entries)
+                        else:
+                            cls._stream(url, part, journal, entries, report,
+                                        tracker, retries)
+
+                    except _RangeIgnored:
+                        ranged = False  # Fall back to a single full-length stream
+                        if os.path.exists(journal):
+                            os.unlink(journal)
+                        continue
+
+                    except (requests.exceptions.ConnectionError,
+                            requests.exceptions.ChunkedEncodingError,
+                            requests.exceptions.Timeout) as e:
+                        attempt += 1
+                        if attempt > resumes or (
+                                counted == before and not isinstance(
+                                    e,
+                                    requests.exceptions.ChunkedEncodingError)):
+                            raise  # Server unreachable, already retried by `client`
+                        delay: float = client.backoff(attempt - 1)
+                        logger.warning(
+                            'Download of %s interrupted, resuming in %.1fs (attempt %s/%s)...',
+                            url, delay, attempt, resumes)
+                        sleep(delay)
+                        continue
+
+                    digest: str = tracker.finish(entries['length']
+                                                 or entries['received'])
+                    span.add(entries['length'] or entries['received'], 1)
+                    span.note(retries=attempt, segmented='segments' in entries)
+                    os.replace(part,
+                               filename)  # Move completed archive into place
+                    os.unlink(journal)
+                    return digest
+
+            finally:
+                if owned:
+                    task.close()
+
+    @classmethod
+    def _download_mirrored(cls,
+                           channel: str,
+                           version: str,
+                           url: str,
+                           filename: PathLike | str,
+                           desc: str,
+                           task: _Task | None = None) -> str:
+        """Download a patch archive from the LAN mirror (see :attr:`mirror_url`), falling back to :param:`url` if the mirror can't provide it.
+
+        - The mirror is tried once, without retries or resumes, so a mirror that is down or failing doesn't delay the upstream download by a full backoff.
+
+		---
+
+		:param channel: patch channel (`stable` or `dev`).
+		:type channel: :class:`str`
+		:param version: patch version/build.
+		:type version: :class:`str`
+		:param url: upstream URL of the archive.
+		:type url: :class:`str`
+		:param filename: destination of zip archive.
+		:type filename: :class:`str` | :class:`PathLike`
+		:param desc: description of a standalone progress task.
+		:type desc: :class:`str`
+		:param task: shared progress task to report to, defaults to `None`.
+		:type task: :class:`_Task` | `None`, optional
+		:return: hex SHA-256 digest of the completed archive.
+		:rtype: :class:`str`
+		"""
+
+        mirror: str = VBPatcher.appglobals.globals.mirror_url
+        if mirror:
+            try:
+                return cls._download(
+                    f'{mirror.rstrip("/")}/archives/{channel}/{version}.zip',
+                    filename,
+                    desc,
+                    task,
+                    retries=0)
+            except Exception:
+                logger.warning(
+                    'Mirror %s unable to provide BepInEx %s %s, downloading from upstream...',
+                    mirror, channel, version)
+        return cls._download(url, filename, desc, task)
+
+    @classmethod
+    def _stream(cls,
+                url: str,
+                part: str,
+                journal: str,
+                entries: dict,
+                report,
+                tracker: _DigestTracker,
+                retries: int | None = None) -> None:
+        """Stream an archive over a single connection, resuming from the bytes recorded in :param:`entries`.
+
+        - Used when the server doesn't advertise `Range` support, or the archive is too small to be worth splitting.
+
+		---
+
+		:param url: URL from which to download zip archive.
+		:type url: :class:`str`
+		:param part: path of partial file.
+		:type part: :class:`str`
+		:param journal: path of partial download journal.
+		:type journal: :class:`str`
+		:param entries: journal entries of an earlier partial download, or an empty dict.
+		:type entries: :class:`dict`
+		:param report: callback receiving the expected length and bytes received so far.
+		:type report: :class:`Callable[[int, int], None]`
+		:param tracker: digest tracker fed with every written chunk.
+		:type tracker: :class:`_DigestTracker`
+		:param retries: retries of the request, defaults to those of :data:`client`.
+		:type retries: :class:`int` | `None`, optional
+		:return: completed partial file.
+		:rtype: `None`
+		"""
+
+        chunk_size: int = 64 * 1024  # 64 KB
+
+        received: int = 0
+        if entries:
+            received = min(entries['received'], os.path.getsize(part))
+
+        headers: dict = {}
+        if received:
+            headers['Range'] = f'bytes={received}-'
+            if entries.get('etag'):
+                headers['If-Range'] = entries['etag']
+
+        rq: Response = client.get(url,
+                                  retries=retries,
+                                  headers=headers,
+                                  allow_redirects=True,
+                                  stream=True)  # Download zip archive
+        etag: str | None = rq.headers.get('ETag')
+        if rq.status_code == 416 or (rq.status_code == 206
+                                     and entries.get('etag')
+                                     and etag != entries['etag']):
+            rq.close()  # Stale partial download, start over
+            raise _RangeIgnored(url)
+
+        rq.raise_for_status()  # Check for HTTP errors
+
+        if rq.status_code != 206:
+            received = 0  # Range ignored or archive changed, start over
+
+        length: int = received + int(rq.headers.get('Content-Length',
+                                                    0))  # File size
+        entries.clear()
+        entries.update(url=url, etag=etag, length=length, received=received)
+        cls._write_journal(journal, entries)
+        report(length, received)
+
+        with open(part, 'r+b' if received else 'wb') as patch:
+            patch.seek(received)
+            patch.truncate()
+            try:
+                for chunk in rq.iter_content(chunk_size=chunk_size):
+                    patch.write(chunk)
+                    tracker.feed(received, chunk, received)
+                    received += len(chunk)
+                    report(length, received)
+            finally:
+                patch.flush()
+                entries['received'] = received
+                cls._write_journal(journal, entries)
+
+        if length and received != length:
+            raise requests.exceptions.ChunkedEncodingError(
+                f'Incomplete download ({received}/{length} bytes)')
+
+    @classmethod
+    def _dl_stable(cls, url: str, task: _Task | None = None) -> str | None:
         """Download zip containing latest BepInEx stable release.
 
 		---
 
 		:param url: URL from which to download zip archive.
 		:type url: :class:`str`
-		:return: zip archive containing patch files.
-		:rtype: :class:`BufferedWriter`
+		:param task: shared progress task to report to, defaults to `None`.
+		:type task: :class:`_Task` | `None`, optional
+		:return: hex SHA-256 digest of downloaded archive, or `None` if the download failed.
+		:rtype: :class:`str` | `None`
 		"""
 
-        logger.info(
-            f'Downloading latest BepInEx stable build {VBPatcher.appglobals.globals.ver_stable}...'
-        )
+        logger.info('Downloading latest BepInEx stable build %s...',
+                    VBPatcher.appglobals.globals.ver_stable)
 
         try:
-            rq: Response = requests.get(url, allow_redirects=True,
-                                        stream=True)  # Download zip archive
-            rq.raise_for_status()  # Check for HTTP errors
-
-            file_size: int = int(rq.headers.get('Content-Length'))  # File size
-            chunk_size: int = 1024  # 1 MB
-            prog_max: int = file_size // chunk_size  # Calculate progress bar max
-
-            with open(
-                    f'./patch-files/stable/BepInEx_stable_{VBPatcher.appglobals.globals.ver_stable}.zip',
-                    'wb') as patch_stable:
-                for chunk in tqdm.tqdm(rq.iter_content(chunk_size=chunk_size),
-                                       total=prog_max,
-                                       unit='KB',
-                                       desc='Downloading Stable Release',
-                                       file=sys.stdout):
-                    patch_stable.write(chunk)
+            digest: str = cls._download_mirrored(
+                'stable', VBPatcher.appglobals.globals.ver_stable, url,
+                cls._archive(1), 'Downloading Stable Release', task)
 
             logger_stream.info(
-                f'Completed BepInEx latest stable-release download!\n\n>> Downloaded from url:\n>> {url}\n'
-            )
-            return patch_stable
+                'Completed BepInEx latest stable-release download!\n\n>> Downloaded from url:\n>> %s\n',
+                url)
+            return digest
 
-        except [Exception, HTTPError]:
+        except Exception:
             logger_stream.error(
-                f'Encountered error while downloading latest stable release zip archive...\n'
+                'Encountered error while downloading latest stable release zip archive...\n'
             )
+            return None
 
-    @staticmethod
-    def _dl_dev(url):
+    @classmethod
+    def _dl_dev(cls, url: str, task: _Task | None = None) -> str | None:
         """Download zip archive containing latest BepInEx development build.
 
 		---
 
 		:param url: URL from which to download zip archive.
 		:type url: :class:`str`
-		:return: zip archive containing patch files.
-		:rtype: :class:`BufferedWriter`
+		:param task: shared progress task to report to, defaults to `None`.
+		:type task: :class:`_Task` | `None`, optional
+		:return: hex SHA-256 digest of downloaded archive, or `None` if the download failed.
+		:rtype: :class:`str` | `None`
 		"""
 
-        logger.info(
-            f'Downloading latest BepInEx development-build {VBPatcher.appglobals.globals.ver_dev}.'
-        )
+        logger.info('Downloading latest BepInEx development-build %s.',
+                    VBPatcher.appglobals.globals.ver_dev)
 
         try:
-            rq: Response = requests.get(url, allow_redirects=True,
-                                        stream=True)  # Download zip archive
-            rq.raise_for_status()  # Check for HTTP errors
-
-            file_size: int = int(rq.headers.get('Content-Length'))  # File size
-            chunk_size: int = 1024  # 1 MB
-            prog_max: int = file_size // chunk_size  # Calculate progress bar max
-
-            with open(
-                    f'./patch-files/development/BepInEx_dev_{VBPatcher.appglobals.globals.ver_dev}.zip',
-                    'wb') as patch_dev:
-                for chunk in tqdm.tqdm(rq.iter_content(chunk_size=chunk_size),
-                                       total=prog_max,
-                                       unit='KB',
-                                       desc='Downloading Dev-Build',
-                                       file=sys.stdout):
-                    patch_dev.write(chunk)
-
-                logger_stream.info(
-                    f'Completed BepInEx latest development-build download!\n\n>> Downloaded from url:\n>> {url}\n'
-                )
-            return patch_dev
-
-        except [Exception, HTTPError]:
+            digest: str = cls._download_mirrored(
+                'dev', VBPatcher.appglobals.globals.ver_dev, url,
+                cls._archive(2), 'Downloading Dev-Build', task)
+
+            logger_stream.info(
+                'Completed BepInEx latest development-build download!\n\n>> Downloaded from url:\n>> %s\n',
+                url)
+            return digest
+
+        except Exception:
             logger_stream.error(
-                f'Encountered error while downloading latest development-build zip archive...\n'
+                'Encountered error while downloading latest development-build zip archive...\n'
             )
-
-    @staticmethod
-    def _unzip_patch(filename: PathLike | str, mode: int) -> None:
-        """Unzip downloaded patch files and cleanup leftover files.
+            return None
+
+    @classmethod
+    def _unzip_patch(cls,
+                     filename: PathLike | str,
+                     mode: int,
+                     digest: str | None = None,
+                     version: str | None = None) -> bool:
+        """Unzip downloaded patch files straight into the artifact store.
+
+        - Each member is hashed while it is decompressed and written once, as a store object.
+            - Members are decompressed concurrently by :attr:`extract_workers` threads, largest first, on machines with several CPUs when at least :attr:`extract_parallel_min` bytes are extracted (see :class:`_ParallelExtract`).
+        - Members whose CRC-32 & size match the same file of the channel's newest stored version are not decompressed at all; the stored object is reused (see :func:`store.reusable`).
+            - Updating from one dev build to the next only writes the files that changed.
+        - Members listed in :attr:`_exclude` (e.g. `doorstop_config.ini`) are skipped rather than extracted and deleted.
+        - Opening the archive validates it, so no separate `is_zipfile` read is needed.
+        - Extracted bytes & files are reported to an `Extracting` progress task (see :data:`progress`), and counts of extracted, unchanged & dropped files are logged.
+        - The zip archive is deleted afterwards, unless :attr:`_keep_archive` is set.
 
 		---
 
@@ -134,61 +479,149 @@ class _Downloader:
 		:type filename: :class:`str` | :class:`PathLike`
 		:param mode: set to 1 to unzip stable release archive, or 2 to unzip dev-build archive.
 		:type mode: :class:`int`
-		:return: downloaded/extracted patch files.
-		:rtype: `None`
+		:param digest: hex SHA-256 digest of the archive, as returned by :func:`_download`, defaults to `None`.
+		:type digest: :class:`str` | `None`, optional
+		:param version: patch version/build of the archive, defaults to the latest version of the channel.
+		:type version: :class:`str` | `None`, optional
+		:return: `True` if patch files were extracted, otherwise `False`.
+		:rtype: :class:`bool`
 		"""
 
         logger_stream.info('Unzipping patch files...')
 
         try:
             if mode == 1:  # Unzip stable-release patch files
-                with ZipFile(filename) as archive:
-                    archive.extractall(path='./patch-files/stable')
-
-                # Remove unnecessary files
-                os.unlink('./patch-files/stable/doorstop_config.ini')
-                os.unlink(
-                    f'./patch-files/stable/BepInEx_stable_{VBPatcher.appglobals.globals.ver_stable}.zip'
-                )
-
-            elif mode == 2:  # Unzip dev-build patch files
-                with ZipFile(filename) as archive:
-                    archive.extractall(path='./patch-files/development')
-                # Remove unnecessary files
-                os.unlink('./patch-files/development/doorstop_config.ini')
-                os.unlink(
-                    f'./patch-files/development/BepInEx_dev_{VBPatcher.appglobals.globals.ver_dev}.zip'
-                )
+                channel = 'stable'
+                version = version or VBPatcher.appglobals.globals.ver_stable
+            else:  # Unzip dev-build patch files
+                channel = 'dev'
+                version = version or VBPatcher.appglobals.globals.ver_dev
+
+            previous: dict = store.reusable(channel)  # Files already stored
+            files: dict = {}
+            reused: int = 0
+            with ZipFile(filename) as archive, progress.task(
+                    'Extracting') as task, tracer.span(
+                        'extract', channel=channel, version=version) as span:
+                members: list = [
+                    member for member in archive.infolist() if
+                    not member.is_dir() and member.filename not in cls._exclude
+                ]
+                task.expect(sum(member.file_size for member in members),
+                            len(members))
+
+                changed: list = []
+                for member in members:
+                    entry: dict | None = previous.get(member.filename)
+                    if (entry and entry['crc32'] == member.CRC
+                            and entry['size'] == member.file_size
+                            and store.hold(entry['sha256'])):
+                        files[member.filename] = entry  # Unchanged
+                        reused += 1
+                        task.advance(member.file_size, 1)
+                    else:
+                        changed.append(member)
+
+                def report(size: int) -> None:
+                    task.advance(size, 1)
+                    span.add(size, 1)
+
+                workers: int = VBPatcher.appglobals.globals.extract_workers
+                span.note(workers=workers)
+                stored: dict = _ParallelExtract(
+                    filename, store, workers, report,
+                    VBPatcher.appglobals.globals.extract_parallel_min).run(
+                        changed)
+                for member in changed:
+                    sha256, size = stored[member.filename]  # Store patch file
+                    files[member.filename] = {
+                        'sha256': sha256,
+                        'size': size,
+                        'crc32': member.CRC
+                    }
+
+                dropped: int = len(previous.keys() - files.keys())
+                span.note(reused=reused, dropped=dropped)
+
+            store.add(channel, version, files, archive=digest)
+
+            if not cls._keep_archive:
+                os.unlink(filename)  # Remove unnecessary files
 
             logger_stream.info(
-                'Successfully unzipped archive!\n\n>> Deleted extra files...\n>> Patch ready for deployment!\n'
-            )
+                'Successfully unzipped archive!\n\n>> Extracted %d new or changed files, reused %d unchanged, dropped %d...\n>> Skipped extra files...\n>> Patch ready for deployment!\n',
+                len(files) - reused, reused, dropped)
+            return True
 
         except Exception:
             logger_stream.error(
-                f'Encountered error while attempting to unzip archive...\n')
+                'Encountered error while attempting to unzip archive...\n')
+            return False
 
-    def update_check(self) -> None:
+    def _fetch_patch(self, mode: int, task: _Task | None = None) -> bool:
+        """Download the patch archive for the given channel, and unzip it as soon as the download finishes.
+
+		---
+
+		:param mode: set to 1 for the stable release, or 2 for the dev-build.
+		:type mode: :class:`int`
+		:param task: shared progress task to report to, defaults to `None`.
+		:type task: :class:`_Task` | `None`, optional
+		:return: `True` if patch files are ready for deployment, otherwise `False`.
+		:rtype: :class:`bool`
+		"""
+
+        if mode == 1:
+            digest: str | None = self._dl_stable(
+                VBPatcher.appglobals.globals.url_stable, task)
+        else:
+            digest = self._dl_dev(VBPatcher.appglobals.globals.url_dev, task)
+
+        return digest is not None and self._unzip_patch(
+            self._archive(mode), mode, digest)
+
+    def update_check(self, concurrent: bool = True) -> None:
         """Retrieve latest available patch files.
 
+        - If :param:`concurrent` is `True`, the stable release and dev-build are downloaded in parallel behind one aggregated progress task, and each is unzipped as soon as its own download finishes.
+
 		---
 
+		:param concurrent: download both patches in parallel, defaults to `True`.
+		:type concurrent: :class:`bool`, optional
 		:return: download most recent release/build patch files.
 		:rtype: `None`
 		"""
 
-        # Retrieve latest stable build patch files from http://api.github.com/repos/BepInEx/BepInEx/releases/latest
-        if self._dl_stable(VBPatcher.appglobals.globals.url_stable):
-            self._unzip_patch(
-                f'./patch-files/stable/BepInEx_stable_{VBPatcher.appglobals.globals.ver_stable}.zip',
-                1)
-
-        # Retrieve latest development build patch files from https://builds.bepinex.dev/projects/bepinex_be
-        if self._dl_dev(VBPatcher.appglobals.globals.url_dev):
-            self._unzip_patch(
-                f'./patch-files/development/BepInEx_dev_{VBPatcher.appglobals.globals.ver_dev}.zip',
-                2)
-
-            logger_stream.info('\n>> Press anything to continue...\n')
-            VBPatcher.appglobals.globals.getch(
-            )  # Wait for user input to continue
+        artifacts: dict[int, str] = {
+            1:
+            f'stable release {VBPatcher.appglobals.globals.ver_stable}',  # http://api.github.com/repos/BepInEx/BepInEx/releases/latest
+            2:
+            f'development build {VBPatcher.appglobals.globals.ver_dev}'  # https://builds.bepinex.dev/projects/bepinex_be
+        }
+        results: dict[int, bool] = {}
+
+        if concurrent:
+            with progress.task(
+                    'Downloading Patches') as task, ThreadPoolExecutor(
+                        max_workers=len(artifacts)) as pool:
+                futures = {
+                    pool.submit(self._fetch_patch, mode, task): mode
+                    for mode in artifacts
+                }
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+
+        else:
+            for mode in artifacts:
+                results[mode] = self._fetch_patch(mode)
+
+        for mode, name in artifacts.items():  # Per-artifact report
+            if results[mode]:
+                logger_stream.info('>> BepInEx %s: updated successfully.',
+                                   name)
+            else:
+                logger_stream.warning('>> BepInEx %s: update failed!', name)
+
+        logger_stream.info('\n>> Press anything to continue...\n')
+        VBPatcher.appglobals.globals.getch()  # Wait for user input to continue
@@ -0,0 +1,120 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from os import PathLike
+from typing import Callable
+from zipfile import ZipFile, ZipInfo
+
+from VBPatcher.store.store import _ArtifactStore
+
+
+class _ParallelExtract:
+    """Decompress the members of a zip archive concurrently, storing each one as a store object.
+
+    - Every worker thread opens its own handle on the archive, so workers never contend for a shared file offset, while zlib inflates their members in parallel (it releases the GIL).
+    - Members are scheduled largest first, so the longest ones don't finish last.
+    - With one worker or one member, members are extracted on the calling thread.
+        - When :attr:`parallel_min` is set, they are also extracted on the calling thread on a single CPU, or when fewer bytes than that are decompressed, where a thread pool would only add overhead.
+
+    ---
+
+    - Contains the following methods:
+
+        - :func:`run(self, members) -> dict`
+            - Decompress & store every member of :param:`members`.
+    """
+
+    def __init__(self,
+                 filename: PathLike | str,
+                 store: _ArtifactStore,
+                 workers: int,
+                 report: Callable[[int], None],
+                 parallel_min: int = 0) -> None:
+        """Initialize parallel extraction.
+
+        ---
+
+        :param filename: filename of zip archive.
+        :type filename: :class:`str` | :class:`PathLike`
+        :param store: artifact store receiving the decompressed members.
+        :type store: :class:`_ArtifactStore`
+        :param workers: maximum number of members decompressed concurrently.
+        :type workers: :class:`int`
+        :param report: callback receiving the size of each stored member, called from worker threads.
+        :type report: :class:`Callable[[int], None]`
+        :param parallel_min: smallest uncompressed size of :param:`members` worth decompressing concurrently on several CPUs, in bytes, or `0` to always use :param:`workers` threads, defaults to `0`.
+        :type parallel_min: :class:`int`, optional
+        :return: new parallel extraction instance.
+        :rtype: `None`
+        """
+
+        self.filename = filename
+        self.store = store
+        self.workers = max(1, workers)
+        self.report = report
+        self.parallel_min = parallel_min
+        self._local = threading.local()  # Archive handle of each worker
+        self._handles: list = []  # Every opened archive handle
+        self._lock = threading.Lock()  # Guards :attr:`_handles`
+
+    def run(self, members: list[ZipInfo]) -> dict:
+        """Decompress & store every member of :param:`members`.
+
+        ---
+
+        :param members: archive members to extract.
+        :type members: :class:`list[ZipInfo]`
+        :return: mapping of member name to its stored `(sha256, size)`.
+        :rtype: :class:`dict`
+        :raises Exception: the first error raised while extracting a member.
+        """
+
+        ordered: list = sorted(members,
+                               key=lambda member: member.file_size,
+                               reverse=True)  # Largest first
+        workers: int = min(self.workers, len(ordered))
+        if self.parallel_min and ((os.cpu_count() or 1) <= 1 or sum(
+                member.file_size for member in ordered) < self.parallel_min):
+            workers = 1  # Not worth a thread pool
+
+        try:
+            if workers <= 1:
+                return dict(map(self._extract, ordered))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                return dict(pool.map(self._extract, ordered))
+        finally:
+            for archive in self._handles:
+                archive.close()
+            self._handles.clear()
+
+    def _archive(self) -> ZipFile:
+        """Return the calling thread's handle on the archive, opening it if needed.
+
+        ---
+
+        :return: open zip archive.
+        :rtype: :class:`ZipFile`
+        """
+
+        archive: ZipFile | None = getattr(self._local, 'archive', None)
+        if archive is None:
+            archive = self._local.archive = ZipFile(self.filename)
+            with self._lock:
+                self._handles.append(archive)
+        return archive
+
+    def _extract(self, member: ZipInfo) -> tuple[str, tuple[str, int]]:
+        """Decompress one member straight into the store.
+
+        ---
+
+        :param member: archive member to extract.
+        :type member: :class:`ZipInfo`
+        :return: member name & its stored `(sha256, size)`.
+        :rtype: :class:`tuple[str, tuple[str, int]]`
+        """
+
+        with self._archive().open(member) as src:
+            sha256, size = self.store.ingest(src)  # CRC-32 checked on read
+        self.report(size)
+        return member.filename, (sha256, size)
@@ -0,0 +1,271 @@
+import os
+import threading
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from time import perf_counter
+from typing import Callable
+
+import requests
+import urllib3
+from requests import Response
+from VBPatcher.downloader.digest import _DigestTracker
+from VBPatcher.network.network import client
+
+
+class _RangeIgnored(Exception):
+    """Raised when a server answers a `Range` request with the full archive (`Range` unsupported, or `If-Range` validator no longer matches)."""
+
+
+class _SegmentedDownload:
+    """Download an archive over several parallel connections, one byte range per connection.
+
+    - Each range is written with positioned writes into a preallocated `.part` file, so ranges never contend for a file offset.
+    - Each connection reads into one reusable buffer, growing its read size while the link keeps up.
+    - Segment progress is kept in :attr:`entries['segments']` as `[start, end, received]` triples, allowing an interrupted download to resume every range.
+    - Written ranges are reported to a :class:`_DigestTracker`, so the archive's digest is known once the last range arrives.
+
+    ---
+
+    - Contains the following methods:
+
+        - :func:`plan(url, connections, segment_min) -> dict`
+            - Probe :param:`url` and split it into byte ranges, if the server supports `Range` requests.
+            - Static method.
+
+        - :func:`preallocate(part, length) -> None`
+            - Create or resize the partial file to its final length.
+            - Static method.
+
+        - :func:`run(self) -> None`
+            - Fetch all unfinished ranges in parallel.
+    """
+
+    chunk_min: int = 64 * 1024  # Initial read size per connection (64 KB)
+    chunk_max: int = 1024 * 1024  # Largest read size per connection (1 MB)
+
+    def __init__(self,
+                 url: str,
+                 part: str,
+                 entries: dict,
+                 report: Callable[[int], None],
+                 tracker: _DigestTracker,
+                 retries: int | None = None) -> None:
+        """Initialize segmented download.
+
+        ---
+
+        :param url: URL from which to download archive.
+        :type url: :class:`str`
+        :param part: path of preallocated partial file.
+        :type part: :class:`str`
+        :param entries: download journal entries, as returned by :func:`plan`.
+        :type entries: :class:`dict`
+        :param report: callback receiving the number of newly written bytes.
+        :type report: :class:`Callable[[int], None]`
+        :param tracker: digest tracker fed with every written range.
+        :type tracker: :class:`_DigestTracker`
+        :param retries: retries of each range request, defaults to those of :data:`client`.
+        :type retries: :class:`int` | `None`, optional
+        :return: new segmented download instance.
+        :rtype: `None`
+        """
+
+        self.url = url
+        self.part = part
+        self.entries = entries
+        self.report = report
+        self.tracker = tracker
+        self.retries = retries
+        self._abort = threading.Event()  # Set after a range fails
+        self._lock = threading.Lock()  # Guards seek+write fallback
+
+    @staticmethod
+    def plan(url: str,
+             connections: int,
+             segment_min: int,
+             retries: int | None = None) -> dict:
+        """Probe :param:`url` and split it into byte ranges, if the server supports `Range` requests.
+
+        ---
+
+        :param url: URL from which to download archive.
+        :type url: :class:`str`
+        :param connections: maximum number of parallel connections.
+        :type connections: :class:`int`
+        :param segment_min: smallest range worth a connection of its own, in bytes.
+        :type segment_min: :class:`int`
+        :param retries: retries of the probe, defaults to those of :data:`client`.
+        :type retries: :class:`int` | `None`, optional
+        :return: journal entries describing the planned ranges, or an empty dict if the archive should be streamed over one connection (also when the server rejects `HEAD`).
+        :rtype: :class:`dict`
+        """
+
+        rq: Response = client.head(url, retries=retries, allow_redirects=True)
+        if not rq.ok:  # HEAD rejected (e.g. 405); a plain GET may still work
+            return {}
+
+        length: int = int(rq.headers.get('Content-Length', 0))
+        count: int = min(connections, length // segment_min)
+
+        if rq.headers.get('Accept-Ranges') != 'bytes' or count < 2:
+            return {}
+
+        bounds: list = [length * i // count for i in range(count + 1)]
+
+        return {
+            'url': url,
+            'etag': rq.headers.get('ETag'),
+            'length': length,
+            'received': 0,
+            'segments':
+            [[bounds[i], bounds[i + 1] - 1, 0] for i in range(count)]
+        }
+
+    @staticmethod
+    def preallocate(part: str, length: int) -> None:
+        """Create or resize the partial file to its final length.
+
+        ---
+
+        :param part: path of partial file.
+        :type part: :class:`str`
+        :param length: final length of archive, in bytes.
+        :type length: :class:`int`
+        :return: preallocated partial file.
+        :rtype: `None`
+        """
+
+        with open(part, 'wb') as fh:
+            if hasattr(os, 'posix_fallocate'):
+                os.posix_fallocate(fh.fileno(), 0, length)
+            else:
+                fh.truncate(length)
+
+    def run(self) -> None:
+        """Fetch all unfinished ranges in parallel.
+
+        - The first failing range cancels the others, leaving every range's progress recorded in :attr:`entries` for a later resume.
+
+        ---
+
+        :return: completed partial file.
+        :rtype: `None`
+        """
+
+        segments: list = [
+            s for s in self.entries['segments'] if s[0] + s[2] <= s[1]
+        ]
+        if not segments:
+            return
+
+        fd: int = os.open(self.part, os.O_WRONLY | getattr(os, 'O_BINARY', 0))
+        try:
+            with ThreadPoolExecutor(max_workers=len(segments)) as pool:
+                futures = [
+                    pool.submit(self._fetch, fd, segment)
+                    for segment in segments
+                ]
+                done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+                if any(f.exception() for f in done):
+                    self._abort.set()
+                for future in futures:
+                    future.result()  # Re-raise first failure
+        finally:
+            os.close(fd)
+            self.entries['received'] = sum(s[2]
+                                           for s in self.entries['segments'])
+
+    def _fetch(self, fd: int, segment: list) -> None:
+        """Fetch the unfinished remainder of a single range.
+
+        ---
+
+        :param fd: file descriptor of partial file.
+        :type fd: :class:`int`
+        :param segment: `[start, end, received]` triple, updated in place.
+        :type segment: :class:`list`
+        :return: written byte range.
+        :rtype: `None`
+        """
+
+        start, end, received = segment
+        pos: int = start + received
+
+        headers: dict = {'Range': f'bytes={pos}-{end}'}
+        if self.entries.get('etag'):
+            headers['If-Range'] = self.entries['etag']
+
+        with client.get(self.url,
+                        retries=self.retries,
+                        headers=headers,
+                        allow_redirects=True,
+                        stream=True) as rq:
+            rq.raise_for_status()
+            if rq.status_code != 206:
+                raise _RangeIgnored(self.url)
+
+            buf: bytearray = bytearray(self.chunk_max)  # Reused for every read
+            view: memoryview = memoryview(buf)
+            chunk: int = self.chunk_min
+
+            while pos <= end:
+                if self._abort.is_set():
+                    return
+
+                started: float = perf_counter()
+                try:
+                    n: int = rq.raw.readinto(view[:min(chunk, end - pos + 1)])
+                except (urllib3.exceptions.HTTPError, OSError) as e:
+                    raise requests.exceptions.ChunkedEncodingError(e) from e
+                if not n:
+                    raise requests.exceptions.ChunkedEncodingError(
+                        f'Range {start}-{end} ended early at byte {pos}')
+
+                self._write(fd, view[:n], pos)
+                segment[2] += n
+                self.tracker.feed(pos, view[:n], self._watermark())
+                pos += n
+                self.report(n)
+
+                if n == chunk and perf_counter() - started < 0.05:
+                    # Link keeps up, read more per call
+                    chunk = min(chunk * 2, self.chunk_max)
+
+    def _watermark(self) -> int:
+        """Return length of the fully written prefix of the partial file.
+
+        ---
+
+        :return: offset of the first byte not yet written.
+        :rtype: :class:`int`
+        """
+
+        for start, end, received in self.entries['segments']:
+            if start + received <= end:
+                return start + received
+        return self.entries['length']
+
+    def _write(self, fd: int, data: memoryview, offset: int) -> None:
+        """Write :param:`data` at :param:`offset` of the partial file.
+
+        ---
+
+        :param fd: file descriptor of partial file.
+        :type fd: :class:`int`
+        :param data: bytes to write.
+        :type data: :class:`memoryview`
+        :param offset: position within the partial file.
+        :type offset: :class:`int`
+        :return: written bytes.
+        :rtype: `None`
+        """
+
+        if hasattr(os, 'pwrite'):
+            while data:
+                written: int = os.pwrite(fd, data, offset)
+                data, offset = data[written:], offset + written
+            return
+
+        with self._lock:  # Windows has no positioned writes
+            os.lseek(fd, offset, os.SEEK_SET)
+            while data:
+                data = data[os.write(fd, data):]
@@ -1,27 +1,29 @@
 #!/usr/bin/env python3
 
 import sys
-from os import chdir
+from os import chdir, getcwd
 from os.path import dirname
 from time import sleep
 
-from PyLoadBar import PyLoadBar
-
 sys.path.insert(0, dirname(
     dirname(__file__)))  # Ensure main module can be found by Python.
+launch_dir: str = getcwd()  # Directory the patcher was started from.
 chdir(dirname(__file__))  # Change cwd to main module directory.
 
 import VBPatcher.appglobals.globals
+from VBPatcher.appglobals.lazy import _LazyInstance
 from VBPatcher.apploggers.loggers import logger, logger_stream
-from VBPatcher.downloader.downloader import _Downloader
-from VBPatcher.patching.patching import _Patcher
 from VBPatcher.subprocessing.subprocessing import _exitPatcher, _openValheim
-from VBPatcher.validation.validation import _Validate
 
-dl = _Downloader()  # Initialize Downloader.
-patcher = _Patcher()  # Initialize Patcher.
-validate = _Validate()  # Initialize Validations.
-cancel = PyLoadBar(False)  # Initialize text-based loading sequence.
+# Created on first use, so headless commands only import what they run.
+dl = _LazyInstance('VBPatcher.downloader.downloader',
+                   '_Downloader')  # Initialize Downloader.
+patcher = _LazyInstance('VBPatcher.patching.patching',
+                        '_Patcher')  # Initialize Patcher.
+validate = _LazyInstance('VBPatcher.validation.validation',
+                         '_Validate')  # Initialize Validations.
+cancel = _LazyInstance('PyLoadBar', 'PyLoadBar',
+                       False)  # Initialize text-based loading sequence.
 
 #$ ====================================================================================================== $#
 
@@ -29,16 +31,27 @@ cancel = PyLoadBar(False)  # Initialize text-based loading sequence.
 def main() -> None:
     """Program entry point.
 
+    - When started with command-line arguments, runs the matching headless command instead of the interactive menu (see :func:`VBPatcher.cli.cli.main`), exiting with its exit code.
+
     ---
 
     :return: start VBPatcher.
     :rtype: `None`
     """
 
+    if len(sys.argv) > 1:
+        from VBPatcher.cli import cli  # Not imported by the interactive menu
+
+        return sys.exit(cli.main(sys.argv[1:], launch_dir))
+
     logger.info(
         f'Welcome to the Valheim Bepinex Patcher v{VBPatcher.appglobals.globals.__version__}!\n>> Session Start: {VBPatcher.appglobals.globals.datefmt}\n\n'
     )
 
+    from VBPatcher.progress.progress import _BarRenderer, progress
+
+    progress.subscribe(_BarRenderer())  # Render real download/deploy progress.
+
     validate._start_checks()  # Ensure presence of patch files.
 
     return patcher_menu()
@@ -57,7 +70,7 @@ def patcher_menu() -> None:
         logger.info('Displaying user menu...\n')
 
         choosePatch: str = input(
-            f"Welcome to the Valheim Bepinex Patcher v{VBPatcher.appglobals.globals.__version__}!\n\nPlease Choose an Option by Entering its Corresponding Number:\n\n{VBPatcher.appglobals.globals.textborder}\n>> [1] Patch BepInEx to latest stable release: {VBPatcher.appglobals.globals.ver_stable}\n>> [2] Patch BepInEx to latest development/bleeding-edge build: {VBPatcher.appglobals.globals.ver_dev}\n>> [3] Apply both patches to BepInEx in chronological order of release ({VBPatcher.appglobals.globals.ver_stable} then {VBPatcher.appglobals.globals.ver_dev})\n>> [4] Check for/update to newest patch versions\n>> [5] Open Valheim\n>> [6] Exit Program\n\n> "
+            f"Welcome to the Valheim Bepinex Patcher v{VBPatcher.appglobals.globals.__version__}!\n\nPlease Choose an Option by Entering its Corresponding Number:\n\n{VBPatcher.appglobals.globals.textborder}\n>> [1] Patch BepInEx to latest stable release: {VBPatcher.appglobals.globals.ver_stable}\n>> [2] Patch BepInEx to latest development/bleeding-edge build: {VBPatcher.appglobals.globals.ver_dev}\n>> [3] Apply both patches to BepInEx in chronological order of release ({VBPatcher.appglobals.globals.ver_stable} then {VBPatcher.appglobals.globals.ver_dev})\n>> [4] Check for/update to newest patch versions\n>> [5] Roll back last deployment\n>> [6] Open Valheim\n>> [7] Exit Program\n\n> "
         )
 
         if choosePatch == '1':  # Patch BepInEx to latest stable release.
@@ -81,12 +94,16 @@ def patcher_menu() -> None:
             logger.info('Chose option [4] to check for new patch updates...')
             dl.update_check()
 
-        elif choosePatch == '5':  # Open Valheim.
-            logger.info('Chose option [5] to start Valheim...')
+        elif choosePatch == '5':  # Roll back last deployment.
+            logger.info('Chose option [5] to roll back last deployment...')
+            patcher._rollback()
+
+        elif choosePatch == '6':  # Open Valheim.
+            logger.info('Chose option [6] to start Valheim...')
             _openValheim()
 
-        elif choosePatch == '6':  # Exit Program.
-            logger.info('Chose option [6] to close patcher...')
+        elif choosePatch == '7':  # Exit Program.
+            logger.info('Chose option [7] to close patcher...')
             logger.info(
                 'Completed VBPatcher processes...\n>> Preparing to exit patcher...\n'
             )
@@ -100,7 +117,7 @@ def patcher_menu() -> None:
 
         else:  # Invalid input.
             logger_stream.warning(
-                f'Invalid Input!\n\n>> Your Entry: "{choosePatch}".\n\n>> Must ONLY enter:\n>> [1] to deploy stable build {VBPatcher.appglobals.globals.ver_stable}\n>> [2] to deploy development build {VBPatcher.appglobals.globals.ver_dev}\n>> [3] to deploy BOTH builds in order of release\n>> [4] to check for/update latest patch versions/builds\n>> [5] to open Valheim\n>> [6] to exit program\n\n'
+                f'Invalid Input!\n\n>> Your Entry: "{choosePatch}".\n\n>> Must ONLY enter:\n>> [1] to deploy stable build {VBPatcher.appglobals.globals.ver_stable}\n>> [2] to deploy development build {VBPatcher.appglobals.globals.ver_dev}\n>> [3] to deploy BOTH builds in order of release\n>> [4] to check for/update latest patch versions/builds\n>> [5] to roll back the last deployment\n>> [6] to open Valheim\n>> [7] to exit program\n\n'
             )
             sleep(1.5)
 
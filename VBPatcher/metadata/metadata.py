@@ -0,0 +1,315 @@
+import json
+import os
+import threading
+from time import time
+from typing import TYPE_CHECKING, Iterable
+
+import VBPatcher.appglobals.globals
+from VBPatcher.metadata.scraper import _ArtifactsScraper, _DevArtifact
+from VBPatcher.network.network import client
+from VBPatcher.tracing.tracing import tracer
+
+if TYPE_CHECKING:
+    from requests import Response
+
+
+class _PatcherAssets:
+    """Wrapper for parsing necessary patcher assets out of release metadata.
+
+    ---
+
+    Contained Methods:
+
+        - :func:`_parse_stable(payload) -> tuple[str, str]`
+            - Parse BepInEx stable build download link and version from GitHub API release payload.
+            - Static method.
+
+        - :func:`_parse_dev(chunks, url, encoding) -> tuple[str, str]`
+            - Parse BepInEx dev/bleeding-edge build download link and version from builds page HTML.
+            - Static method.
+    """
+
+    @staticmethod
+    def _parse_stable(payload: dict) -> tuple[str, str]:
+        """Parse BepInEx stable build download link and version from GitHub API release payload.
+
+        ---
+
+        :param payload: decoded JSON body of the latest GitHub release.
+        :type payload: :class:`dict`
+        :return: patch archive download link and patch version number.
+        :rtype: :class:`tuple[str, str]`
+        """
+
+        asset: dict = payload['assets'][1]  # Get release archive asset.
+
+        dl_link: str = asset['browser_download_url']  # Get download link.
+        patch_ver: str = asset['name'][12:20]  # Get patch version.
+
+        return dl_link, patch_ver
+
+    @staticmethod
+    def _parse_dev(chunks: Iterable[bytes],
+                   url: str,
+                   encoding: str | None = None) -> tuple[str, str]:
+        """Parse BepInEx dev/bleeding-edge build download link and version from builds page HTML.
+
+        - The page is parsed as it streams in, and only up to the newest build's artifact (see :class:`_ArtifactsScraper`).
+
+        ---
+
+        :param chunks: raw chunks of the builds page.
+        :type chunks: :class:`Iterable[bytes]`
+        :param url: URL the builds page was retrieved from.
+        :type url: :class:`str`
+        :param encoding: character encoding of the page, defaults to `utf-8`.
+        :type encoding: :class:`str` | `None`, optional
+        :return: patch archive download link and patch build (short commit hash).
+        :rtype: :class:`tuple[str, str]`
+        """
+
+        artifact: _DevArtifact = _ArtifactsScraper.scrape(
+            chunks, url,
+            encoding)  # Second link of the newest build's artifacts
+
+        return artifact.url, artifact.commit[:7]
+
+
+class _ReleaseResolver:
+    """Lazily resolve and cache BepInEx release metadata.
+
+    - Each metadata source is requested at most once per process, and only when first needed.
+    - Resolved values are persisted to an on-disk cache along with the response's `ETag` & `Last-Modified` validators.
+        - Cache entries younger than :param:`ttl` seconds are used without any network request.
+        - Older entries are revalidated with a conditional GET, so an unchanged release costs a single `304` response.
+        - If revalidation fails, the stale cache entry is used rather than failing outright.
+    - If a LAN mirror is configured (:attr:`mirror_url`), metadata is requested from it first, then from upstream.
+
+    ---
+
+    - Contains the following methods:
+
+        - :func:`stable(self) -> tuple[str, str]`
+            - Return stable release download link and version.
+
+        - :func:`dev(self) -> tuple[str, str]`
+            - Return development build download link and build number.
+
+        - :func:`invalidate(self) -> None`
+            - Forget values resolved during this process, forcing revalidation on next access.
+    """
+
+    def __init__(self, cache_file: str, ttl: float) -> None:
+        """Initialize resolver instance.
+
+        ---
+
+        :param cache_file: path of JSON file used to persist release metadata.
+        :type cache_file: :class:`str`
+        :param ttl: seconds for which a cached entry is trusted without revalidation.
+        :type ttl: :class:`float`
+        :return: new resolver instance.
+        :rtype: `None`
+        """
+
+        self.cache_file = cache_file
+        self.ttl = ttl
+        self._resolved: dict[str, tuple[str, str]] = {}
+        self._locks: dict[str, threading.Lock] = {
+            'stable': threading.Lock(),
+            'dev': threading.Lock()
+        }
+        self._cache_lock = threading.Lock()
+
+    def stable(self) -> tuple[str, str]:
+        """Return latest BepInEx stable release download link and version.
+
+        ---
+
+        :return: patch archive download link and patch version number.
+        :rtype: :class:`tuple[str, str]`
+        """
+
+        return self._resolve('stable', VBPatcher.appglobals.globals.api_stable,
+                             lambda r: _PatcherAssets._parse_stable(r.json()))
+
+    def dev(self) -> tuple[str, str]:
+        """Return latest BepInEx development build download link and build number.
+
+        ---
+
+        :return: patch archive download link and patch build number.
+        :rtype: :class:`tuple[str, str]`
+        """
+
+        url: str = VBPatcher.appglobals.globals.api_dev
+
+        return self._resolve(
+            'dev', url, lambda r: _PatcherAssets._parse_dev(
+                r.iter_content(16 * 1024), url, r.encoding
+                if 'charset=' in r.headers.get('Content-Type', '') else None))
+
+    def invalidate(self) -> None:
+        """Forget values resolved during this process, forcing revalidation on next access.
+
+        ---
+
+        :return: cleared in-process metadata.
+        :rtype: `None`
+        """
+
+        self._resolved.clear()
+
+    def _resolve(self, source: str, url: str, parse) -> tuple[str, str]:
+        """Resolve metadata for :param:`source`, using the in-process value or disk cache where possible.
+
+        ---
+
+        :param source: name of metadata source (`stable` or `dev`).
+        :type source: :class:`str`
+        :param url: URL to request metadata from.
+        :type url: :class:`str`
+        :param parse: callable extracting `(link, version)` from a successful :class:`Response`.
+        :type parse: :class:`Callable[[Response], tuple[str, str]]`
+        :return: patch archive download link and patch version.
+        :rtype: :class:`tuple[str, str]`
+        """
+
+        with tracer.span('metadata',
+                         source=source) as span, self._locks[source]:
+            if source in self._resolved:
+                span.note(result='memory')
+                return self._resolved[source]
+
+            entry: dict = self._read_cache().get(source, {})
+            if entry.get('url') != url:
+                entry = {}  # Cached entry belongs to a different source URL
+
+            if entry and time() - entry['checked'] < self.ttl:
+                span.note(result='cache')
+                self._resolved[source] = (entry['link'], entry['version'])
+                return self._resolved[source]
+
+            headers: dict = {}
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('modified'):
+                headers['If-Modified-Since'] = entry['modified']
+
+            try:
+                r, parse = self._request(source, url, headers, parse)
+
+                try:
+                    if r.status_code == 304 and entry:  # Release unchanged
+                        span.note(result='not-modified')
+                        entry['checked'] = time()
+
+                    else:
+                        r.raise_for_status()  # Raise exception on error code.
+                        link, version = parse(r)
+                        span.note(result='fetched')
+                        entry = {
+                            'url': url,
+                            'link': link,
+                            'version': version,
+                            'etag': r.headers.get('ETag'),
+                            'modified': r.headers.get('Last-Modified'),
+                            'checked': time()
+                        }
+                finally:
+                    span.add(r.raw.tell())  # Body bytes actually read
+                    r.close()  # Parsers may stop before the end of the body
+
+            except Exception:
+                if not entry:
+                    raise
+                # Fall back to stale cache entry if source is unreachable.
+                span.note(result='stale')
+                self._resolved[source] = (entry['link'], entry['version'])
+                return self._resolved[source]
+
+            self._write_cache(source, entry)
+            self._resolved[source] = (entry['link'], entry['version'])
+            return self._resolved[source]
+
+    @staticmethod
+    def _request(source: str, url: str, headers: dict,
+                 parse) -> tuple['Response', object]:
+        """Request metadata from the LAN mirror (see :attr:`mirror_url`), falling back to :param:`url` if the mirror is unset or unable to answer.
+
+        ---
+
+        :param source: name of metadata source (`stable` or `dev`).
+        :type source: :class:`str`
+        :param url: upstream URL to request metadata from.
+        :type url: :class:`str`
+        :param headers: conditional request headers.
+        :type headers: :class:`dict`
+        :param parse: callable extracting `(link, version)` from an upstream :class:`Response`.
+        :type parse: :class:`Callable[[Response], tuple[str, str]]`
+        :return: response, and the callable extracting `(link, version)` from it.
+        :rtype: :class:`tuple[Response, Callable[[Response], tuple[str, str]]]`
+        """
+
+        import requests
+
+        mirror: str = VBPatcher.appglobals.globals.mirror_url
+        if mirror:
+            try:
+                r: 'Response' = client.get(
+                    f'{mirror.rstrip("/")}/metadata/{source}',
+                    headers=headers,
+                    stream=True,
+                    retries=0)  # Fall back to upstream at once
+                if r.status_code in (200, 304):
+                    return r, lambda r: (r.json()['link'], r.json()['version'])
+                r.close()
+            except requests.exceptions.RequestException:
+                pass  # Mirror unreachable
+
+        return client.get(url, headers=headers,
+                          stream=True), parse  # Send request.
+
+    def _read_cache(self) -> dict:
+        """Read metadata cache from disk.
+
+        ---
+
+        :return: cached metadata entries keyed by source, or an empty dict if no valid cache exists.
+        :rtype: :class:`dict`
+        """
+
+        try:
+            with open(self.cache_file, 'r') as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_cache(self, source: str, entry: dict) -> None:
+        """Atomically persist a single metadata entry to the disk cache.
+
+        ---
+
+        :param source: name of metadata source (`stable` or `dev`).
+        :type source: :class:`str`
+        :param entry: metadata entry to store.
+        :type entry: :class:`dict`
+        :return: updated cache file.
+        :rtype: `None`
+        """
+
+        with self._cache_lock:
+            cache: dict = self._read_cache()
+            cache[source] = entry
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            tmp: str = f'{self.cache_file}.tmp'
+            with open(tmp, 'w') as fh:
+                json.dump(cache, fh, indent=2)
+            os.replace(
+                tmp,
+                self.cache_file)  # Never leave a half-written cache behind
+
+
+resolver: _ReleaseResolver = _ReleaseResolver(
+    VBPatcher.appglobals.globals.metadata_cache,
+    VBPatcher.appglobals.globals.metadata_ttl)  # Shared resolver instance
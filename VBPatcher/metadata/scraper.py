@@ -0,0 +1,154 @@
+import codecs
+import re
+from html.parser import HTMLParser
+from typing import Iterable, NamedTuple
+from urllib.parse import unquote, urljoin
+
+
+class _DevArtifact(NamedTuple):
+    """Newest development build artifact listed on the builds page."""
+
+    build: str  # Build number (e.g. `577`)
+    commit: str  # Commit hash the build was made from (e.g. `ec79ad0`)
+    name: str  # Artifact file name
+    url: str  # Absolute download URL
+
+
+class _ArtifactsScraper(HTMLParser):
+    """Stream the builds.bepinex.dev project page, stopping at the newest artifact.
+
+    - No document tree is built: tags are matched as they are parsed, and parsing ends once the wanted link of the first `div.artifacts-list` has been seen, so the rest of the page is never downloaded or parsed.
+    - The build number & commit hash are read from the build's `artifact-id` & `hash-button` elements when present, otherwise from the artifact's file name (e.g. `BepInEx_UnityMono_x64_ec79ad0_6.0.0-be.577.zip`).
+
+    ---
+
+    - Contains the following methods:
+
+        - :func:`scrape(chunks, url, encoding, index) -> _DevArtifact`
+            - Parse the newest artifact from the builds page, fed chunk by chunk.
+            - Class method.
+    """
+
+    _build_re = re.compile(r'be\.(\d+)')  # Build number in file name
+    _commit_re = re.compile(
+        r'(?:^|[_+.-])([0-9a-f]{7,40})(?=[_+.-])')  # Commit hash in file name
+
+    def __init__(self, url: str, index: int = 1) -> None:
+        """Initialize scraper.
+
+        ---
+
+        :param url: URL the builds page is retrieved from, to resolve relative links against.
+        :type url: :class:`str`
+        :param index: position of the wanted link within the first `div.artifacts-list`, defaults to `1`.
+        :type index: :class:`int`, optional
+        :return: new scraper instance.
+        :rtype: `None`
+        """
+
+        super().__init__(convert_charrefs=True)
+        self.url = url
+        self.index = index
+        self.href: str | None = None  # Link of the wanted artifact
+        self.done: bool = False  # Set once parsing can stop
+        self._depth: int = 0  # `<div>` nesting within the artifacts list
+        self._links: int = 0  # Links seen within the artifacts list
+        self._field: str | None = None  # `build` or `commit` while inside one
+        self._fields: dict = {}  # Build details seen before the artifacts list
+
+    @classmethod
+    def scrape(cls,
+               chunks: Iterable[bytes],
+               url: str,
+               encoding: str | None = None,
+               index: int = 1) -> _DevArtifact:
+        """Parse the newest artifact from the builds page, fed chunk by chunk.
+
+        - Stops consuming :param:`chunks` as soon as the artifact is found.
+
+        ---
+
+        :param chunks: raw chunks of the builds page (e.g. :func:`Response.iter_content`).
+        :type chunks: :class:`Iterable[bytes]`
+        :param url: URL the builds page was retrieved from.
+        :type url: :class:`str`
+        :param encoding: character encoding of the page, defaults to `utf-8`.
+        :type encoding: :class:`str` | `None`, optional
+        :param index: position of the wanted link within the first `div.artifacts-list`, defaults to `1`.
+        :type index: :class:`int`, optional
+        :return: newest artifact.
+        :rtype: :class:`_DevArtifact`
+        :raises ValueError: if the page lists no such artifact.
+        """
+
+        scraper = cls(url, index)
+        decoder = codecs.getincrementaldecoder(encoding or 'utf-8')('replace')
+
+        for chunk in chunks:
+            scraper.feed(decoder.decode(chunk))
+            if scraper.done:
+                break
+
+        if scraper.href is None:
+            raise ValueError(f'No build artifact found on {url}')
+        return scraper._artifact()
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        if self.done:
+            return
+
+        if self._depth:
+            if tag == 'div':
+                self._depth += 1
+            elif tag == 'a':
+                if self._links == self.index:
+                    self.href = dict(attrs).get('href')
+                    self.done = True
+                self._links += 1
+            return
+
+        classes: list = (dict(attrs).get('class') or '').split()
+        if tag == 'div' and 'artifacts-list' in classes:
+            self._depth = 1
+        elif 'artifact-id' in classes:
+            self._field = 'build'
+        elif 'hash-button' in classes or 'artifact-hash' in classes:
+            self._field = 'commit'
+
+    def handle_endtag(self, tag: str) -> None:
+        self._field = None
+        if self._depth and tag == 'div':
+            self._depth -= 1
+            if not self._depth:
+                self.done = True  # Only the first list holds the newest build
+
+    def handle_data(self, data: str) -> None:
+        if self._field and data.strip():
+            self._fields.setdefault(self._field, data.strip().lstrip('#'))
+
+    def _artifact(self) -> _DevArtifact:
+        """Assemble the artifact record from the parsed link & build details.
+
+        ---
+
+        :return: newest artifact.
+        :rtype: :class:`_DevArtifact`
+        :raises ValueError: if the build's commit hash can't be determined.
+        """
+
+        url: str = urljoin(self.url, self.href)
+        name: str = unquote(url.rsplit('/', 1)[-1])
+
+        build: str | None = self._fields.get('build')
+        if build is None:
+            match = self._build_re.search(name)
+            build = match.group(1) if match else ''
+
+        commit: str | None = self._fields.get('commit')
+        if commit is None:
+            match = self._commit_re.search(name)
+            if match is None:
+                raise ValueError(f'No commit hash found in artifact {name}')
+            commit = match.group(1)
+
+        return _DevArtifact(build, commit, name, url)
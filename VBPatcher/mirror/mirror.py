@@ -0,0 +1,363 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from zipfile import ZIP_STORED, ZipFile, ZipInfo
+
+from VBPatcher.apploggers.loggers import logger
+from VBPatcher.downloader.downloader import _Downloader
+from VBPatcher.metadata.metadata import _ReleaseResolver
+from VBPatcher.store.store import _ArtifactStore
+
+
+class _MirrorHandler(BaseHTTPRequestHandler):
+    """Answer mirror requests, honouring `If-None-Match`, `Range` & `If-Range`.
+
+    - `GET /metadata/{stable|dev}`: `{'link', 'version'}` of the latest release, as resolved by the mirror.
+    - `GET /archives/{stable|dev}/{version}.zip`: patch archive of a version, rebuilt from the artifact store.
+    """
+
+    protocol_version = 'HTTP/1.1'
+    chunk_size: int = 1024 * 1024  # 1 MB
+
+    def do_GET(self) -> None:
+        self._handle(head=False)
+
+    def do_HEAD(self) -> None:
+        self._handle(head=True)
+
+    def log_message(self, format: str, *args) -> None:
+        logger.info('Mirror %s - ' + format, self.address_string(), *args)
+
+    def _handle(self, head: bool) -> None:
+        """Route a request to the metadata or archive endpoint.
+
+        ---
+
+        :param head: send headers only.
+        :type head: :class:`bool`
+        :return: sent response.
+        :rtype: `None`
+        """
+
+        mirror: _Mirror = self.server.mirror
+        parts: list = [
+            part for part in self.path.split('?')[0].split('/') if part
+        ]
+
+        try:
+            if len(parts) == 2 and parts[0] == 'metadata' and parts[
+                    1] in mirror.channels:
+                body, etag = mirror.metadata(parts[1])
+                return self._send_bytes(body, etag, 'application/json', head)
+
+            if len(parts) == 3 and parts[0] == 'archives' and parts[
+                    1] in mirror.channels and parts[2].endswith('.zip'):
+                found: tuple | None = mirror.archive(parts[1], parts[2][:-4])
+                if found is not None:
+                    return self._send_file(*found, head)
+
+        except Exception:
+            logger.error('Mirror failed to answer %s...', self.path)
+            return self._send_status(502)
+
+        return self._send_status(404)
+
+    def _send_status(self, status: int, headers: dict | None = None) -> None:
+        """Send an empty response.
+
+        ---
+
+        :param status: HTTP status code.
+        :type status: :class:`int`
+        :param headers: extra response headers, defaults to `None`.
+        :type headers: :class:`dict` | `None`, optional
+        :return: sent response.
+        :rtype: `None`
+        """
+
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def _send_bytes(self, body: bytes, etag: str, kind: str,
+                    head: bool) -> None:
+        """Send a small in-memory body, or `304` if the client's copy is current.
+
+        ---
+
+        :param body: response body.
+        :type body: :class:`bytes`
+        :param etag: entity tag of the body.
+        :type etag: :class:`str`
+        :param kind: content type.
+        :type kind: :class:`str`
+        :param head: send headers only.
+        :type head: :class:`bool`
+        :return: sent response.
+        :rtype: `None`
+        """
+
+        if self.headers.get('If-None-Match') == etag:
+            return self._send_status(304, {'ETag': etag})
+
+        self.send_response(200)
+        self.send_header('ETag', etag)
+        self.send_header('Content-Type', kind)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def _send_file(self, path: str, etag: str, head: bool) -> None:
+        """Send a file, or the byte range of it requested by the client.
+
+        ---
+
+        :param path: path of file.
+        :type path: :class:`str`
+        :param etag: entity tag of the file.
+        :type etag: :class:`str`
+        :param head: send headers only.
+        :type head: :class:`bool`
+        :return: sent response.
+        :rtype: `None`
+        """
+
+        headers: dict = {
+            'ETag': etag,
+            'Accept-Ranges': 'bytes',
+            'Content-Type': 'application/zip'
+        }
+        if self.headers.get('If-None-Match') == etag:
+            return self._send_status(304, headers)
+
+        size: int = os.path.getsize(path)
+        start, end = 0, size - 1
+        status: int = 200
+
+        rng: str | None = self.headers.get('Range')
+        if rng and self.headers.get('If-Range') in (None, etag):
+            try:
+                first, last = rng.split('=', 1)[1].split(',')[0].split('-')
+                if first:
+                    start, end = int(first), min(int(last or end), end)
+                else:  # Suffix range, e.g. `bytes=-500`
+                    start = max(size - int(last), 0)
+            except ValueError:
+                return self._send_status(400)
+            if start >= size or start > end:
+                return self._send_status(416,
+                                         {'Content-Range': f'bytes */{size}'})
+            status = 206
+            headers['Content-Range'] = f'bytes {start}-{end}/{size}'
+
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(end - start + 1))
+        self.end_headers()
+        if head:
+            return
+
+        with open(path, 'rb') as fh:
+            fh.seek(start)
+            remaining: int = end - start + 1
+            while remaining:
+                block: bytes = fh.read(min(self.chunk_size, remaining))
+                if not block:
+                    break
+                self.wfile.write(block)
+                remaining -= len(block)
+
+
+class _Mirror:
+    """Serve the artifact store & release metadata to other patchers on the LAN.
+
+    - Other machines set :attr:`mirror_url` to this mirror, then resolve release metadata & download patch archives through it, falling back to upstream whenever it can't answer.
+    - Archives are rebuilt from the artifact store as uncompressed, deterministic zips, so every request for a version gets identical bytes, and a stable `ETag` for resuming downloads.
+        - Built archives are kept in `{store}/mirror` until their version is evicted from the store.
+    - A requested version that isn't stored yet, but is the latest of its channel, is downloaded from upstream once, then served to every machine.
+
+    ---
+
+    - Contains the following methods:
+
+        - :func:`metadata(self, channel) -> tuple[bytes, str]`
+            - Return JSON `{'link', 'version'}` of the latest release of a channel, and its `ETag`.
+
+        - :func:`archive(self, channel, version) -> tuple[str, str] | None`
+            - Return path & `ETag` of the archive of a stored version, building it if needed.
+
+        - :func:`serve(self, bind, port) -> None`
+            - Serve mirror requests until interrupted.
+    """
+
+    channels: tuple = ('stable', 'dev')  # Mirrored patch channels
+
+    def __init__(self, store: _ArtifactStore,
+                 resolver: _ReleaseResolver) -> None:
+        """Initialize mirror.
+
+        ---
+
+        :param store: artifact store to serve.
+        :type store: :class:`_ArtifactStore`
+        :param resolver: resolver of upstream release metadata.
+        :type resolver: :class:`_ReleaseResolver`
+        :return: new mirror instance.
+        :rtype: `None`
+        """
+
+        self.store = store
+        self.resolver = resolver
+        self.root = f'{store.root}/mirror'  # Built archives
+        self._etags: dict = {}  # ETag of each built archive, by path
+        self._lock = threading.Lock()  # Serializes archive builds & pulls
+
+    def metadata(self, channel: str) -> tuple[bytes, str]:
+        """Return JSON `{'link', 'version'}` of the latest release of a channel, and its `ETag`.
+
+        - Metadata is re-read from the resolver's cache on every request, so it is revalidated upstream once per :attr:`metadata_ttl` for the whole fleet.
+
+        ---
+
+        :param channel: patch channel (`stable` or `dev`).
+        :type channel: :class:`str`
+        :return: response body & entity tag.
+        :rtype: :class:`tuple[bytes, str]`
+        """
+
+        self.resolver.invalidate()  # Drop in-process values, keep disk cache
+        link, version = getattr(self.resolver, channel)()
+        body: bytes = json.dumps({'link': link, 'version': version}).encode()
+        return body, f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+    def archive(self, channel: str, version: str) -> tuple[str, str] | None:
+        """Return path & `ETag` of the archive of a stored version, building it if needed.
+
+        ---
+
+        :param channel: patch channel (`stable` or `dev`).
+        :type channel: :class:`str`
+        :param version: patch version/build.
+        :type version: :class:`str`
+        :return: path & entity tag of the archive, or `None` if the version is unavailable.
+        :rtype: :class:`tuple[str, str]` | `None`
+        """
+
+        path: str = os.path.join(self.root, f'{channel}-{version}.zip')
+
+        with self._lock:
+            files: dict | None = self.store.manifest(channel, version)
+            if files is None and self._pull(channel, version):
+                files = self.store.manifest(channel, version)
+            if files is None:
+                return None
+
+            if path not in self._etags:
+                if not os.path.exists(path):
+                    self._build(path, files)
+                    self._prune()
+                self._etags[path] = f'"{self.store._hash(path)}"'
+
+            return path, self._etags[path]
+
+    def serve(self, bind: str, port: int) -> None:
+        """Serve mirror requests until interrupted.
+
+        ---
+
+        :param bind: address to listen on (e.g. `0.0.0.0` for all interfaces).
+        :type bind: :class:`str`
+        :param port: port to listen on.
+        :type port: :class:`int`
+        :return: stopped server.
+        :rtype: `None`
+        """
+
+        server = ThreadingHTTPServer((bind, port), _MirrorHandler)
+        server.daemon_threads = True
+        server.mirror = self
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+    def _build(self, path: str, files: dict) -> None:
+        """Write a deterministic, uncompressed zip of stored files.
+
+        ---
+
+        :param path: destination of zip archive.
+        :type path: :class:`str`
+        :param files: manifest of stored patch files.
+        :type files: :class:`dict`
+        :return: built archive.
+        :rtype: `None`
+        """
+
+        os.makedirs(self.root, exist_ok=True)
+        tmp: str = f'{path}.tmp'
+
+        with ZipFile(tmp, 'w', ZIP_STORED) as archive:
+            for rel in sorted(files):
+                info = ZipInfo(rel, date_time=(1980, 1, 1, 0, 0, 0))
+                info.external_attr = 0o644 << 16
+                with open(self.store.object_path(files[rel]['sha256']),
+                          'rb') as src, archive.open(info, 'w') as dst:
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
+
+        os.replace(tmp, path)
+
+    def _prune(self) -> None:
+        """Remove built archives of versions no longer in the store.
+
+        ---
+
+        :return: pruned archives.
+        :rtype: `None`
+        """
+
+        stored: set = {
+            f'{channel}-{version}.zip'
+            for channel in self.channels
+            for version in self.store.versions(channel)
+        }
+        for name in os.listdir(self.root):
+            if name.endswith('.zip') and name not in stored:
+                os.unlink(os.path.join(self.root, name))
+                self._etags.pop(os.path.join(self.root, name), None)
+
+    def _pull(self, channel: str, version: str) -> bool:
+        """Download & store a version from upstream, if it is the latest of its channel.
+
+        ---
+
+        :param channel: patch channel (`stable` or `dev`).
+        :type channel: :class:`str`
+        :param version: patch version/build.
+        :type version: :class:`str`
+        :return: `True` if the version was stored.
+        :rtype: :class:`bool`
+        """
+
+        link, latest = getattr(self.resolver, channel)()
+        if latest != version:
+            return False
+
+        logger.info('Mirror pulling BepInEx %s %s from upstream...', channel,
+                    version)
+        os.makedirs(self.root, exist_ok=True)
+        tmp: str = os.path.join(self.root, f'pull-{channel}-{version}.zip')
+        digest: str = _Downloader._download(link, tmp,
+                                            f'Mirroring {channel} {version}')
+        return _Downloader._unzip_patch(tmp, 1 if channel == 'stable' else 2,
+                                        digest, version)
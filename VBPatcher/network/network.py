@@ -0,0 +1,277 @@
+import random
+import threading
+from email.utils import parsedate_to_datetime
+from time import monotonic, sleep, time
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
+
+import VBPatcher.appglobals.globals
+from VBPatcher.apploggers.loggers import logger
+from VBPatcher.tracing.tracing import tracer
+
+if TYPE_CHECKING:
+    from requests import Response, Session
+
+
+class _HttpClient:
+    """Shared HTTP client, pooling keep-alive connections per host.
+
+    - Every request gets connect & read timeouts (:attr:`http_connect_timeout`, :attr:`http_read_timeout`), so a stalled server can't hang the patcher.
+    - Connection errors, timeouts, `5xx` & `429` responses, and exhausted GitHub rate limits are retried up to :attr:`http_retries` times.
+        - Retries wait as long as the server asks (`Retry-After`, `X-RateLimit-Reset`), otherwise a jittered exponential backoff.
+        - If the server asks for a longer wait than :attr:`http_backoff_max`, its response is returned rather than blocking start-up.
+    - A host that stays unreachable after all retries is skipped for :attr:`down_for` seconds, so later requests to it fail at once instead of retrying again.
+    - Each request is recorded as an `http` tracing span, noting its status, latency to response headers and retries (see :data:`tracer`).
+    - `requests` is only imported, and the session only created, by the first request, keeping it off start-up paths that stay offline.
+
+    ---
+
+    - Contains the following methods:
+
+        - :func:`get(self, url, **kwargs) -> Response`
+            - Send a `GET` request.
+
+        - :func:`head(self, url, **kwargs) -> Response`
+            - Send a `HEAD` request.
+
+        - :func:`request(self, method, url, retries, **kwargs) -> Response`
+            - Send a request, retrying transient failures.
+
+        - :func:`backoff(self, attempt) -> float`
+            - Return a jittered exponential delay before retry :param:`attempt`.
+    """
+
+    retry_status: frozenset = frozenset({429, 500, 502, 503, 504})
+    down_for: float = 60.0  # Seconds an unreachable host is skipped
+
+    def __init__(self,
+                 connect_timeout: float,
+                 read_timeout: float,
+                 retries: int,
+                 backoff_base: float,
+                 backoff_max: float,
+                 pool_size: int = 10) -> None:
+        """Initialize HTTP client.
+
+        ---
+
+        :param connect_timeout: seconds to wait for a connection.
+        :type connect_timeout: :class:`float`
+        :param read_timeout: seconds to wait for each read from the server.
+        :type read_timeout: :class:`float`
+        :param retries: retries of a failed request.
+        :type retries: :class:`int`
+        :param backoff_base: delay before the first retry, doubled for each further one, in seconds.
+        :type backoff_base: :class:`float`
+        :param backoff_max: longest delay before a retry, in seconds.
+        :type backoff_max: :class:`float`
+        :param pool_size: keep-alive connections kept per host, defaults to `10`.
+        :type pool_size: :class:`int`, optional
+        :return: new HTTP client instance.
+        :rtype: `None`
+        """
+
+        self.timeout: tuple = (connect_timeout, read_timeout)
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.pool_size = pool_size
+        self._session: 'Session | None' = None
+        self._down: dict = {}  # Unreachable hosts, and when to try them again
+        self._lock = threading.Lock()
+
+    @property
+    def session(self) -> 'Session':
+        """Shared session, created with its connection pools on first use.
+
+        ---
+
+        :return: pooled HTTP session.
+        :rtype: :class:`requests.Session`
+        """
+
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=self.pool_size,
+                                          pool_maxsize=self.pool_size)
+                    session.mount('http://', adapter)
+                    session.mount('https://', adapter)
+                    self._session = session
+        return self._session
+
+    def get(self, url: str, **kwargs) -> 'Response':
+        """Send a `GET` request (see :func:`request`).
+
+        ---
+
+        :param url: URL to request.
+        :type url: :class:`str`
+        :param kwargs: arguments of :func:`request`.
+        :type kwargs: :class:`Any`
+        :return: server response.
+        :rtype: :class:`Response`
+        """
+
+        return self.request('GET', url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> 'Response':
+        """Send a `HEAD` request (see :func:`request`).
+
+        ---
+
+        :param url: URL to request.
+        :type url: :class:`str`
+        :param kwargs: arguments of :func:`request`.
+        :type kwargs: :class:`Any`
+        :return: server response.
+        :rtype: :class:`Response`
+        """
+
+        return self.request('HEAD', url, **kwargs)
+
+    def request(self,
+                method: str,
+                url: str,
+                retries: int | None = None,
+                **kwargs) -> 'Response':
+        """Send a request, retrying transient failures.
+
+        - The response of the last attempt is returned even if it is an error, leaving status handling to the caller.
+
+        ---
+
+        :param method: HTTP method.
+        :type method: :class:`str`
+        :param url: URL to request.
+        :type url: :class:`str`
+        :param retries: retries of a failed request, defaults to :attr:`retries`.
+        :type retries: :class:`int` | `None`, optional
+        :param kwargs: arguments of :func:`requests.Session.request` (e.g. `headers`, `stream`, `timeout`).
+        :type kwargs: :class:`Any`
+        :return: server response.
+        :rtype: :class:`Response`
+        :raises requests.exceptions.RequestException: if the server stays unreachable.
+        """
+
+        import requests
+
+        retries = self.retries if retries is None else retries
+        session: 'Session' = self.session
+        host: str = urlsplit(url).netloc
+        kwargs.setdefault('timeout', self.timeout)
+
+        with self._lock:
+            if self._down.get(host, 0) > monotonic():
+                raise requests.exceptions.ConnectionError(
+                    f'{host} unreachable, retried recently')
+
+        with tracer.span('http', method=method, url=url) as span:
+            attempt: int = 0
+            while True:
+                started: float = monotonic()
+                try:
+                    r: 'Response' = session.request(method, url, **kwargs)
+                except (requests.exceptions.ConnectionError,
+                        requests.exceptions.Timeout) as e:
+                    if attempt >= retries:
+                        with self._lock:
+                            self._down[host] = monotonic() + self.down_for
+                        span.note(retries=attempt, error=type(e).__name__)
+                        raise
+                    delay: float = self.backoff(attempt)
+                    logger.warning('%s %s failed (%s), retrying in %.1fs...',
+                                   method, url,
+                                   type(e).__name__, delay)
+                else:
+                    span.note(status=r.status_code,
+                              retries=attempt,
+                              latency_ms=(monotonic() - started) * 1000)
+                    delay = self._retry_delay(r, attempt)
+                    if attempt >= retries or delay is None:
+                        return r
+                    logger.warning('%s %s returned %s, retrying in %.1fs...',
+                                   method, url, r.status_code, delay)
+                    r.close()
+
+                sleep(delay)
+                attempt += 1
+
+    def backoff(self, attempt: int) -> float:
+        """Return a jittered exponential delay before retry :param:`attempt`.
+
+        - Delays are drawn uniformly up to the exponential bound ("full jitter"), so clients failing together don't retry together.
+
+        ---
+
+        :param attempt: number of retries made so far.
+        :type attempt: :class:`int`
+        :return: delay, in seconds.
+        :rtype: :class:`float`
+        """
+
+        return random.uniform(
+            0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+    def _retry_delay(self, r: 'Response', attempt: int) -> float | None:
+        """Return how long to wait before retrying a response, if it should be retried.
+
+        ---
+
+        :param r: server response.
+        :type r: :class:`Response`
+        :param attempt: number of retries made so far.
+        :type attempt: :class:`int`
+        :return: delay, in seconds, or `None` if the response is final.
+        :rtype: :class:`float` | `None`
+        """
+
+        limited: bool = (r.status_code in (403, 429)
+                         and r.headers.get('X-RateLimit-Remaining') == '0')
+        if r.status_code not in self.retry_status and not limited:
+            return None
+
+        wait: float | None = None
+        if r.headers.get('Retry-After'):
+            wait = self._parse_retry_after(r.headers['Retry-After'])
+        elif limited and r.headers.get('X-RateLimit-Reset', '').isdigit():
+            wait = max(0.0, int(r.headers['X-RateLimit-Reset']) - time())
+
+        if wait is None:
+            return self.backoff(attempt)
+        if wait > self.backoff_max:
+            logger.warning('%s asks to wait %.0fs before retrying, giving up.',
+                           r.url, wait)
+            return None
+        return wait
+
+    @staticmethod
+    def _parse_retry_after(value: str) -> float | None:
+        """Parse a `Retry-After` header, given in seconds or as an HTTP date.
+
+        ---
+
+        :param value: header value.
+        :type value: :class:`str`
+        :return: delay, in seconds, or `None` if the value is malformed.
+        :rtype: :class:`float` | `None`
+        """
+
+        if value.strip().isdigit():
+            return float(value)
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time())
+        except (TypeError, ValueError):
+            return None
+
+
+client: _HttpClient = _HttpClient(
+    VBPatcher.appglobals.globals.http_connect_timeout,
+    VBPatcher.appglobals.globals.http_read_timeout,
+    VBPatcher.appglobals.globals.http_retries,
+    VBPatcher.appglobals.globals.http_backoff,
+    VBPatcher.appglobals.globals.http_backoff_max)  # Shared HTTP client
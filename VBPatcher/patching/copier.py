@@ -0,0 +1,394 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from shutil import copyfileobj
+from typing import Callable, Iterable
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+_FICLONE: int = 0x40049409  # Linux `FICLONE` ioctl request (btrfs, xfs, ...)
+
+
+class _CopyEngine:
+    """Copy many files concurrently, letting the kernel move the bytes where possible.
+
+    - Per-file latency (open, stat, close), rather than bandwidth, dominates deployments of many small files to network-mounted or HDD-backed installs; copies therefore run on a bounded thread pool.
+    - File contents are copied with `os.copy_file_range`, then `os.sendfile`, falling back to a buffered copy wherever neither is available or supported by the filesystems involved.
+    - Target directories are created up front, in a single pass, so copy workers never race to create them.
+    - :func:`place` can share a file's data instead of copying it, through a copy-on-write reflink or a hardlink, when source and target live on the same filesystem.
+        - Target files hardlinked to their source are unlinked before being written, so the source is never modified through the target.
+        - A mode that fails between two filesystems isn't tried again between them.
+    - :func:`fanout` places one source file at many targets (e.g. several Valheim installs), reading it once however many targets are copied to.
+
+    ---
+
+    - Contains the following methods:
+
+        - :func:`makedirs(self, paths) -> None`
+            - Create the parent directories of all :param:`paths`.
+
+        - :func:`map(self, fn, items) -> list`
+            - Apply :param:`fn` to every item on the worker pool, returning results in order.
+
+        - :func:`place(self, src, dst, modes) -> str`
+            - Place file :param:`src` at :param:`dst`, using the first of :param:`modes` that succeeds.
+
+        - :func:`fanout(self, src, dsts) -> list[str | OSError]`
+            - Place file :param:`src` at every destination of :param:`dsts`, reading :param:`src` at most once.
+
+        - :func:`copy(src, dst) -> int`
+            - Copy the contents of file :param:`src` to :param:`dst`.
+            - Class method.
+    """
+
+    buffer_size: int = 1024 * 1024  # Buffered fallback read size (1 MB)
+
+    def __init__(self, workers: int) -> None:
+        """Initialize copy engine.
+
+        ---
+
+        :param workers: maximum number of files copied concurrently.
+        :type workers: :class:`int`
+        :return: new copy engine instance.
+        :rtype: `None`
+        """
+
+        self.workers = max(1, workers)
+        self._unsupported: set = set()  # Failed `(mode, src dev, dst dev)`
+
+    def makedirs(self, paths: Iterable[str]) -> None:
+        """Create the parent directories of all :param:`paths`.
+
+        ---
+
+        :param paths: file paths about to be written.
+        :type paths: :class:`Iterable[str]`
+        :return: created directories.
+        :rtype: `None`
+        """
+
+        for parent in sorted({os.path.dirname(path) for path in paths}):
+            if parent and not os.path.isdir(parent):
+                os.makedirs(parent, exist_ok=True)
+
+    def map(self, fn: Callable, items: list) -> list:
+        """Apply :param:`fn` to every item on the worker pool, returning results in order.
+
+        ---
+
+        :param fn: callable applied to each item.
+        :type fn: :class:`Callable`
+        :param items: items to process.
+        :type items: :class:`list`
+        :return: results of :param:`fn`, in the order of :param:`items`.
+        :rtype: :class:`list`
+        """
+
+        if self.workers == 1 or len(items) < 2:
+            return [fn(item) for item in items]
+
+        with ThreadPoolExecutor(
+                max_workers=min(self.workers, len(items))) as pool:
+            return list(pool.map(fn, items))
+
+    def place(self, src: str, dst: str, modes: tuple = ('copy', )) -> str:
+        """Place file :param:`src` at :param:`dst`, using the first of :param:`modes` that succeeds.
+
+        - `reflink`: share data copy-on-write (`FICLONE`); only on Linux, and only where the filesystem supports it.
+        - `hardlink`: share the file itself; only within one filesystem.
+        - `copy`: copy the data (see :func:`copy`); always succeeds or raises.
+
+        ---
+
+        :param src: path of source file.
+        :type src: :class:`str`
+        :param dst: path of target file, replaced if it exists.
+        :type dst: :class:`str`
+        :param modes: placement modes to try, in order, defaults to `('copy', )`.
+        :type modes: :class:`tuple[str, ...]`, optional
+        :return: placement mode used.
+        :rtype: :class:`str`
+        """
+
+        mode: str | None = self._link(src, dst, modes)
+        if mode is None:
+            self.copy(src, dst)
+            mode = 'copy'
+        return mode
+
+    def fanout(self, src: str, dsts: list) -> list:
+        """Place file :param:`src` at every destination of :param:`dsts`, reading :param:`src` at most once.
+
+        - Destinations that can share data with :param:`src` are linked first (see :func:`place`).
+        - A single remaining destination is copied by the kernel (see :func:`copy`); several are written block by block from one buffered read of :param:`src`.
+        - A destination that can't be written doesn't stop the others; its error is returned in place of its placement mode.
+
+        ---
+
+        :param src: path of source file.
+        :type src: :class:`str`
+        :param dsts: `(path, modes)` of each target file, replaced if it exists, and the placement modes to try for it.
+        :type dsts: :class:`list[tuple[str, tuple[str, ...]]]`
+        :return: placement mode used, or the :class:`OSError` raised, for each destination in order.
+        :rtype: :class:`list[str | OSError]`
+        """
+
+        results: list = [None] * len(dsts)
+        pending: list = []  # Indices of destinations needing a real copy
+
+        for i, (dst, modes) in enumerate(dsts):
+            try:
+                results[i] = self._link(src, dst, modes)
+            except OSError as e:
+                results[i] = e
+            if results[i] is None:
+                pending.append(i)
+
+        if len(pending) == 1:
+            try:
+                self.copy(src, dsts[pending[0]][0])
+                results[pending[0]] = 'copy'
+            except OSError as e:
+                results[pending[0]] = e
+
+        elif pending:
+            errors: list = self._copy_many(src, [dsts[i][0] for i in pending])
+            for i, error in zip(pending, errors):
+                results[i] = error or 'copy'
+
+        return results
+
+    @classmethod
+    def copy(cls, src: str, dst: str) -> int:
+        """Copy the contents of file :param:`src` to :param:`dst`.
+
+        ---
+
+        :param src: path of source file.
+        :type src: :class:`str`
+        :param dst: path of target file, replaced if it exists.
+        :type dst: :class:`str`
+        :return: number of bytes copied.
+        :rtype: :class:`int`
+        """
+
+        with open(src, 'rb', buffering=0) as fsrc, open(dst, 'wb',
+                                                        buffering=0) as fdst:
+            size: int = os.fstat(fsrc.fileno()).st_size
+
+            for kernel_copy in (cls._copy_range, cls._sendfile):
+                try:
+                    copied: int | None = kernel_copy(fsrc.fileno(),
+                                                     fdst.fileno(), size)
+                except OSError:
+                    copied = None  # Unsupported by these filesystems
+                if copied is not None:
+                    return copied
+
+            fsrc.seek(0)
+            fdst.seek(0)
+            copyfileobj(fsrc, fdst, cls.buffer_size)
+            fdst.truncate()  # Drop anything left by a failed kernel copy
+            return fdst.tell()
+
+    def _link(self, src: str, dst: str, modes: tuple) -> str | None:
+        """Share the data of :param:`src` with :param:`dst`, using the first link mode of :param:`modes` that succeeds.
+
+        ---
+
+        :param src: path of source file.
+        :type src: :class:`str`
+        :param dst: path of target file, replaced if it exists.
+        :type dst: :class:`str`
+        :param modes: placement modes to try, in order.
+        :type modes: :class:`tuple[str, ...]`
+        :return: link mode used, or `None` if the file must be copied.
+        :rtype: :class:`str` | `None`
+        """
+
+        self._detach(dst)
+
+        if modes == ('copy', ):
+            return None
+
+        devices: tuple = (os.stat(src).st_dev,
+                          os.stat(os.path.dirname(dst) or '.').st_dev)
+
+        links: tuple = (('reflink', self._reflink), ('hardlink',
+                                                     self._hardlink))
+        for mode, link in links:
+            if mode not in modes or (mode, *devices) in self._unsupported:
+                continue
+            if link(src, dst):
+                return mode
+            self._unsupported.add((mode, *devices))
+
+        return None
+
+    @classmethod
+    def _copy_many(cls, src: str, dsts: list) -> list:
+        """Copy the contents of file :param:`src` to every path of :param:`dsts`, from a single read of :param:`src`.
+
+        ---
+
+        :param src: path of source file.
+        :type src: :class:`str`
+        :param dsts: paths of target files, replaced if they exist.
+        :type dsts: :class:`list[str]`
+        :return: `None`, or the :class:`OSError` raised, for each target file in order.
+        :rtype: :class:`list[OSError | None]`
+        """
+
+        errors: list = [None] * len(dsts)
+        outs: dict = {}  # Open target files, by index
+
+        try:
+            for i, dst in enumerate(dsts):
+                try:
+                    outs[i] = open(dst, 'wb')
+                except OSError as e:
+                    errors[i] = e
+
+            with open(src, 'rb', buffering=0) as fsrc:
+                for block in iter(lambda: fsrc.read(cls.buffer_size), b''):
+                    for i, fdst in list(outs.items()):
+                        try:
+                            fdst.write(block)
+                        except OSError as e:
+                            errors[i] = e
+                            fdst.close()
+                            del outs[i]
+
+        finally:
+            for i, fdst in outs.items():
+                try:
+                    fdst.close()
+                except OSError as e:
+                    errors[i] = e
+
+        return errors
+
+    @staticmethod
+    def _detach(dst: str) -> None:
+        """Unlink :param:`dst` if it is hardlinked, so writing it can't modify the file it is linked to.
+
+        ---
+
+        :param dst: path of target file.
+        :type dst: :class:`str`
+        :return: unlinked target file.
+        :rtype: `None`
+        """
+
+        try:
+            if os.stat(dst).st_nlink > 1:
+                os.unlink(dst)
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _reflink(src: str, dst: str) -> bool:
+        """Clone :param:`src` to :param:`dst` copy-on-write, if the filesystem supports it.
+
+        ---
+
+        :param src: path of source file.
+        :type src: :class:`str`
+        :param dst: path of target file.
+        :type dst: :class:`str`
+        :return: `True` if the file was cloned.
+        :rtype: :class:`bool`
+        """
+
+        if fcntl is None:
+            return False
+
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            try:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            except OSError:
+                return False  # Unsupported filesystem, or different filesystems
+        return True
+
+    @staticmethod
+    def _hardlink(src: str, dst: str) -> bool:
+        """Hardlink :param:`src` to :param:`dst`, replacing any existing file.
+
+        ---
+
+        :param src: path of source file.
+        :type src: :class:`str`
+        :param dst: path of target file.
+        :type dst: :class:`str`
+        :return: `True` if the file was linked.
+        :rtype: :class:`bool`
+        """
+
+        tmp: str = f'{dst}.link'
+        try:
+            os.link(src, tmp)
+            os.replace(tmp, dst)
+        except OSError:
+            if os.path.lexists(tmp):
+                os.unlink(tmp)
+            return False  # Different filesystems, or links unsupported
+        return True
+
+    @staticmethod
+    def _copy_range(infd: int, outfd: int, size: int) -> int | None:
+        """Copy :param:`size` bytes using `os.copy_file_range`, if available.
+
+        ---
+
+        :param infd: file descriptor of source file.
+        :type infd: :class:`int`
+        :param outfd: file descriptor of target file.
+        :type outfd: :class:`int`
+        :param size: number of bytes to copy.
+        :type size: :class:`int`
+        :return: number of bytes copied, or `None` if unavailable.
+        :rtype: :class:`int` | `None`
+        """
+
+        if not hasattr(os, 'copy_file_range'):
+            return None
+
+        offset: int = 0
+        while offset < size:
+            n: int = os.copy_file_range(infd, outfd, size - offset, offset,
+                                        offset)
+            if not n:
+                break
+            offset += n
+        return offset
+
+    @staticmethod
+    def _sendfile(infd: int, outfd: int, size: int) -> int | None:
+        """Copy :param:`size` bytes using `os.sendfile`, if available.
+
+        ---
+
+        :param infd: file descriptor of source file.
+        :type infd: :class:`int`
+        :param outfd: file descriptor of target file.
+        :type outfd: :class:`int`
+        :param size: number of bytes to copy.
+        :type size: :class:`int`
+        :return: number of bytes copied, or `None` if unavailable.
+        :rtype: :class:`int` | `None`
+        """
+
+        if not hasattr(os, 'sendfile'):
+            return None
+
+        os.lseek(outfd, 0, os.SEEK_SET)
+        offset: int = 0
+        while offset < size:
+            n: int = os.sendfile(outfd, infd, offset, size - offset)
+            if not n:
+                break
+            offset += n
+        return offset
@@ -0,0 +1,616 @@
+import hashlib
+import json
+import os
+from typing import NamedTuple
+
+from VBPatcher.patching.copier import _CopyEngine
+from VBPatcher.patching.snapshots import _Snapshots
+from VBPatcher.progress.progress import progress
+from VBPatcher.tracing.tracing import tracer
+
+
+class _DeployReport(NamedTuple):
+    """Outcome of a single deployment."""
+
+    written: int  # Files copied to the target
+    written_bytes: int  # Bytes copied to the target
+    skipped: int  # Files already up to date
+    skipped_bytes: int  # Bytes not copied because files were up to date
+    linked: int = 0  # Written files sharing data with their source (reflink/hardlink)
+
+
+class _TargetRun:
+    """State of one target directory during a deployment."""
+
+    def __init__(self, target: str, cache_file: str, force: bool,
+                 keep: int) -> None:
+        """Initialize target state.
+
+        ---
+
+        :param target: directory to deploy to.
+        :type target: :class:`str`
+        :param cache_file: path of the cached manifest of :param:`target`.
+        :type cache_file: :class:`str`
+        :param force: ignore the cached manifest when checking files.
+        :type force: :class:`bool`
+        :param keep: rollback snapshots retained for :param:`target`.
+        :type keep: :class:`int`
+        :return: new target state instance.
+        :rtype: `None`
+        """
+
+        self.target = target
+        self.cache_file = cache_file
+        self.previous: dict = _Deployer._read(cache_file)
+        self.cached: dict = {} if force else dict(self.previous)
+        self.snapshots: _Snapshots = _Snapshots(target, keep)
+        self.stale: list = []  # (rel, entry) of files to write
+        self.records: dict = {}  # Manifest entries of staged files
+        self.error: Exception | None = None  # First failure of this target
+        self.changed: bool = False  # Cached manifest needs writing
+        self.written = self.written_bytes = self.linked = 0
+        self.skipped = self.skipped_bytes = 0
+
+
+class _Deployer:
+    """Incrementally deploy patch files, copying only files that are new or changed.
+
+    - A manifest of every target (`{relative path: {'sha256', 'size', 'mtime_ns'}}`) is cached in :attr:`cache_dir`.
+    - A target file whose cached digest matches the source, and whose size & modification time are unchanged, is skipped after a single `stat` call.
+    - A target file missing from the cached manifest is hashed before copying, so identical files left by an earlier install aren't rewritten.
+    - Files are checked & copied concurrently by a :class:`_CopyEngine` of :param:`workers` threads.
+    - In `link` :param:`mode`, files share data with their source instead of being copied: a copy-on-write reflink is tried first, then a hardlink, then a real copy.
+        - Only objects of the artifact store (see :func:`plan`) are hardlinked; files of plain directories (see :func:`plan_dir`), which their owner may edit in place, are reflinked or copied.
+        - Files that may be edited in place within the target (see :attr:`_link_exclude`) are never hardlinked, as edits would reach the source.
+        - The placement mode & inode of each target file are recorded in its cached manifest, so a target file replaced since deployment is detected (see :func:`shared`).
+    - Changed files are staged next to the target and swapped in atomically, keeping a hardlinked snapshot of the files they replace (see :class:`_Snapshots`).
+        - A failed deployment leaves the target untouched; :func:`rollback` undoes the newest successful one.
+    - Several targets (e.g. client & dedicated-server installs) can be deployed together by :func:`deploy_many`, reading each source file once for all of them.
+    - Bytes & files written are reported to a `Deploying` progress task as each file is placed (see :data:`progress`).
+
+    ---
+
+    - Contains the following methods:
+
+        - :func:`plan(files, object_path) -> dict`
+            - Attach source paths to a stored manifest, producing a deployment plan.
+            - Static method.
+
+        - :func:`plan_dir(src) -> dict`
+            - Produce a deployment plan from a plain directory (e.g. a local hotfix layer).
+            - Static method.
+
+        - :func:`overlay(layers) -> dict`
+            - Merge several deployment plans into one, later layers winning.
+            - Static method.
+
+        - :func:`deploy(self, plan, target, force, label) -> _DeployReport`
+            - Copy new or changed files of :param:`plan` to :param:`target`.
+
+        - :func:`deploy_many(self, plan, targets, force, label) -> dict`
+            - Copy new or changed files of :param:`plan` to every directory of :param:`targets`, in one pass.
+
+        - :func:`check(self, plan, target, deep) -> list[str]`
+            - Return files of :param:`plan` that are missing or outdated in :param:`target`.
+
+        - :func:`snapshots(self, target) -> list[dict]`
+            - Return rollback snapshots retained for :param:`target`, newest first.
+
+        - :func:`rollback(self, target) -> dict | None`
+            - Undo the newest deployment to :param:`target`, restoring the files it replaced.
+
+        - :func:`shared(self, target) -> dict`
+            - Return target files still sharing data with the source they were deployed from.
+    """
+
+    _link_exclude: tuple = ('.cfg', '.ini', '.json', '.txt', '.xml')
+
+    def __init__(self,
+                 cache_dir: str,
+                 workers: int = 1,
+                 mode: str = 'copy',
+                 keep: int = 3) -> None:
+        """Initialize deployer.
+
+        ---
+
+        :param cache_dir: directory holding cached target manifests.
+        :type cache_dir: :class:`str`
+        :param workers: maximum number of files checked & copied concurrently, defaults to `1`.
+        :type workers: :class:`int`, optional
+        :param mode: `copy` to always copy files, or `link` to share data with the source where possible, defaults to `copy`.
+        :type mode: :class:`str`, optional
+        :param keep: rollback snapshots retained per target, defaults to `3`.
+        :type keep: :class:`int`, optional
+        :return: new deployer instance.
+        :rtype: `None`
+        """
+
+        self.cache_dir = cache_dir
+        self.mode = mode
+        self.keep = keep
+        self.engine = _CopyEngine(workers)
+
+    @staticmethod
+    def plan(files: dict, object_path) -> dict:
+        """Attach source paths to a stored manifest, producing a deployment plan.
+
+        ---
+
+        :param files: manifest of stored patch files, as returned by :func:`store.manifest`.
+        :type files: :class:`dict`
+        :param object_path: callable returning the path of a stored object from its digest.
+        :type object_path: :class:`Callable[[str], str]`
+        :return: mapping of relative file path to `{'src', 'sha256', 'size', 'stored'}`.
+        :rtype: :class:`dict`
+        """
+
+        return {
+            rel: {
+                'src': object_path(entry['sha256']),
+                'sha256': entry['sha256'],
+                'size': entry['size'],
+                'stored': True  # Immutable store object, safe to hardlink
+            }
+            for rel, entry in files.items()
+        }
+
+    @staticmethod
+    def plan_dir(src: str) -> dict:
+        """Produce a deployment plan from a plain directory (e.g. a local hotfix layer).
+
+        ---
+
+        :param src: directory holding patch files.
+        :type src: :class:`str`
+        :return: mapping of relative file path to `{'src', 'sha256', 'size'}`.
+        :rtype: :class:`dict`
+        """
+
+        plan: dict = {}
+
+        for root, dirs, names in os.walk(src):
+            for name in names:
+                path: str = os.path.join(root, name)
+                rel: str = os.path.relpath(path, src).replace(os.sep, '/')
+                if rel == '.gitkeep':
+                    continue
+
+                digest = hashlib.sha256()
+                with open(path, 'rb') as fh:
+                    for block in iter(lambda: fh.read(1024 * 1024), b''):
+                        digest.update(block)
+
+                plan[rel] = {
+                    'src': path,
+                    'sha256': digest.hexdigest(),
+                    'size': os.path.getsize(path)
+                }
+
+        return plan
+
+    @staticmethod
+    def overlay(layers: list) -> dict:
+        """Merge several deployment plans into one, later layers winning.
+
+        - Each destination file appears once in the result, so deploying it writes every file at most once regardless of how many layers provide it.
+
+        ---
+
+        :param layers: deployment plans, from bottom to top.
+        :type layers: :class:`list[dict]`
+        :return: merged deployment plan.
+        :rtype: :class:`dict`
+        """
+
+        merged: dict = {}
+        for layer in layers:
+            merged.update(layer)
+        return merged
+
+    def deploy(self,
+               plan: dict,
+               target: str,
+               force: bool = False,
+               label: str = '') -> _DeployReport:
+        """Copy new or changed files of :param:`plan` to :param:`target`.
+
+        ---
+
+        :param plan: deployment plan, as returned by :func:`plan`.
+        :type plan: :class:`dict`
+        :param target: directory to deploy to.
+        :type target: :class:`str`
+        :param force: copy every file, ignoring the cached target manifest, defaults to `False`.
+        :type force: :class:`bool`, optional
+        :param label: description of the deployment kept with its rollback snapshot, defaults to `''`.
+        :type label: :class:`str`, optional
+        :return: counts of written and skipped files & bytes.
+        :rtype: :class:`_DeployReport`
+        """
+
+        result: _DeployReport | Exception = self.deploy_many(
+            plan, [target], force, label)[target]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def deploy_many(self,
+                    plan: dict,
+                    targets: list[str],
+                    force: bool = False,
+                    label: str = '') -> dict:
+        """Copy new or changed files of :param:`plan` to every directory of :param:`targets`, in one pass.
+
+        - Every target is checked concurrently, each against its own cached manifest.
+        - Each source file is then read once and placed in every target missing it (see :func:`_CopyEngine.fanout`), so patching many installs costs about one read pass of the patch.
+        - Targets are staged & swapped in independently: a target that fails is left untouched, without affecting the others.
+
+        ---
+
+        :param plan: deployment plan, as returned by :func:`plan`.
+        :type plan: :class:`dict`
+        :param targets: directories to deploy to.
+        :type targets: :class:`list[str]`
+        :param force: copy every file, ignoring the cached target manifests, defaults to `False`.
+        :type force: :class:`bool`, optional
+        :param label: description of the deployment kept with its rollback snapshots, defaults to `''`.
+        :type label: :class:`str`, optional
+        :return: mapping of target to its report, or to the exception it failed with.
+        :rtype: :class:`dict[str, _DeployReport | Exception]`
+        """
+
+        runs: list = [
+            _TargetRun(target, self._cache_file(target), force, self.keep)
+            for target in dict.fromkeys(targets)
+        ]
+        items: list = list(plan.items())
+        pairs: list = [(run, item) for run in runs for item in items]
+
+        def check(pair: tuple) -> bool:
+            run, (rel, entry) = pair
+            return not force and self._current(os.path.join(run.target, rel),
+                                               entry, run.cached.get(rel))
+
+        def stage(item: tuple) -> list:
+            rel, (entry, stale) = item
+            staged: list = [run.snapshots.staged(rel) for run in stale]
+            placed: list = self.engine.fanout(entry['src'],
+                                              [(path, self._modes(rel, entry))
+                                               for path in staged])
+            task.advance(entry['size'] * len(stale), len(stale))
+
+            records: list = []
+            for path, mode in zip(staged, placed):
+                try:
+                    records.append(mode if isinstance(mode, Exception) else
+                                   self._record(path, entry, mode))
+                except OSError as e:
+                    records.append(e)
+            return records
+
+        def commit(run: _TargetRun) -> None:
+            try:
+                run.snapshots.commit([rel for rel, _ in run.stale],
+                                     run.previous, label)
+            except Exception as e:
+                run.error = e
+
+        with tracer.span('deploy.check', targets=len(runs)) as span:
+            span.add(files=len(pairs))
+            checked: list = self.engine.map(check, pairs)
+
+        for (run, (rel, entry)), current in zip(pairs, checked):
+            if not current:
+                run.stale.append((rel, entry))
+                continue
+
+            run.skipped += 1
+            run.skipped_bytes += entry['size']
+            if rel not in run.cached:
+                run.cached[rel] = self._record(os.path.join(run.target, rel),
+                                               entry)
+                run.changed = True
+
+        # Stale files, by relative path: (entry, runs missing it)
+        fan: dict = {}
+        for run in runs:
+            if not run.stale:
+                continue
+            try:
+                self.engine.makedirs(
+                    [os.path.join(run.target, rel) for rel, _ in run.stale] +
+                    [run.snapshots.staged(rel) for rel, _ in run.stale])
+            except OSError as e:
+                run.error = e  # e.g. target path is a file, or read-only
+                continue
+            for rel, entry in run.stale:
+                fan.setdefault(rel, (entry, []))[1].append(run)
+
+        if fan:
+            try:
+                with progress.task('Deploying') as task, tracer.span(
+                        'deploy.stage', targets=len(runs),
+                        mode=self.mode) as span:
+                    task.expect(
+                        sum(entry['size'] * len(stale)
+                            for entry, stale in fan.values()),
+                        sum(len(stale) for _, stale in fan.values()))
+                    span.add(sum(entry['size'] for entry, _ in fan.values()),
+                             len(fan))
+                    staged: list = self.engine.map(stage, list(fan.items()))
+            except BaseException:
+                for run in runs:
+                    run.snapshots.discard()  # Targets are untouched
+                raise
+
+            for (rel, (entry, stale)), records in zip(fan.items(), staged):
+                for run, record in zip(stale, records):
+                    if isinstance(record, Exception):
+                        run.error = run.error or record
+                    else:
+                        run.records[rel] = record
+
+            for run in runs:
+                if run.error is not None:
+                    run.snapshots.discard()  # Target is untouched
+
+            with tracer.span('deploy.commit', targets=len(runs)) as span:
+                ready: list = [
+                    run for run in runs if run.stale and run.error is None
+                ]
+                span.add(files=sum(len(run.stale) for run in ready))
+                self.engine.map(commit, ready)
+
+            for run in ready:
+                if run.error is not None:
+                    continue
+                for rel, entry in run.stale:
+                    record: dict = run.records[rel]
+                    run.cached[rel] = record
+                    run.written += 1
+                    run.written_bytes += entry['size']
+                    run.linked += record['mode'] != 'copy'
+                run.changed = True
+
+        results: dict = {}
+        for run in runs:
+            if run.changed:
+                self._write(run.cache_file, run.cached)
+            results[run.target] = run.error or _DeployReport(
+                run.written, run.written_bytes, run.skipped, run.skipped_bytes,
+                run.linked)
+        return results
+
+    def check(self, plan: dict, target: str, deep: bool = False) -> list[str]:
+        """Return files of :param:`plan` that are missing or outdated in :param:`target`.
+
+        ---
+
+        :param plan: deployment plan, as returned by :func:`plan`.
+        :type plan: :class:`dict`
+        :param target: directory deployed to.
+        :type target: :class:`str`
+        :param deep: rehash every target file, ignoring the cached target manifest, defaults to `False`.
+        :type deep: :class:`bool`, optional
+        :return: relative paths of files that would be written by :func:`deploy`.
+        :rtype: :class:`list[str]`
+        """
+
+        cached: dict = {} if deep else self._read(self._cache_file(target))
+
+        def check(item: tuple[str, dict]) -> bool:
+            rel, entry = item
+            return self._current(os.path.join(target, rel), entry,
+                                 cached.get(rel))
+
+        items: list = list(plan.items())
+        return [
+            rel
+            for (rel, _), current in zip(items, self.engine.map(check, items))
+            if not current
+        ]
+
+    def snapshots(self, target: str) -> list[dict]:
+        """Return rollback snapshots retained for :param:`target`, newest first.
+
+        ---
+
+        :param target: directory deployed to.
+        :type target: :class:`str`
+        :return: snapshot metadata (`{'id', 'label', 'created', 'files'}`).
+        :rtype: :class:`list[dict]`
+        """
+
+        return _Snapshots(target, self.keep).list()
+
+    def rollback(self, target: str) -> dict | None:
+        """Undo the newest deployment to :param:`target`, restoring the files it replaced.
+
+        - Restored files are moved back from their hardlinked snapshot, so rolling back copies no data.
+        - Cached manifest entries of restored files are restored as well, keeping later incremental deploys exact.
+
+        ---
+
+        :param target: directory deployed to.
+        :type target: :class:`str`
+        :return: metadata of the rolled back snapshot, or `None` if no snapshot is retained.
+        :rtype: :class:`dict` | `None`
+        """
+
+        snapshot: dict | None = _Snapshots(target, self.keep).rollback()
+        if snapshot is None:
+            return None
+
+        cache_file: str = self._cache_file(target)
+        cached: dict = self._read(cache_file)
+        for rel, meta in snapshot['files'].items():
+            if meta['record'] is None:
+                cached.pop(rel, None)
+            else:
+                cached[rel] = meta['record']
+        self._write(cache_file, cached)
+
+        return snapshot
+
+    def shared(self, target: str) -> dict:
+        """Return target files still sharing data with the source they were deployed from.
+
+        - A file counts as shared while it was placed by reflink or hardlink and its inode, size & modification time are unchanged since.
+
+        ---
+
+        :param target: directory deployed to.
+        :type target: :class:`str`
+        :return: mapping of relative file path to placement mode (`reflink` or `hardlink`).
+        :rtype: :class:`dict`
+        """
+
+        shared: dict = {}
+
+        for rel, rec in self._read(self._cache_file(target)).items():
+            if rec.get('mode', 'copy') == 'copy':
+                continue
+            try:
+                st: os.stat_result = os.stat(os.path.join(target, rel))
+            except OSError:
+                continue
+            if (st.st_ino, st.st_size,
+                    st.st_mtime_ns) == (rec['ino'], rec['size'],
+                                        rec['mtime_ns']):
+                shared[rel] = rec['mode']
+
+        return shared
+
+    def _modes(self, rel: str, entry: dict) -> tuple:
+        """Return placement modes to try for a file, in order.
+
+        ---
+
+        :param rel: relative path of file.
+        :type rel: :class:`str`
+        :param entry: plan entry of source file.
+        :type entry: :class:`dict`
+        :return: placement modes accepted by :func:`_CopyEngine.place`.
+        :rtype: :class:`tuple[str, ...]`
+        """
+
+        if self.mode != 'link':
+            return ('copy', )
+        if not entry.get('stored') or rel.lower().endswith(self._link_exclude):
+            return ('reflink', 'copy')  # Copy-on-write keeps source intact
+        return ('reflink', 'hardlink', 'copy')
+
+    @staticmethod
+    def _current(dst: str, entry: dict, cached: dict | None) -> bool:
+        """Check whether a target file already matches its source.
+
+        ---
+
+        :param dst: path of target file.
+        :type dst: :class:`str`
+        :param entry: plan entry of source file.
+        :type entry: :class:`dict`
+        :param cached: cached manifest entry of target file, if any.
+        :type cached: :class:`dict` | `None`
+        :return: `True` if the target file is up to date.
+        :rtype: :class:`bool`
+        """
+
+        try:
+            st: os.stat_result = os.stat(dst)
+        except OSError:
+            return False
+
+        if st.st_size != entry['size']:
+            return False
+
+        if cached is not None:  # Trust unchanged metadata
+            return (cached['sha256'] == entry['sha256']
+                    and cached['mtime_ns'] == st.st_mtime_ns
+                    and cached.get('ino', st.st_ino) == st.st_ino)
+
+        digest = hashlib.sha256()
+        with open(dst, 'rb') as fh:
+            for block in iter(lambda: fh.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest() == entry['sha256']
+
+    @staticmethod
+    def _record(dst: str, entry: dict, mode: str = 'copy') -> dict:
+        """Return cached manifest entry of a deployed target file.
+
+        ---
+
+        :param dst: path of target file.
+        :type dst: :class:`str`
+        :param entry: plan entry of source file.
+        :type entry: :class:`dict`
+        :param mode: placement mode of target file, defaults to `copy`.
+        :type mode: :class:`str`, optional
+        :return: `{'sha256', 'size', 'mtime_ns', 'ino', 'mode'}` of target file.
+        :rtype: :class:`dict`
+        """
+
+        st: os.stat_result = os.stat(dst)
+
+        return {
+            'sha256': entry['sha256'],
+            'size': entry['size'],
+            'mtime_ns': st.st_mtime_ns,
+            'ino': st.st_ino,
+            'mode': mode
+        }
+
+    def _cache_file(self, target: str) -> str:
+        """Return path of the cached manifest of :param:`target`.
+
+        ---
+
+        :param target: directory deployed to.
+        :type target: :class:`str`
+        :return: path of cached manifest.
+        :rtype: :class:`str`
+        """
+
+        key: str = hashlib.sha1(
+            os.path.abspath(target).encode()).hexdigest()[:16]
+        return f'{self.cache_dir}/{key}.json'
+
+    @staticmethod
+    def _read(cache_file: str) -> dict:
+        """Read a cached target manifest.
+
+        ---
+
+        :param cache_file: path of cached manifest.
+        :type cache_file: :class:`str`
+        :return: cached manifest, or an empty dict if none exists.
+        :rtype: :class:`dict`
+        """
+
+        try:
+            with open(cache_file, 'r') as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _write(cache_file: str, cached: dict) -> None:
+        """Atomically write a cached target manifest.
+
+        ---
+
+        :param cache_file: path of cached manifest.
+        :type cache_file: :class:`str`
+        :param cached: target manifest.
+        :type cached: :class:`dict`
+        :return: updated cache file.
+        :rtype: `None`
+        """
+
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        with open(f'{cache_file}.tmp', 'w') as fh:
+            json.dump(cached, fh)
+        os.replace(f'{cache_file}.tmp', cache_file)
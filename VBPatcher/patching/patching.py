@@ -1,16 +1,18 @@
-from distutils import filelist
-from os import unlink
-from shutil import copytree
 from time import sleep
 from typing import NoReturn
 
 import VBPatcher.appglobals.globals
-from PyLoadBar import PyLoadBar
+from VBPatcher.appglobals.lazy import _LazyInstance
 from VBPatcher.apploggers.loggers import logger, logger_stream
+from VBPatcher.patching.deploy import _Deployer, _DeployReport
+from VBPatcher.store.store import store
 from VBPatcher.subprocessing.subprocessing import _startPrompt
 
-patch_bar = PyLoadBar()
-exit_seq = PyLoadBar(False)
+exit_seq = _LazyInstance('PyLoadBar', 'PyLoadBar', False)
+deployer = _Deployer(VBPatcher.appglobals.globals.deploy_cache,
+                     VBPatcher.appglobals.globals.deploy_workers,
+                     VBPatcher.appglobals.globals.deploy_mode,
+                     VBPatcher.appglobals.globals.snapshot_keep)
 
 
 class _Patcher:
@@ -21,10 +23,18 @@ class _Patcher:
     - Contains the following patching methods:
 
         - :func:`_patch(patch_src, patch_dst, patch_ver) -> None`
-            - Install patch files (:param:`patch_src`) to target directory (:param:`patch_dst`).
+            - Install planned patch files (:param:`patch_src`) to target directory, or directories (:param:`patch_dst`).
             - Overwrites any existing patch files.
             - Static method.
 
+        - :func:`_targets() -> list[str]`
+            - Return every Valheim install to patch.
+            - Static method.
+
+        - :func:`_overlay(layers, extra) -> dict | None`
+            - Resolve a stack of stored patch versions (plus optional hotfix directories) into one deployment plan.
+            - Class method.
+
         - :func:`_patch_stable(self) -> None`
             - Install latest BepInEx stable release version to target directory.
 
@@ -32,57 +42,128 @@ class _Patcher:
             - Install latest BepInEx development build version to target directory.
 
         - :func:`_patch_full(self) -> None`
-            - Apply both available BepInEx patches in order of release (Stable -> Development).
+            - Apply both available BepInEx patches in order of release (Stable -> Development), plus any hotfix layers, in a single pass.
+
+        - :func:`_rollback(self) -> None`
+            - Restore the patch files replaced by the last deployment to every target directory.
 
         - :func:`_cancel(arg0, arg1) -> None | NoReturn`
             - Cancel patching process and return to menu.
             - Static method.
     """
 
+    _plans: dict = {}  # Resolved overlay plans, keyed by layer stack
+
     @staticmethod
-    def _patch(patch_src: str, patch_dst: str, patch_ver: int | str) -> None:
+    def _patch(patch_src: dict | None, patch_dst: str | list[str],
+               patch_ver: int | str) -> None:
         """Apply patch files (:param:`patch_src`) to target directory (:param:`patch_dst`).
 
-        - Overwrites any existing patch files.
+        - Patch files are copied out of the artifact store, as listed by the deployment plan (see :func:`_overlay`).
+        - Only files that are new or changed since the last deployment are written (see :class:`_Deployer`).
+        - Overwrites any existing, outdated patch files.
+            - Files are swapped in atomically; if patching fails, :param:`patch_dst` is left as it was.
+        - Several target directories are patched in one pass, reading each patch file once (see :func:`_Deployer.deploy_many`).
 
         ---
 
-        :param patch_src: source directory containing patch files.
-        :type patch_src: :class:`str`
-        :param patch_dst: destination of patch files.
-        :type patch_dst: :class:`str`
+        :param patch_src: deployment plan, as returned by :func:`_overlay`.
+        :type patch_src: :class:`dict` | `None`
+        :param patch_dst: destination(s) of patch files.
+        :type patch_dst: :class:`str` | :class:`list[str]`
         :param patch_ver: version/title/build of patch.
         :type patch_ver: :class:`int` | :class:`str`
         :return: transfer patch files from :param:`patch_src` to :param:`patch_dst`.
         :rtype: `None`
         """
 
-        try:
-            logger.info(
-                f'Patching BepInEx build {patch_ver} to location: {patch_dst}...'
-            )
-
-            copytree(
-                patch_src, patch_dst,
-                dirs_exist_ok=True)  # Copy patch files to target directory.
+        targets: list = [patch_dst] if isinstance(patch_dst,
+                                                  str) else patch_dst
 
-            unlink(f'{VBPatcher.appglobals.globals.patch_targetDir}/.gitkeep'
-                   )  # Remove .gitkeep file.
+        try:
+            logger.info('Patching BepInEx build %s to location(s): %s...',
+                        patch_ver, ', '.join(targets))
 
-            patch_bar.start(
-                f'>> Patching BepInEx build {patch_ver} to location: {patch_dst}',
-                f'>> Patch build {patch_ver} successfully installed!',
-                label='Deploying',
-                iter_total=len(filelist.findall(patch_src)),
-                max_iter=0.2,
-                min_iter=0.005)  # Progress bar.
+            if patch_src is None:
+                raise FileNotFoundError(
+                    f'BepInEx build {patch_ver} not found in patch store')
 
-            logger.info(f'Patch build {patch_ver} successfully installed!\n')
+            results: dict = deployer.deploy_many(
+                patch_src, targets, label=str(patch_ver)
+            )  # Copy new/changed patch files to every target directory, reporting real progress.
 
         except Exception:
             logger_stream.error(
-                f'Failed to successfully copy BepInEx build {patch_ver} to location: {patch_dst}...\n'
-            )
+                'Failed to successfully copy BepInEx build %s to location(s): %s...\n',
+                patch_ver, ', '.join(targets))
+            return
+
+        for target, report in results.items():
+            if isinstance(report, Exception):
+                logger_stream.warning(
+                    'Failed to successfully copy BepInEx build %s to location: %s (%s)...\n',
+                    patch_ver, target, report)
+                continue
+
+            if len(results) > 1:
+                logger_stream.info('>> %s:', target)
+            logger_stream.info(
+                '>> Wrote %d files (%d bytes, %d linked), skipped %d unchanged files (%d bytes).',
+                report.written, report.written_bytes, report.linked,
+                report.skipped, report.skipped_bytes)
+            logger_stream.info('>> Patch build %s successfully installed!\n',
+                               patch_ver)
+
+    @staticmethod
+    def _targets() -> list[str]:
+        """Return every Valheim install to patch: :attr:`patch_targetDir`, then :attr:`patch_targets`.
+
+        ---
+
+        :return: target directories.
+        :rtype: :class:`list[str]`
+        """
+
+        return [
+            VBPatcher.appglobals.globals.patch_targetDir,
+            *VBPatcher.appglobals.globals.patch_targets
+        ]
+
+    @classmethod
+    def _overlay(cls,
+                 layers: list[tuple[str, str]],
+                 extra: list[str] | None = None) -> dict | None:
+        """Resolve a stack of stored patch versions (plus optional hotfix directories) into one deployment plan.
+
+        - Later layers win wherever several layers provide the same file.
+        - Plans of stored versions are cached per layer stack (e.g. per `(ver_stable, ver_dev)` pair) for the rest of the process.
+        - Hotfix directories are re-read on every call, as their contents may change at any time.
+
+        ---
+
+        :param layers: `(channel, version)` pairs of stored patch versions, from bottom to top.
+        :type layers: :class:`list[tuple[str, str]]`
+        :param extra: directories overlaid on top of the stored versions, defaults to `None`.
+        :type extra: :class:`list[str]` | `None`, optional
+        :return: merged deployment plan, or `None` if any stored version is missing.
+        :rtype: :class:`dict` | `None`
+        """
+
+        key: tuple = tuple(layers)
+
+        if key not in cls._plans:
+            manifests: list = [store.manifest(ch, ver) for ch, ver in layers]
+            if None in manifests:
+                return None
+            cls._plans[key] = _Deployer.overlay([
+                _Deployer.plan(files, store.object_path) for files in manifests
+            ])
+
+        if not extra:
+            return cls._plans[key]
+
+        return _Deployer.overlay([cls._plans[key]] +
+                                 [_Deployer.plan_dir(src) for src in extra])
 
     def _patch_stable(self) -> None:
         """Install latest BepInEx stable-build patch to local directory.
@@ -102,9 +183,10 @@ class _Patcher:
             )
 
             if confirmStable.lower() in {'yes', 'y'}:
-                self._patch(VBPatcher.appglobals.globals.patch_stable,
-                            VBPatcher.appglobals.globals.patch_targetDir,
-                            VBPatcher.appglobals.globals.ver_stable)
+                self._patch(
+                    self._overlay([('stable',
+                                    VBPatcher.appglobals.globals.ver_stable)]),
+                    self._targets(), VBPatcher.appglobals.globals.ver_stable)
                 return _startPrompt()  # Prompt user to start Valheim
 
             elif confirmStable.lower() in {'n', 'no'}:
@@ -136,9 +218,10 @@ class _Patcher:
             )
 
             if confirmLatest.lower() in {'yes', 'y'}:
-                self._patch(VBPatcher.appglobals.globals.patch_dev,
-                            VBPatcher.appglobals.globals.patch_targetDir,
-                            VBPatcher.appglobals.globals.ver_dev)
+                self._patch(
+                    self._overlay([('dev',
+                                    VBPatcher.appglobals.globals.ver_dev)]),
+                    self._targets(), VBPatcher.appglobals.globals.ver_dev)
                 return _startPrompt()  # Prompt user to start Valheim
 
             elif confirmLatest.lower() in {'n', 'no'}:
@@ -155,6 +238,8 @@ class _Patcher:
     def _patch_full(self) -> None:
         """Apply both stable and dev BepInEx patches in order of release (Stable -> Development).
 
+        - Both builds (plus any hotfix directories listed in :attr:`patch_hotfix`) are merged into one overlay, so each target file is written at most once.
+
         ---
 
         :return: patched BepInEx installation.
@@ -170,13 +255,14 @@ class _Patcher:
             )
 
             if confirmFull.lower() in {'yes', 'y'}:
-                self._patch(VBPatcher.appglobals.globals.patch_stable,
-                            VBPatcher.appglobals.globals.patch_targetDir,
-                            VBPatcher.appglobals.globals.ver_stable)
-
-                self._patch(VBPatcher.appglobals.globals.patch_dev,
-                            VBPatcher.appglobals.globals.patch_targetDir,
-                            VBPatcher.appglobals.globals.ver_dev)
+                self._patch(
+                    self._overlay(
+                        [('stable', VBPatcher.appglobals.globals.ver_stable),
+                         ('dev', VBPatcher.appglobals.globals.ver_dev)],
+                        VBPatcher.appglobals.globals.patch_hotfix),
+                    self._targets(),
+                    f'{VBPatcher.appglobals.globals.ver_stable} + {VBPatcher.appglobals.globals.ver_dev}'
+                )  # Overlay dev build (and hotfixes) on stable, deployed in one pass
 
                 return _startPrompt()  # Prompt user to start Valheim
 
@@ -191,6 +277,74 @@ class _Patcher:
                 sleep(1.250)
                 continue
 
+    def _rollback(self) -> None:
+        """Restore the patch files replaced by the last deployment to every Valheim install (see :func:`_targets`).
+
+        - Files are moved back from the deployment's hardlinked snapshot, so no data is copied.
+        - Up to :attr:`snapshot_keep` deployments can be rolled back, newest first.
+        - Each target is rolled back on its own; one that fails, or has no snapshot, doesn't stop the others.
+
+        ---
+
+        :return: rolled back BepInEx installation(s).
+        :rtype: `None`
+        """
+
+        while True:
+            pending: dict = {}  # Latest snapshot of each target that has one
+            for target in self._targets():
+                try:
+                    snapshots: list = deployer.snapshots(target)
+                except Exception:
+                    snapshots = []
+                if snapshots:
+                    pending[target] = snapshots[0]
+
+            if not pending:
+                logger_stream.warning(
+                    '\n>> No previous deployment to roll back to...\n')
+                return
+
+            logger.info(
+                'Displaying confirmation prompt to roll back last deployment...\n'
+            )
+            listing: str = '\n'.join(
+                f'>> "{target}": BepInEx build {snapshot["label"]} ({len(snapshot["files"])} files)'
+                for target, snapshot in pending.items())
+            confirmRollback: str = input(
+                f'\nReally roll back last deployment in location(s):\n\n{listing}\n\n> Enter [y] or [n]:\n{VBPatcher.appglobals.globals.textborder}\n> '
+            )
+
+            if confirmRollback.lower() in {'yes', 'y'}:
+                for target in self._targets():
+                    if target not in pending:
+                        logger_stream.info(
+                            '>> %s: no previous deployment to roll back to.',
+                            target)
+                        continue
+
+                    try:
+                        snapshot: dict | None = deployer.rollback(target)
+                        logger_stream.info(
+                            '>> %s: rolled back deployment of BepInEx build %s, restored %d files.',
+                            target, snapshot['label'], len(snapshot['files']))
+                    except Exception:
+                        logger_stream.error(
+                            'Failed to roll back last deployment to location: %s...',
+                            target)
+                return
+
+            elif confirmRollback.lower() in {'n', 'no'}:
+                return self._cancel('>> Rollback cancelled',
+                                    '>> Returning to menu...')
+
+            else:
+                logger_stream.warning(
+                    '\nInvalid Input: "%s"\n\n>> Must ONLY enter either [y] for "YES" or [n] for "NO".\n',
+                    confirmRollback)
+                sleep(1.250)
+                continue
+
     @staticmethod
     def _cancel(arg0, arg1) -> None | NoReturn:
         """Cancel patching process and return to menu.
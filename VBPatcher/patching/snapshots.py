@@ -0,0 +1,246 @@
+import json
+import os
+import shutil
+from datetime import datetime
+from time import time
+
+
+class _Snapshots:
+    """Stage deployments next to a target directory, swapping them in atomically and keeping rollback snapshots.
+
+    - New files are staged in `{target}/.vbpatcher/staging`, on the target's own filesystem, then moved into place with `os.replace`.
+    - Before any file is replaced, its previous version is hardlinked into `{target}/.vbpatcher/snapshots/{id}`, so a snapshot costs no data copies.
+        - Should a swap fail halfway, every file swapped so far is restored from the snapshot, leaving the target as it was.
+    - Rolling back moves the snapshot's files back into place, again metadata-only.
+    - Only the newest :attr:`keep` snapshots are retained.
+
+    ---
+
+    - Contains the following methods:
+
+        - :func:`staged(self, rel) -> str`
+            - Return staging path of a file.
+
+        - :func:`commit(self, rels, records, label) -> str`
+            - Swap staged files into the target, snapshotting the files they replace.
+
+        - :func:`list(self) -> list[dict]`
+            - Return metadata of retained snapshots, newest first.
+
+        - :func:`rollback(self) -> dict | None`
+            - Restore the files replaced by the newest snapshot, then drop it.
+
+        - :func:`discard(self) -> None`
+            - Remove any staged files.
+    """
+
+    def __init__(self, target: str, keep: int) -> None:
+        """Initialize snapshots of a target directory.
+
+        ---
+
+        :param target: directory deployed to.
+        :type target: :class:`str`
+        :param keep: number of snapshots retained.
+        :type keep: :class:`int`
+        :return: new snapshots instance.
+        :rtype: `None`
+        """
+
+        self.target = target
+        self.keep = keep
+        self.staging = os.path.join(target, '.vbpatcher', 'staging')
+        self.root = os.path.join(target, '.vbpatcher', 'snapshots')
+
+    def staged(self, rel: str) -> str:
+        """Return staging path of a file.
+
+        ---
+
+        :param rel: relative path of file within the target.
+        :type rel: :class:`str`
+        :return: path to stage the file at.
+        :rtype: :class:`str`
+        """
+
+        return os.path.join(self.staging, rel)
+
+    def commit(self, rels: list, records: dict, label: str) -> str:
+        """Swap staged files into the target, snapshotting the files they replace.
+
+        ---
+
+        :param rels: relative paths of staged files.
+        :type rels: :class:`list[str]`
+        :param records: deploy cache entries of the target before this deployment.
+        :type records: :class:`dict`
+        :param label: description of the deployment (e.g. patch version).
+        :type label: :class:`str`
+        :return: id of the new snapshot.
+        :rtype: :class:`str`
+        """
+
+        snap_id: str = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        snap: str = os.path.join(self.root, snap_id)
+        files: dict = {}
+
+        try:
+            for rel in rels:
+                dst: str = os.path.join(self.target, rel)
+                existed: bool = os.path.lexists(dst)
+                if existed:
+                    self._preserve(dst, os.path.join(snap, rel))
+                files[rel] = {'existed': existed, 'record': records.get(rel)}
+
+            self._write(snap, {
+                'id': snap_id,
+                'label': label,
+                'created': time(),
+                'files': files
+            })
+
+            swapped: list = []
+            try:
+                for rel in rels:
+                    os.replace(self.staged(rel),
+                               os.path.join(self.target, rel))
+                    swapped.append(rel)
+            except BaseException:
+                self._restore(snap, {rel: files[rel] for rel in swapped})
+                raise
+
+        except BaseException:
+            shutil.rmtree(snap, ignore_errors=True)
+            raise
+
+        finally:
+            self.discard()
+
+        self._prune()
+        return snap_id
+
+    def list(self) -> list[dict]:
+        """Return metadata of retained snapshots, newest first.
+
+        ---
+
+        :return: snapshot metadata (`{'id', 'label', 'created', 'files'}`).
+        :rtype: :class:`list[dict]`
+        """
+
+        try:
+            ids: list = sorted(os.listdir(self.root), reverse=True)
+        except FileNotFoundError:
+            return []
+
+        snapshots: list = []
+        for snap_id in ids:
+            try:
+                with open(os.path.join(self.root, snap_id, 'snapshot.json'),
+                          'r') as fh:
+                    snapshots.append(json.load(fh))
+            except (OSError, ValueError):
+                continue  # Incomplete snapshot
+        return snapshots
+
+    def rollback(self) -> dict | None:
+        """Restore the files replaced by the newest snapshot, then drop it.
+
+        ---
+
+        :return: metadata of the restored snapshot, or `None` if no snapshot is retained.
+        :rtype: :class:`dict` | `None`
+        """
+
+        snapshots: list = self.list()
+        if not snapshots:
+            return None
+
+        snap: str = os.path.join(self.root, snapshots[0]['id'])
+        self._restore(snap, snapshots[0]['files'])
+        shutil.rmtree(snap, ignore_errors=True)
+        return snapshots[0]
+
+    def discard(self) -> None:
+        """Remove any staged files.
+
+        ---
+
+        :return: emptied staging directory.
+        :rtype: `None`
+        """
+
+        shutil.rmtree(self.staging, ignore_errors=True)
+
+    def _restore(self, snap: str, files: dict) -> None:
+        """Move the previous versions of :param:`files` back into the target.
+
+        ---
+
+        :param snap: snapshot directory.
+        :type snap: :class:`str`
+        :param files: snapshot entries (`{'existed', 'record'}`) keyed by relative path.
+        :type files: :class:`dict`
+        :return: restored target files.
+        :rtype: `None`
+        """
+
+        for rel, meta in files.items():
+            dst: str = os.path.join(self.target, rel)
+            if meta['existed']:
+                os.replace(os.path.join(snap, rel), dst)
+            elif os.path.lexists(dst):
+                os.unlink(dst)  # File was added by the rolled back deployment
+
+    @staticmethod
+    def _preserve(src: str, dst: str) -> None:
+        """Hardlink :param:`src` to :param:`dst`, copying where links are unsupported.
+
+        ---
+
+        :param src: path of target file about to be replaced.
+        :type src: :class:`str`
+        :param dst: path within the snapshot.
+        :type dst: :class:`str`
+        :return: preserved file.
+        :rtype: `None`
+        """
+
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copy2(src, dst)
+
+    @staticmethod
+    def _write(snap: str, meta: dict) -> None:
+        """Write snapshot metadata.
+
+        ---
+
+        :param snap: snapshot directory.
+        :type snap: :class:`str`
+        :param meta: snapshot metadata.
+        :type meta: :class:`dict`
+        :return: written `snapshot.json`.
+        :rtype: `None`
+        """
+
+        os.makedirs(snap, exist_ok=True)
+        with open(os.path.join(snap, 'snapshot.json.tmp'), 'w') as fh:
+            json.dump(meta, fh)
+        os.replace(os.path.join(snap, 'snapshot.json.tmp'),
+                   os.path.join(snap, 'snapshot.json'))
+
+    def _prune(self) -> None:
+        """Remove all but the newest :attr:`keep` snapshots.
+
+        ---
+
+        :return: pruned snapshots.
+        :rtype: `None`
+        """
+
+        for snap_id in sorted(os.listdir(self.root),
+                              reverse=True)[max(self.keep, 0):]:
+            shutil.rmtree(os.path.join(self.root, snap_id), ignore_errors=True)
@@ -0,0 +1,248 @@
+import sys
+import threading
+
+
+class _Task:
+    """Progress of a single operation (a download, an extraction or a deployment), counted in bytes & files.
+
+    - This base task discards every event, so emitting progress while nothing is rendered costs one no-op method call.
+
+    ---
+
+    - Contains the following methods:
+
+        - :func:`expect(self, nbytes, files) -> None`
+            - Add :param:`nbytes` & :param:`files` to the expected totals.
+
+        - :func:`advance(self, nbytes, files) -> None`
+            - Report :param:`nbytes` & :param:`files` as done.
+
+        - :func:`close(self) -> None`
+            - Mark the operation as finished.
+    """
+
+    def expect(self, nbytes: int = 0, files: int = 0) -> None:
+        """Add :param:`nbytes` & :param:`files` to the expected totals.
+
+        - May be called again whenever more work is discovered (e.g. once a download's length is known).
+
+        ---
+
+        :param nbytes: additional bytes expected, defaults to `0`.
+        :type nbytes: :class:`int`, optional
+        :param files: additional files expected, defaults to `0`.
+        :type files: :class:`int`, optional
+        :return: updated totals.
+        :rtype: `None`
+        """
+
+    def advance(self, nbytes: int = 0, files: int = 0) -> None:
+        """Report :param:`nbytes` & :param:`files` as done.
+
+        ---
+
+        :param nbytes: bytes done since the last report, defaults to `0`.
+        :type nbytes: :class:`int`, optional
+        :param files: files done since the last report, defaults to `0`.
+        :type files: :class:`int`, optional
+        :return: updated progress.
+        :rtype: `None`
+        """
+
+    def close(self) -> None:
+        """Mark the operation as finished.
+
+        ---
+
+        :return: finished task.
+        :rtype: `None`
+        """
+
+    def __enter__(self) -> '_Task':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+_null_task: _Task = _Task()  # Shared by every operation nobody renders
+
+
+class _Renderer:
+    """Subscriber turning progress events into output.
+
+    ---
+
+    - Contains the following methods:
+
+        - :func:`task(self, desc) -> _Task`
+            - Return a task rendering the progress of a new operation.
+    """
+
+    def task(self, desc: str) -> _Task:
+        """Return a task rendering the progress of a new operation.
+
+        ---
+
+        :param desc: description of the operation.
+        :type desc: :class:`str`
+        :return: task receiving the operation's progress events.
+        :rtype: :class:`_Task`
+        """
+
+        return _null_task
+
+
+class _BarTask(_Task):
+    """Task rendered as a `tqdm` progress bar of bytes, with a running file count."""
+
+    def __init__(self, desc: str) -> None:
+        """Initialize progress bar task.
+
+        ---
+
+        :param desc: description shown on the progress bar.
+        :type desc: :class:`str`
+        :return: new progress bar task.
+        :rtype: `None`
+        """
+
+        import tqdm  # Only imported once a bar is rendered
+
+        self.files = 0  # Files done
+        self.files_total = 0  # Files expected
+        self._lock = threading.Lock()  # Events may come from worker threads
+        self._bar = tqdm.tqdm(total=0,
+                              unit='B',
+                              unit_scale=True,
+                              unit_divisor=1024,
+                              desc=desc,
+                              file=sys.stdout)
+
+    def expect(self, nbytes: int = 0, files: int = 0) -> None:
+        with self._lock:
+            self._bar.total += nbytes
+            self.files_total += files
+            if files:
+                self._bar.set_postfix_str(
+                    f'{self.files}/{self.files_total} files', refresh=False)
+            self._bar.refresh()
+
+    def advance(self, nbytes: int = 0, files: int = 0) -> None:
+        with self._lock:
+            if files:
+                self.files += files
+                self._bar.set_postfix_str(
+                    f'{self.files}/{self.files_total} files', refresh=False)
+            self._bar.update(nbytes)
+
+    def close(self) -> None:
+        with self._lock:
+            self._bar.close()
+
+
+class _BarRenderer(_Renderer):
+    """Render every operation as a `tqdm` progress bar on `stdout`."""
+
+    def task(self, desc: str) -> _Task:
+        return _BarTask(desc)
+
+
+class _FanoutTask(_Task):
+    """Task forwarding its events to the tasks of several renderers."""
+
+    def __init__(self, tasks: list) -> None:
+        self.tasks = tasks
+
+    def expect(self, nbytes: int = 0, files: int = 0) -> None:
+        for task in self.tasks:
+            task.expect(nbytes, files)
+
+    def advance(self, nbytes: int = 0, files: int = 0) -> None:
+        for task in self.tasks:
+            task.advance(nbytes, files)
+
+    def close(self) -> None:
+        for task in self.tasks:
+            task.close()
+
+
+class _Progress:
+    """Progress events of downloads, extractions & deployments, dispatched to subscribed renderers.
+
+    - Emitters open a task per operation through :func:`task`, then report real bytes & file counts to it as work is done.
+    - While no renderer is subscribed, every task is :data:`_null_task`, so progress costs nothing.
+
+    ---
+
+    - Contains the following methods:
+
+        - :func:`subscribe(self, renderer) -> None`
+            - Start rendering progress with :param:`renderer`.
+
+        - :func:`unsubscribe(self, renderer) -> None`
+            - Stop rendering progress with :param:`renderer`.
+
+        - :func:`task(self, desc) -> _Task`
+            - Open a task receiving the progress of a new operation.
+    """
+
+    def __init__(self) -> None:
+        """Initialize progress dispatcher, without renderers.
+
+        ---
+
+        :return: new progress dispatcher instance.
+        :rtype: `None`
+        """
+
+        self.renderers: list = []
+
+    def subscribe(self, renderer: _Renderer) -> None:
+        """Start rendering progress with :param:`renderer`.
+
+        ---
+
+        :param renderer: renderer of operations opened from now on.
+        :type renderer: :class:`_Renderer`
+        :return: subscribed renderer.
+        :rtype: `None`
+        """
+
+        if renderer not in self.renderers:
+            self.renderers.append(renderer)
+
+    def unsubscribe(self, renderer: _Renderer) -> None:
+        """Stop rendering progress with :param:`renderer`.
+
+        ---
+
+        :param renderer: subscribed renderer.
+        :type renderer: :class:`_Renderer`
+        :return: unsubscribed renderer.
+        :rtype: `None`
+        """
+
+        if renderer in self.renderers:
+            self.renderers.remove(renderer)
+
+    def task(self, desc: str) -> _Task:
+        """Open a task receiving the progress of a new operation.
+
+        ---
+
+        :param desc: description of the operation (e.g. `Deploying`).
+        :type desc: :class:`str`
+        :return: task to report progress to, closed when the operation ends.
+        :rtype: :class:`_Task`
+        """
+
+        if not self.renderers:
+            return _null_task
+        if len(self.renderers) == 1:
+            return self.renderers[0].task(desc)
+        return _FanoutTask(
+            [renderer.task(desc) for renderer in self.renderers])
+
+
+progress: _Progress = _Progress()  # Shared progress dispatcher
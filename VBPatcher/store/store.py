@@ -0,0 +1,514 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from time import time
+
+import VBPatcher.appglobals.globals
+from VBPatcher.tracing.tracing import tracer
+
+
+class _ArtifactStore:
+    """Content-addressed store of extracted patch files, keeping several versions of each channel.
+
+    - Files are stored once under their SHA-256 digest in `{root}/objects`, so files shared between versions or channels (e.g. `Mono.Cecil*.dll`, `MonoMod*.dll`, `0Harmony.dll`) are deduplicated.
+    - `{root}/index.json` maps each `(channel, version)` pair to a manifest of `{relative path: {'sha256', 'size', 'crc32'}}`, alongside its size and last-use time.
+        - `crc32` is the archive member's CRC-32, letting the next version's archive be compared without decompressing it (see :func:`reusable`).
+    - Versions are evicted least-recently-used first once the store exceeds :attr:`max_bytes`, or once unused for longer than :attr:`max_age` seconds.
+        - The most recently used version of each channel is never evicted.
+    - `{root}/stat.json` caches the `(inode, size, mtime_ns)` of every object at its last verification, so verifying an unchanged version costs one `stat` call per file.
+
+    ---
+
+    - Contains the following methods:
+
+        - :func:`object_path(self, digest) -> str`
+            - Return path of the stored object with the given digest.
+
+        - :func:`manifest(self, channel, version) -> dict | None`
+            - Return file manifest of a stored version, marking it as recently used.
+
+        - :func:`versions(self, channel) -> list[str]`
+            - Return stored versions of a channel, most recently used first.
+
+        - :func:`verify(self, channel, version, deep) -> list[str] | None`
+            - Check the stored files of a version against its manifest, returning files that are missing or corrupt.
+
+        - :func:`reusable(self, channel) -> dict`
+            - Return intact files of the newest stored version of a channel, to reuse when extracting another.
+
+        - :func:`hold(self, digest) -> bool`
+            - Protect a stored object from eviction until a version referencing it is recorded.
+
+        - :func:`ingest(self, stream) -> tuple[str, int]`
+            - Copy a file-like object into the store, hashing it on the way.
+
+        - :func:`add(self, channel, version, files, archive) -> None`
+            - Record a version whose objects are already stored, then apply the eviction policy.
+
+        - :func:`evict(self) -> list[str]`
+            - Apply the LRU eviction policy and delete unreferenced objects.
+    """
+
+    def __init__(self, root: str, max_bytes: int, max_age: float) -> None:
+        """Initialize artifact store.
+
+        ---
+
+        :param root: directory holding the store.
+        :type root: :class:`str`
+        :param max_bytes: size limit of all stored objects, in bytes.
+        :type max_bytes: :class:`int`
+        :param max_age: seconds after which an unused version is evicted.
+        :type max_age: :class:`float`
+        :return: new artifact store instance.
+        :rtype: `None`
+        """
+
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.objects = f'{root}/objects'  # Object directory
+        self.index_file = f'{root}/index.json'  # Version index
+        self.stat_file = f'{root}/stat.json'  # Object stats at last verification
+        self._lock = threading.RLock()  # Serializes index updates
+        self._pending: set = set()  # Stored digests not yet indexed
+
+    @staticmethod
+    def _key(channel: str, version: str) -> str:
+        """Return index key of a `(channel, version)` pair.
+
+        ---
+
+        :param channel: patch channel (`stable` or `dev`).
+        :type channel: :class:`str`
+        :param version: patch version/build.
+        :type version: :class:`str`
+        :return: index key.
+        :rtype: :class:`str`
+        """
+
+        return f'{channel}/{version}'
+
+    def object_path(self, digest: str) -> str:
+        """Return path of the stored object with the given digest.
+
+        ---
+
+        :param digest: hex SHA-256 digest of object.
+        :type digest: :class:`str`
+        :return: path of object.
+        :rtype: :class:`str`
+        """
+
+        return f'{self.objects}/{digest[:2]}/{digest[2:]}'
+
+    def manifest(self, channel: str, version: str) -> dict | None:
+        """Return file manifest of a stored version, marking it as recently used.
+
+        ---
+
+        :param channel: patch channel (`stable` or `dev`).
+        :type channel: :class:`str`
+        :param version: patch version/build.
+        :type version: :class:`str`
+        :return: mapping of relative file path to `{'sha256', 'size'}`, or `None` if the version isn't stored.
+        :rtype: :class:`dict` | `None`
+        """
+
+        with self._lock:
+            index: dict = self._read_index()
+            entry: dict | None = index.get(self._key(channel, version))
+            if entry is None:
+                return None
+
+            if time(
+            ) - entry['used'] > 60:  # Avoid rewriting index on every use
+                entry['used'] = time()
+                self._write_index(index)
+            return entry['files']
+
+    def versions(self, channel: str) -> list[str]:
+        """Return stored versions of a channel, most recently used first.
+
+        ---
+
+        :param channel: patch channel (`stable` or `dev`).
+        :type channel: :class:`str`
+        :return: stored versions.
+        :rtype: :class:`list[str]`
+        """
+
+        with self._lock:
+            entries: list = sorted((e for e in self._read_index().values()
+                                    if e['channel'] == channel),
+                                   key=lambda e: e['used'],
+                                   reverse=True)
+            return [e['version'] for e in entries]
+
+    def verify(self,
+               channel: str,
+               version: str,
+               deep: bool = False) -> list[str] | None:
+        """Check the stored files of a version against its manifest, returning files that are missing or corrupt.
+
+        - Objects whose `(inode, size, mtime_ns)` match the stat cache are trusted; others are rehashed.
+        - :param:`deep` rehashes every object regardless of the stat cache.
+        - Corrupt objects are deleted, so downloading the version again stores them afresh.
+
+        ---
+
+        :param channel: patch channel (`stable` or `dev`).
+        :type channel: :class:`str`
+        :param version: patch version/build.
+        :type version: :class:`str`
+        :param deep: rehash every object, defaults to `False`.
+        :type deep: :class:`bool`, optional
+        :return: relative paths of missing or corrupt files, or `None` if the version isn't stored.
+        :rtype: :class:`list[str]` | `None`
+        """
+
+        files: dict | None = self.manifest(channel, version)
+        if not files:
+            return None
+
+        with tracer.span('verify', channel=channel, version=version,
+                         deep=deep) as span, self._lock:
+            stats: dict = self._read_json(self.stat_file)
+            changed: bool = False
+            failed: list = []
+            span.add(files=len(files))
+
+            for rel, entry in files.items():
+                obj: str = self.object_path(entry['sha256'])
+                try:
+                    st: os.stat_result = os.stat(obj)
+                except OSError:
+                    failed.append(rel)  # Missing
+                    continue
+
+                key: list = [st.st_ino, st.st_size, st.st_mtime_ns]
+                if not deep and stats.get(entry['sha256']) == key:
+                    continue
+
+                span.add(st.st_size)  # Rehashed
+                if (st.st_size != entry['size']
+                        or self._hash(obj) != entry['sha256']):
+                    failed.append(rel)  # Corrupt
+                    os.unlink(obj)
+                    stats.pop(entry['sha256'], None)
+                else:
+                    stats[entry['sha256']] = key
+                changed = True
+
+            if changed:
+                self._write_json(self.stat_file, stats)
+
+            return failed
+
+    def reusable(self, channel: str) -> dict:
+        """Return intact files of the newest stored version of a channel, to reuse when extracting another.
+
+        - Only files with a recorded `crc32` can be reused, and only if their object still matches the stat cache, so objects found corrupt by :func:`verify` are extracted again.
+        - The version isn't marked as recently used.
+
+        ---
+
+        :param channel: patch channel (`stable` or `dev`).
+        :type channel: :class:`str`
+        :return: mapping of relative file path to `{'sha256', 'size', 'crc32'}`, or `None` if the file can't be reused; empty if the channel has no stored version.
+        :rtype: :class:`dict`
+        """
+
+        with self._lock:
+            entries: list = [
+                e for e in self._read_index().values()
+                if e['channel'] == channel
+            ]
+            if not entries:
+                return {}
+
+            newest: dict = max(entries, key=lambda e: e['used'])
+            stats: dict = self._read_json(self.stat_file)
+            files: dict = {}
+
+            for rel, entry in newest['files'].items():
+                files[rel] = None
+                if 'crc32' not in entry:
+                    continue
+                try:
+                    st: os.stat_result = os.stat(
+                        self.object_path(entry['sha256']))
+                except OSError:
+                    continue  # Missing
+                if stats.get(entry['sha256']) == [
+                        st.st_ino, st.st_size, st.st_mtime_ns
+                ]:
+                    files[rel] = entry
+
+            return files
+
+    def hold(self, digest: str) -> bool:
+        """Protect a stored object from eviction until a version referencing it is recorded with :func:`add`.
+
+        ---
+
+        :param digest: hex SHA-256 digest of object.
+        :type digest: :class:`str`
+        :return: `True` if the object is stored, otherwise `False`.
+        :rtype: :class:`bool`
+        """
+
+        with self._lock:
+            if not os.path.exists(self.object_path(digest)):
+                return False
+            self._pending.add(digest)
+            return True
+
+    def ingest(self, stream) -> tuple[str, int]:
+        """Copy a file-like object into the store, hashing it on the way.
+
+        - Data is written once, to a temporary file renamed to its digest; duplicates of stored objects are discarded.
+        - The object is protected from eviction until a version referencing it is recorded with :func:`add`.
+
+        ---
+
+        :param stream: readable binary file-like object.
+        :type stream: :class:`BinaryIO`
+        :return: hex SHA-256 digest and size of stored object.
+        :rtype: :class:`tuple[str, int]`
+        """
+
+        os.makedirs(self.objects, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.objects, suffix='.tmp')
+
+        digest = hashlib.sha256()
+        size: int = 0
+        with os.fdopen(fd, 'wb') as fh:
+            for block in iter(lambda: stream.read(1024 * 1024), b''):
+                digest.update(block)
+                fh.write(block)
+                size += len(block)
+
+        obj: str = self.object_path(digest.hexdigest())
+        with self._lock:
+            if os.path.exists(obj):
+                os.unlink(tmp)  # Already stored
+            else:
+                os.makedirs(os.path.dirname(obj), exist_ok=True)
+                os.replace(tmp, obj)
+            self._pending.add(digest.hexdigest())
+
+        return digest.hexdigest(), size
+
+    def add(self,
+            channel: str,
+            version: str,
+            files: dict,
+            archive: str | None = None) -> None:
+        """Record a version whose objects are already stored, then apply the eviction policy.
+
+        - The stored objects' stats are cached, so verifying the new version needs no rehashing.
+
+        ---
+
+        :param channel: patch channel (`stable` or `dev`).
+        :type channel: :class:`str`
+        :param version: patch version/build.
+        :type version: :class:`str`
+        :param files: manifest of the version.
+        :type files: :class:`dict`
+        :param archive: hex SHA-256 digest of the archive the version was extracted from, defaults to `None`.
+        :type archive: :class:`str` | `None`, optional
+        :return: updated index.
+        :rtype: `None`
+        """
+
+        with self._lock:
+            index: dict = self._read_index()
+            index[self._key(channel, version)] = {
+                'channel': channel,
+                'version': version,
+                'files': files,
+                'archive': archive,
+                'size': sum(f['size'] for f in files.values()),
+                'added': time(),
+                'used': time()
+            }
+            self._write_index(index)
+            self._pending.difference_update(f['sha256']
+                                            for f in files.values())
+
+            stats: dict = self._read_json(self.stat_file)
+            for f in files.values():  # Digests were computed while storing
+                st: os.stat_result = os.stat(self.object_path(f['sha256']))
+                stats[f['sha256']] = [st.st_ino, st.st_size, st.st_mtime_ns]
+            self._write_json(self.stat_file, stats)
+
+            self.evict()
+
+    def evict(self) -> list[str]:
+        """Apply the LRU eviction policy and delete unreferenced objects.
+
+        - Versions unused for longer than :attr:`max_age` are evicted.
+        - Remaining versions are evicted least-recently-used first while stored objects exceed :attr:`max_bytes`.
+        - The most recently used version of each channel is always kept.
+
+        ---
+
+        :return: index keys of evicted versions.
+        :rtype: :class:`list[str]`
+        """
+
+        with self._lock:
+            index: dict = self._read_index()
+            entries: list = sorted(index.items(), key=lambda kv: kv[1]['used'])
+
+            newest: dict = {}  # Most recently used version per channel
+            for key, entry in entries:
+                newest[entry['channel']] = key
+
+            sizes: dict = {}  # Unique object sizes
+            for _, entry in entries:
+                for f in entry['files'].values():
+                    sizes[f['sha256']] = f['size']
+            total: int = sum(sizes.values())
+
+            evicted: list = []
+            for key, entry in entries:
+                if key in newest.values():
+                    continue
+                if time(
+                ) - entry['used'] <= self.max_age and total <= self.max_bytes:
+                    continue
+
+                evicted.append(key)
+                del index[key]
+                live: set = {
+                    f['sha256']
+                    for e in index.values()
+                    for f in e['files'].values()
+                }
+                total = sum(size for digest, size in sizes.items()
+                            if digest in live)
+
+            if evicted:
+                self._write_index(index)
+                self._collect(index)
+
+            return evicted
+
+    def _collect(self, index: dict) -> None:
+        """Delete objects no longer referenced by any stored version.
+
+        ---
+
+        :param index: current version index.
+        :type index: :class:`dict`
+        :return: removed objects.
+        :rtype: `None`
+        """
+
+        live: set = {
+            f['sha256']
+            for e in index.values()
+            for f in e['files'].values()
+        } | self._pending  # Objects of versions still being stored
+
+        for root, dirs, names in os.walk(self.objects):
+            for name in names:
+                digest: str = f'{os.path.basename(root)}{name}'
+                if root != self.objects and digest not in live:
+                    os.unlink(os.path.join(root, name))
+
+        stats: dict = self._read_json(self.stat_file)
+        if stats.keys() - live:
+            self._write_json(self.stat_file, {
+                k: v
+                for k, v in stats.items() if k in live
+            })
+
+    @staticmethod
+    def _hash(path: str) -> str:
+        """Return hex SHA-256 digest of a file.
+
+        ---
+
+        :param path: path of file.
+        :type path: :class:`str`
+        :return: hex digest.
+        :rtype: :class:`str`
+        """
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as fh:
+            for block in iter(lambda: fh.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _read_index(self) -> dict:
+        """Read version index from disk.
+
+        ---
+
+        :return: index entries keyed by `{channel}/{version}`, or an empty dict if no index exists.
+        :rtype: :class:`dict`
+        """
+
+        return self._read_json(self.index_file)
+
+    def _write_index(self, index: dict) -> None:
+        """Atomically write version index to disk.
+
+        ---
+
+        :param index: index entries keyed by `{channel}/{version}`.
+        :type index: :class:`dict`
+        :return: updated index file.
+        :rtype: `None`
+        """
+
+        self._write_json(self.index_file, index)
+
+    @staticmethod
+    def _read_json(path: str) -> dict:
+        """Read a JSON file of the store.
+
+        ---
+
+        :param path: path of file.
+        :type path: :class:`str`
+        :return: decoded file, or an empty dict if the file is missing or invalid.
+        :rtype: :class:`dict`
+        """
+
+        try:
+            with open(path, 'r') as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_json(self, path: str, data: dict) -> None:
+        """Atomically write a JSON file of the store.
+
+        ---
+
+        :param path: path of file.
+        :type path: :class:`str`
+        :param data: data to write.
+        :type data: :class:`dict`
+        :return: updated file.
+        :rtype: `None`
+        """
+
+        os.makedirs(self.root, exist_ok=True)
+        with open(f'{path}.tmp', 'w') as fh:
+            json.dump(data, fh)
+        os.replace(f'{path}.tmp', path)
+
+
+store: _ArtifactStore = _ArtifactStore(
+    VBPatcher.appglobals.globals.patch_store,
+    VBPatcher.appglobals.globals.store_max_bytes,
+    VBPatcher.appglobals.globals.store_max_age)  # Shared artifact store
@@ -1,3 +1,5 @@
+import os
+import shlex
 import sys
 from subprocess import TimeoutExpired, call
 from sys import exit as ex
@@ -5,10 +7,10 @@ from time import sleep
 from typing import NoReturn
 
 import VBPatcher.appglobals.globals
-from PyLoadBar import PyLoadBar
+from VBPatcher.appglobals.lazy import _LazyInstance
 from VBPatcher.apploggers.loggers import logger, logger_stream
 
-start_seq = PyLoadBar(False)
+start_seq = _LazyInstance('PyLoadBar', 'PyLoadBar', False)
 
 
 def _exitPatcher() -> None | NoReturn:
@@ -48,18 +50,66 @@ def _openValheim() -> None:
                         iter_total=3,
                         txt_iter_speed=0.25)
 
-        call(r"C:\Program Files (x86)\Steam\Steam.exe -applaunch 892970",
-             timeout=15,
-             stdout=sys.stdout,
-             stderr=sys.stderr)  # Start Valheim
+        _launchValheim()  # Start Valheim
 
-    except TimeoutExpired:
+    finally:
+        return _exitPatcher()
+
+
+def _launchValheim() -> bool:
+    """Start Valheim within Steam client, without any prompts or animations.
+
+    - :attr:`launch_cmd` is split into arguments (see :func:`_launchArgs`) and run without a shell.
+    - Will fail if the Steam client doesn't accept the launch command within 15 seconds, or exits with a non-zero code.
+
+    ---
+
+    :return: `True` if the launch command was accepted.
+    :rtype: :class:`bool`
+    """
+
+    try:
+        code: int = call(_launchArgs(VBPatcher.appglobals.globals.launch_cmd),
+                         timeout=15,
+                         stdout=sys.stdout,
+                         stderr=sys.stderr)  # Start Valheim
+
+    except (TimeoutExpired, OSError, ValueError):
         logger_stream.error(
-            f'Something went wrong while starting Valheim...\n>> Make sure Steam is running!\n'
+            'Something went wrong while starting Valheim...\n>> Make sure Steam is running!\n'
         )
+        return False
 
-    finally:
-        return _exitPatcher()
+    if code != 0:
+        logger_stream.warning(
+            'Launch command exited with code %d...\n>> Make sure Steam is running!\n',
+            code)
+        return False
+    return True
+
+
+def _launchArgs(cmd: str) -> list[str]:
+    """Split a launch command into its arguments.
+
+    - Quoted arguments keep their spaces (e.g. `"C:\\Program Files (x86)\\Steam\\Steam.exe" -applaunch 892970`).
+    - On Windows, backslashes are kept as path separators rather than read as escapes.
+
+    ---
+
+    :param cmd: launch command.
+    :type cmd: :class:`str`
+    :return: program & arguments.
+    :rtype: :class:`list[str]`
+    :raises ValueError: if :param:`cmd` has unbalanced quotes.
+    """
+
+    if os.name != 'nt':
+        return shlex.split(cmd)
+
+    return [
+        arg[1:-1] if len(arg) > 1 and arg[0] == arg[-1] == '"' else arg
+        for arg in shlex.split(cmd, posix=False)
+    ]
 
 
 def _startPrompt() -> None:
@@ -0,0 +1,264 @@
+import json
+import os
+import threading
+from time import perf_counter_ns, process_time_ns
+
+
+class _Span:
+    """Timed phase of a run, counting the bytes moved & files touched within it.
+
+    - This base span records nothing, so instrumented code costs one no-op call per phase while tracing is disabled.
+
+    ---
+
+    - Contains the following methods:
+
+        - :func:`add(self, nbytes, files) -> None`
+            - Count :param:`nbytes` & :param:`files` towards this span.
+
+        - :func:`note(self, **args) -> None`
+            - Record details learned during the phase (e.g. whether a cache was hit).
+    """
+
+    def add(self, nbytes: int = 0, files: int = 0) -> None:
+        """Count :param:`nbytes` & :param:`files` towards this span.
+
+        ---
+
+        :param nbytes: bytes moved, defaults to `0`.
+        :type nbytes: :class:`int`, optional
+        :param files: files touched, defaults to `0`.
+        :type files: :class:`int`, optional
+        :return: updated span.
+        :rtype: `None`
+        """
+
+    def note(self, **args) -> None:
+        """Record details learned during the phase (e.g. whether a cache was hit).
+
+        ---
+
+        :param args: details recorded with the span.
+        :type args: :class:`Any`
+        :return: updated span.
+        :rtype: `None`
+        """
+
+    def __enter__(self) -> '_Span':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+_null_span: _Span = _Span()  # Shared by every phase while tracing is disabled
+
+
+class _RecordedSpan(_Span):
+    """Span measuring wall & CPU time, recorded by its tracer once it ends."""
+
+    def __init__(self, tracer: '_Tracer', name: str, args: dict) -> None:
+        """Initialize recorded span.
+
+        ---
+
+        :param tracer: tracer recording the span.
+        :type tracer: :class:`_Tracer`
+        :param name: name of the phase (e.g. `download`).
+        :type name: :class:`str`
+        :param args: details of the phase (e.g. channel, URL).
+        :type args: :class:`dict`
+        :return: new span instance.
+        :rtype: `None`
+        """
+
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.nbytes = 0
+        self.files = 0
+        self._lock = threading.Lock()  # Counts may come from worker threads
+
+    def add(self, nbytes: int = 0, files: int = 0) -> None:
+        with self._lock:
+            self.nbytes += nbytes
+            self.files += files
+
+    def note(self, **args) -> None:
+        self.args.update(args)
+
+    def __enter__(self) -> '_Span':
+        self.tid = threading.get_ident()
+        self.start = perf_counter_ns()
+        self.cpu = process_time_ns()
+        return self
+
+    def __exit__(self, exc_type, *exc) -> None:
+        self.tracer._record({
+            'name': self.name,
+            'start_us': (self.start - self.tracer.origin) / 1000,
+            'wall_ms': (perf_counter_ns() - self.start) / 1e6,
+            'cpu_ms': (process_time_ns() - self.cpu) / 1e6,
+            'bytes': self.nbytes,
+            'files': self.files,
+            'tid': self.tid,
+            'ok': exc_type is None,
+            'args': self.args
+        })
+
+
+class _Tracer:
+    """Record timing spans of run phases (metadata resolution, download, extraction, validation, deployment).
+
+    - Each span records wall time, process CPU time (including worker threads), bytes moved & files touched.
+    - Spans are collected in memory and written by :func:`close`, as JSON lines or in Chrome trace-event format (loadable in `chrome://tracing` or Perfetto).
+    - Until :func:`enable` is called, :func:`span` returns :data:`_null_span`, so tracing costs close to nothing.
+
+    ---
+
+    - Contains the following methods:
+
+        - :func:`enable(self, path, fmt) -> None`
+            - Start recording spans, to be written to :param:`path`.
+
+        - :func:`span(self, name, **args) -> _Span`
+            - Return a context manager timing the phase :param:`name`.
+
+        - :func:`close(self) -> None`
+            - Write recorded spans to the trace file, then stop recording.
+    """
+
+    formats: tuple = ('jsonl', 'chrome')  # Supported trace file formats
+
+    def __init__(self) -> None:
+        """Initialize disabled tracer.
+
+        ---
+
+        :return: new tracer instance.
+        :rtype: `None`
+        """
+
+        self.enabled = False
+        self.path: str | None = None
+        self.fmt = 'jsonl'
+        self.origin = 0  # `perf_counter_ns` when tracing was enabled
+        self.spans: list = []
+        self._lock = threading.Lock()
+
+    def enable(self, path: str, fmt: str | None = None) -> None:
+        """Start recording spans, to be written to :param:`path`.
+
+        ---
+
+        :param path: trace file written by :func:`close`.
+        :type path: :class:`str`
+        :param fmt: `jsonl` or `chrome`, defaults to `chrome` for `.json` files, otherwise `jsonl`.
+        :type fmt: :class:`str` | `None`, optional
+        :return: enabled tracer.
+        :rtype: `None`
+        """
+
+        if fmt is None:
+            fmt = 'chrome' if path.endswith('.json') else 'jsonl'
+        if fmt not in self.formats:
+            raise ValueError(f'Unknown trace format: {fmt}')
+
+        self.path = path
+        self.fmt = fmt
+        self.origin = perf_counter_ns()
+        self.spans = []
+        self.enabled = True
+
+    def span(self, name: str, **args) -> _Span:
+        """Return a context manager timing the phase :param:`name`.
+
+        ---
+
+        :param name: name of the phase (e.g. `download`).
+        :type name: :class:`str`
+        :param args: details of the phase, recorded with the span.
+        :type args: :class:`Any`
+        :return: span to count bytes & files towards.
+        :rtype: :class:`_Span`
+        """
+
+        if not self.enabled:
+            return _null_span
+        return _RecordedSpan(self, name, args)
+
+    def close(self) -> None:
+        """Write recorded spans to the trace file, then stop recording.
+
+        ---
+
+        :return: written trace file.
+        :rtype: `None`
+        """
+
+        if not self.enabled:
+            return
+        self.enabled = False
+
+        with self._lock:
+            spans: list = sorted(self.spans, key=lambda span: span['start_us'])
+
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        with open(self.path, 'w') as fh:
+            if self.fmt == 'jsonl':
+                for span in spans:
+                    fh.write(json.dumps(span) + '\n')
+            else:
+                json.dump(
+                    {
+                        'traceEvents': [self._event(span) for span in spans],
+                        'displayTimeUnit': 'ms'
+                    }, fh)
+
+    def _record(self, span: dict) -> None:
+        """Keep a finished span.
+
+        ---
+
+        :param span: span fields.
+        :type span: :class:`dict`
+        :return: recorded span.
+        :rtype: `None`
+        """
+
+        with self._lock:
+            self.spans.append(span)
+
+    @staticmethod
+    def _event(span: dict) -> dict:
+        """Convert a span to a Chrome trace "complete" event.
+
+        ---
+
+        :param span: span fields.
+        :type span: :class:`dict`
+        :return: trace event.
+        :rtype: :class:`dict`
+        """
+
+        return {
+            'name': span['name'],
+            'cat': 'vbpatcher',
+            'ph': 'X',
+            'ts': span['start_us'],
+            'dur': span['wall_ms'] * 1000,
+            'pid': os.getpid(),
+            'tid': span['tid'],
+            'args': {
+                'cpu_ms': span['cpu_ms'],
+                'bytes': span['bytes'],
+                'files': span['files'],
+                'ok': span['ok'],
+                **span['args']
+            }
+        }
+
+
+tracer: _Tracer = _Tracer()  # Shared tracer
@@ -1,14 +1,16 @@
-import os
-from zipfile import is_zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from time import perf_counter
 
 import VBPatcher.appglobals.globals
-import VBPatcher.downloader.downloader
-from PyLoadBar import PyLoadBar
+from VBPatcher.appglobals.lazy import _LazyInstance
 from VBPatcher.apploggers.loggers import logger, logger_stream
+from VBPatcher.store.store import store
 from VBPatcher.subprocessing.subprocessing import _exitPatcher
+from VBPatcher.tracing.tracing import tracer
 
-DL = VBPatcher.downloader.downloader._Downloader()
-bar = PyLoadBar(False)
+DL = _LazyInstance('VBPatcher.downloader.downloader',
+                   '_Downloader')  # Imported only once a patch must be fetched
+bar = _LazyInstance('PyLoadBar', 'PyLoadBar', False)
 
 
 class _Validate:
@@ -18,81 +20,72 @@ class _Validate:
 
     - Contains the following validation methods:
 
-        - :func:`_validate_stable(url) -> bool`
-            - Validate presence of BepInEx stable build patch files.
+        - :func:`_validate_stable(url, deep) -> bool`
+            - Validate presence & integrity of BepInEx stable build patch files in the artifact store.
             - Static method.
 
-        - :func:`_validate_dev(url) -> bool:`
-            - Validate presence of BepInEx dev build patch files.
+        - :func:`_validate_dev(url, deep) -> bool:`
+            - Validate presence & integrity of BepInEx dev build patch files in the artifact store.
             - Static method.
 
-        - :func:`_start_checks(self) -> None`
+        - :func:`_readiness(self, deep) -> dict[str, tuple[bool, float]]`
+            - Validate both patch channels concurrently, timing each check.
+
+        - :func:`_start_checks(self, deep) -> None`
             - Start patch file validation checks.
     """
 
     @staticmethod
-    def _validate_stable(url) -> bool:
-        """Validate presence of BepInEx stable build patch files.
+    def _validate_stable(url, deep: bool = False) -> bool:
+        """Validate presence & integrity of BepInEx stable build patch files.
+
+        - Stored files are checked against the manifest (paths, sizes & SHA-256 digests) recorded when the patch was extracted.
+        - Files whose stats are unchanged since their last check aren't rehashed, unless :param:`deep` is set (see :func:`store.verify`).
 
         ---
 
         :param url: url to download BepInEx stable build from if not found.
         :type url: :class:`Any`
+        :param deep: rehash every stored patch file, defaults to `False`.
+        :type deep: :class:`bool`, optional
         :return: validation of patch files.
         :rtype: :class:`bool`
         """
 
-        logger.info(
-            f'Validating BepInEx stable-build {VBPatcher.appglobals.globals.ver_stable} patch...'
-        )
-
-        patch_contents: list = [
-            ['.gitkeep', 'changelog.txt', 'winhttp.dll'], [],
-            [
-                '0Harmony.dll', '0Harmony.xml', '0Harmony20.dll',
-                'BepInEx.dll', 'BepInEx.Harmony.dll', 'BepInEx.Harmony.xml',
-                'BepInEx.Preloader.dll', 'BepInEx.Preloader.xml',
-                'BepInEx.xml', 'HarmonyXInterop.dll', 'Mono.Cecil.dll',
-                'Mono.Cecil.Mdb.dll', 'Mono.Cecil.Pdb.dll',
-                'Mono.Cecil.Rocks.dll', 'MonoMod.RuntimeDetour.dll',
-                'MonoMod.RuntimeDetour.xml', 'MonoMod.Utils.dll',
-                'MonoMod.Utils.xml'
-            ]
-        ]  # List of files to verify
+        logger.info('Validating BepInEx stable-build %s patch...',
+                    VBPatcher.appglobals.globals.ver_stable)
 
         stable_match: bool = False  # Initialize match flag
 
-        verified: list = []  # Initialize verified file list
-
         try:
-            verified.extend(
-                file
-                for (root, dirs,
-                     file) in os.walk('./patch-files/stable', topdown=True
-                                      ))  # Get list of files in patch folder
+            failed: list[str] | None = store.verify(
+                'stable', VBPatcher.appglobals.globals.ver_stable,
+                deep)  # Check stored patch files against their manifest
 
-            if verified == patch_contents:
+            if failed == []:
                 stable_match = True
                 logger.info(
-                    f'BepInEx stable-build {VBPatcher.appglobals.globals.ver_stable} patch ready for deployment!\n'
-                )
+                    'BepInEx stable-build %s patch ready for deployment!\n',
+                    VBPatcher.appglobals.globals.ver_stable)
 
             else:
+                if failed:
+                    logger.info(
+                        '%s BepInEx stable-build %s patch files missing or corrupt: %s',
+                        len(failed), VBPatcher.appglobals.globals.ver_stable,
+                        ", ".join(failed))
                 logger.info(
-                    f'Unable to locate BepInEx stable-build {VBPatcher.appglobals.globals.ver_stable} patch...\n>> Attempting to download...'
-                )
-                DL._dl_stable(url)  # Download *.zip archive from url
-
-                if is_zipfile(
-                        f'./patch-files/stable/BepInEx_stable_{VBPatcher.appglobals.globals.ver_stable}.zip'
-                ):  # Check if downloaded archive is a zip file
-                    DL._unzip_patch(  # Unzip archive
-                        f'./patch-files/stable/BepInEx_stable_{VBPatcher.appglobals.globals.ver_stable}.zip',
-                        1)
+                    'Unable to locate BepInEx stable-build %s patch...\n>> Attempting to download...',
+                    VBPatcher.appglobals.globals.ver_stable)
+                digest: str | None = DL._dl_stable(
+                    url)  # Download *.zip archive from url
+
+                if digest and DL._unzip_patch(DL._archive(1), 1,
+                                              digest):  # Unzip archive
                     stable_match = True  # Update match flag
                     logger.info(
-                        f'Download successful!\n>> BepInEx stable-build {VBPatcher.appglobals.globals.ver_stable} patch ready for deployment!\n'
-                    )
+                        'Download successful!\n>> BepInEx stable-build %s patch ready for deployment!\n',
+                        VBPatcher.appglobals.globals.ver_stable)
 
                 else:
                     stable_match = False  # Update match flag
@@ -103,77 +96,64 @@ class _Validate:
         except Exception:
             stable_match = False
             logger.error(
-                f'Encountered error during BepInEx stable-build {VBPatcher.appglobals.globals.ver_stable} patch validation...\n'
-            )
+                'Encountered error during BepInEx stable-build %s patch validation...\n',
+                VBPatcher.appglobals.globals.ver_stable)
 
         finally:
             return stable_match  # Return result of validation
 
     @staticmethod
-    def _validate_dev(url) -> bool:
-        """Validate presence of BepInEx development build patch files.
+    def _validate_dev(url, deep: bool = False) -> bool:
+        """Validate presence & integrity of BepInEx development build patch files.
+
+        - Stored files are checked against the manifest (paths, sizes & SHA-256 digests) recorded when the patch was extracted.
+        - Files whose stats are unchanged since their last check aren't rehashed, unless :param:`deep` is set (see :func:`store.verify`).
 
         ---
 
         :param url: url to download BepInEx development build from if not found.
         :type url: :class:`PathLike` | :class:`str`
+        :param deep: rehash every stored patch file, defaults to `False`.
+        :type deep: :class:`bool`, optional
         :return: validation of patch files.
         :rtype: :class:`bool`
         """
 
-        logger.info(
-            f'Validating BepInEx dev-build {VBPatcher.appglobals.globals.ver_dev} patch...'
-        )
-
-        patch_contents: list = [
-            ['.doorstop_version', '.gitkeep', 'changelog.txt', 'winhttp.dll'],
-            [],
-            [
-                '0Harmony.dll', 'AssetRipper.VersionUtilities.dll',
-                'BepInEx.Core.dll', 'BepInEx.Core.xml',
-                'BepInEx.Preloader.Core.dll', 'BepInEx.Preloader.Core.xml',
-                'BepInEx.Unity.Common.dll', 'BepInEx.Unity.Common.xml',
-                'BepInEx.Unity.Mono.dll', 'BepInEx.Unity.Mono.Preloader.dll',
-                'BepInEx.Unity.Mono.Preloader.xml', 'BepInEx.Unity.Mono.xml',
-                'Mono.Cecil.dll', 'Mono.Cecil.Mdb.dll', 'Mono.Cecil.Pdb.dll',
-                'Mono.Cecil.Rocks.dll', 'MonoMod.RuntimeDetour.dll',
-                'MonoMod.Utils.dll', 'SemanticVersioning.dll'
-            ], [], []
-        ]  # List of files to verify
+        logger.info('Validating BepInEx dev-build %s patch...',
+                    VBPatcher.appglobals.globals.ver_dev)
 
         dev_match: bool = False  # Initialize match flag
 
-        verified: list = []  # Initialize verified file list
-
         try:
-            verified.extend(file for (
-                root, dirs,
-                file) in os.walk('./patch-files/development/', topdown=True)
-                            )  # Get list of files in patch folder
+            failed: list[str] | None = store.verify(
+                'dev', VBPatcher.appglobals.globals.ver_dev,
+                deep)  # Check stored patch files against their manifest
 
-            if verified == patch_contents:
+            if failed == []:
                 dev_match = True  # Update match flag
                 logger.info(
-                    f'BepInEx dev-build {VBPatcher.appglobals.globals.ver_dev} patch ready for deployment!\n'
-                )
+                    'BepInEx dev-build %s patch ready for deployment!\n',
+                    VBPatcher.appglobals.globals.ver_dev)
 
             else:
+                if failed:
+                    logger.info(
+                        '%s BepInEx dev-build %s patch files missing or corrupt: %s',
+                        len(failed), VBPatcher.appglobals.globals.ver_dev,
+                        ", ".join(failed))
                 logger.info(
-                    f'Unable to locate BepInEx dev-build {VBPatcher.appglobals.globals.ver_dev} patch...\n>> Attempting to download...'
-                )
-                DL._dl_dev(url)  # Download *.zip file from url
+                    'Unable to locate BepInEx dev-build %s patch...\n>> Attempting to download...',
+                    VBPatcher.appglobals.globals.ver_dev)
+                digest: str | None = DL._dl_dev(
+                    url)  # Download *.zip file from url
 
-                if is_zipfile(  # Check if downloaded archive is a zip file
-                        f'./patch-files/development/BepInEx_dev_{VBPatcher.appglobals.globals.ver_dev}.zip'
-                ):
-                    DL._unzip_patch(  # Unzip archive
-                        f'./patch-files/development/BepInEx_dev_{VBPatcher.appglobals.globals.ver_dev}.zip',
-                        2)
+                if digest and DL._unzip_patch(DL._archive(2), 2,
+                                              digest):  # Unzip archive
 
                     dev_match = True  # Update match flag
                     logger.info(
-                        f'Download successful!\n>> BepInEx dev-build {VBPatcher.appglobals.globals.ver_dev} patch ready for deployment!\n'
-                    )
+                        'Download successful!\n>> BepInEx dev-build %s patch ready for deployment!\n',
+                        VBPatcher.appglobals.globals.ver_dev)
 
                 else:  # If download failed
                     dev_match = False  # Update match flag
@@ -184,29 +164,84 @@ class _Validate:
         except Exception:
             dev_match = False
             logger.error(
-                f'Encountered error during BepInEx dev-build {VBPatcher.appglobals.globals.ver_dev} patch validation...\n'
-            )
+                'Encountered error during BepInEx dev-build %s patch validation...\n',
+                VBPatcher.appglobals.globals.ver_dev)
 
         finally:
             return dev_match  # Return result of validation
 
-    def _start_checks(self) -> None:
+    def _readiness(self, deep: bool = False) -> dict[str, tuple[bool, float]]:
+        """Validate both patch channels concurrently, timing each check.
+
+        - Each channel resolves its release metadata, and downloads & extracts its patch if needed, independently of the other.
+        - Returns once both channels are ready or have failed.
+
+        ---
+
+        :param deep: rehash every stored patch file, defaults to `False`.
+        :type deep: :class:`bool`, optional
+        :return: validation result & wall time in seconds, keyed by channel (`stable`, `dev`).
+        :rtype: :class:`dict[str, tuple[bool, float]]`
+        """
+
+        checks: dict = {
+            'stable': (self._validate_stable, 'url_stable'),
+            'dev': (self._validate_dev, 'url_dev')
+        }  # Validator & download link global of each channel
+
+        def timed(validate, url: str) -> tuple[bool, float]:
+            started: float = perf_counter()
+            with tracer.span('validate', channel=url[4:]) as span:
+                try:
+                    ok: bool = validate(
+                        getattr(VBPatcher.appglobals.globals, url),
+                        deep)  # Resolves release metadata within this thread
+                except Exception:
+                    ok = False
+                    logger.error('Unable to resolve %s release metadata...\n',
+                                 url)
+                span.note(ready=ok)
+            return ok, perf_counter() - started
+
+        report: dict = {}
+        with ThreadPoolExecutor(max_workers=len(checks)) as pool:
+            futures: dict = {
+                pool.submit(timed, *check): channel
+                for channel, check in checks.items()
+            }
+            for future in as_completed(futures):
+                report[futures[future]] = future.result()
+
+        return {channel: report[channel] for channel in checks}
+
+    def _start_checks(self, deep: bool = False) -> None:
         """Verify necessary patcher components upon start.
 
-        - If any patch files are missing, attempt to download them.
+        - If any patch files are missing or corrupt, attempt to download them.
+        - Both patch channels are checked concurrently (see :func:`_readiness`), and a readiness report with the time taken is shown.
 
         ---
 
+        :param deep: rehash every stored patch file, defaults to `False`.
+        :type deep: :class:`bool`, optional
         :return: continue to application if verification is successful, otherwise exits program.
         :rtype: None
         """
 
         logger_stream.info('Initializing VBPatcher start checks...\n')
 
-        if self._validate_stable(VBPatcher.appglobals.globals.url_stable
-                                 ) and self._validate_dev(
-                                     VBPatcher.appglobals.globals.url_dev
-                                 ):  # Validate presence of patch files
+        started: float = perf_counter()
+        report: dict = self._readiness(deep)  # Validate patch files
+        elapsed: float = perf_counter() - started
+
+        lines: str = ''.join(
+            f'>> {channel}: {"ready" if ok else "FAILED"} ({secs:.2f}s)\n'
+            for channel, (ok, secs) in report.items())
+        logger_stream.info(
+            'VBPatcher readiness report:\n%s>> Start checks took %.2fs\n',
+            lines, elapsed)
+
+        if all(ok for ok, _ in report.values()):
             logger_stream.info(
                 'VBPatcher start checks completed successfully!\n')
 
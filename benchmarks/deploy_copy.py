@@ -0,0 +1,78 @@
+"""Compare patch deployment through :class:`_Deployer` with a plain `shutil.copytree`.
+
+Builds a synthetic tree of many small files, then times, for each run, a fresh deployment into an empty target directory:
+
+    - `copytree`: single-threaded `shutil.copytree`, as used by earlier releases.
+    - `deploy xN`: :class:`_Deployer` with N copy workers (forced, so every file is copied).
+
+Usage: `python benchmarks/deploy_copy.py [--files 2000] [--size 4096] [--workers 1 4 8] [--repeat 3] [--dir PATH]`
+
+Point `--dir` at a network mount or HDD to see per-file latency dominate.
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from VBPatcher.patching.deploy import _Deployer  # noqa: E402
+
+
+def build_tree(root: str, files: int, size: int) -> dict:
+    """Create :param:`files` files of :param:`size` bytes below :param:`root`, returning their deployment plan."""
+
+    for i in range(files):
+        path: str = os.path.join(root, f'd{i % 40:02d}', f'sub{i % 7}',
+                                 f'f{i:05d}.dll')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as fh:
+            fh.write(os.urandom(size))
+
+    return _Deployer.plan_dir(root)
+
+
+def timed(fn) -> float:
+    """Return wall time of calling :param:`fn`, in seconds."""
+
+    started: float = perf_counter()
+    fn()
+    return perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--files', type=int, default=2000)
+    parser.add_argument('--size', type=int, default=4096)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 8])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--dir', default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        src: str = os.path.join(tmp, 'src')
+        plan: dict = build_tree(src, args.files, args.size)
+        cache: str = os.path.join(tmp, 'cache')
+
+        cases: dict = {'copytree': lambda dst: shutil.copytree(src, dst)}
+        for n in args.workers:
+            deployer = _Deployer(cache, n)
+            cases[f'deploy x{n}'] = (
+                lambda dst, d=deployer: d.deploy(plan, dst, force=True))
+
+        print(f'{args.files} files x {args.size} B')
+        for name, run in cases.items():
+            times: list = []
+            for i in range(args.repeat):
+                dst: str = os.path.join(tmp, f'dst-{i}')
+                times.append(timed(lambda: run(dst)))
+                shutil.rmtree(dst)
+            print(f'{name:>12}: best {min(times) * 1000:8.1f} ms, '
+                  f'{args.files / min(times):8.0f} files/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""Compare serial & parallel decompression of a patch archive into the artifact store.
+
+Builds a deflated archive shaped like a BepInEx release (core DLLs, XML docs, doorstop loader; `--scale` multiplies every file size, e.g. to approach an IL2CPP build), then times, for each run, extraction into an empty store:
+
+    - `extractall`: `ZipFile.extractall` into a plain directory, as used by earlier releases.
+    - `store xN`: :class:`_ParallelExtract` with N workers, hashing & storing each member as it is inflated.
+    - `store auto`: :class:`_ParallelExtract` as the patcher runs it, with :attr:`extract_workers` workers that are only used on several CPUs & at least :attr:`extract_parallel_min` bytes.
+
+The header records the CPU count & which path `store auto` takes, so results from single-CPU machines (where every worker count runs sequentially in `auto`) aren't read as a parallel speed-up.
+
+Usage: `python benchmarks/extract.py [--scale 8] [--workers 1 2 4 8] [--repeat 5] [--dir PATH]`
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+from time import perf_counter
+from zipfile import ZIP_DEFLATED, ZipFile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import VBPatcher.appglobals.globals as g  # noqa: E402
+from VBPatcher.downloader.extractor import _ParallelExtract  # noqa: E402
+from VBPatcher.store.store import _ArtifactStore  # noqa: E402
+
+# Approximate layout of BepInEx_x64_5.4.22.0.zip, sizes in KB.
+LAYOUT: dict = {
+    'BepInEx/core/0Harmony.dll': 220,
+    'BepInEx/core/0Harmony.xml': 160,
+    'BepInEx/core/BepInEx.dll': 125,
+    'BepInEx/core/BepInEx.xml': 60,
+    'BepInEx/core/BepInEx.Harmony.dll': 10,
+    'BepInEx/core/BepInEx.Harmony.xml': 5,
+    'BepInEx/core/BepInEx.Preloader.dll': 45,
+    'BepInEx/core/BepInEx.Preloader.xml': 15,
+    'BepInEx/core/HarmonyXInterop.dll': 25,
+    'BepInEx/core/Mono.Cecil.dll': 350,
+    'BepInEx/core/Mono.Cecil.Mdb.dll': 45,
+    'BepInEx/core/Mono.Cecil.Pdb.dll': 85,
+    'BepInEx/core/Mono.Cecil.Rocks.dll': 30,
+    'BepInEx/core/MonoMod.RuntimeDetour.dll': 95,
+    'BepInEx/core/MonoMod.RuntimeDetour.xml': 70,
+    'BepInEx/core/MonoMod.Utils.dll': 185,
+    'BepInEx/core/MonoMod.Utils.xml': 110,
+    'winhttp.dll': 25,
+    'doorstop_config.ini': 1,
+    'changelog.txt': 5,
+}
+
+
+def payload(rng: random.Random, size: int) -> bytes:
+    """Return :param:`size` bytes compressing roughly like a .NET assembly (about 2.5:1)."""
+
+    tokens: list = [rng.randbytes(rng.randint(4, 32)) for _ in range(512)]
+    out: bytearray = bytearray()
+    while len(out) < size:
+        out += rng.randbytes(8) if rng.random() < 0.3 else rng.choice(tokens)
+    return bytes(out[:size])
+
+
+def build_archive(path: str, scale: float) -> int:
+    """Write the synthetic release archive to :param:`path`, returning its uncompressed size."""
+
+    rng = random.Random(577)
+    total: int = 0
+    with ZipFile(path, 'w', ZIP_DEFLATED) as archive:
+        for name, kb in LAYOUT.items():
+            data: bytes = payload(rng, int(kb * 1024 * scale))
+            archive.writestr(name, data)
+            total += len(data)
+    return total
+
+
+def timed(fn) -> float:
+    """Return wall time of calling :param:`fn`, in seconds."""
+
+    started: float = perf_counter()
+    fn()
+    return perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', type=float, default=8)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--dir', default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        zip_path: str = os.path.join(tmp, 'BepInEx.zip')
+        total: int = build_archive(zip_path, args.scale)
+        with ZipFile(zip_path) as archive:
+            members: list = archive.infolist()
+
+        def extractall(out: str) -> None:
+            with ZipFile(zip_path) as archive:
+                archive.extractall(out)
+
+        cases: dict = {'extractall': extractall}
+        for workers in args.workers:
+            cases[f'store x{workers}'] = lambda out, workers=workers: (
+                _ParallelExtract(zip_path, _ArtifactStore(out, 1 << 40, 1e9),
+                                 workers, lambda size: None).run(members))
+        cases['store auto'] = lambda out: (_ParallelExtract(
+            zip_path, _ArtifactStore(out, 1 << 40, 1e9), g.extract_workers,
+            lambda size: None, g.extract_parallel_min).run(members))
+        parallel: bool = ((os.cpu_count() or 1) > 1
+                          and total >= g.extract_parallel_min)
+
+        print(f'{len(members)} members, {total / 1024 / 1024:.1f} MB '
+              f'uncompressed, {os.path.getsize(zip_path) / 1024 / 1024:.1f} '
+              f'MB archive, {os.cpu_count()} CPUs')
+        print(f'store auto: {"parallel" if parallel else "sequential"} '
+              f'(x{g.extract_workers} from '
+              f'{g.extract_parallel_min / 1024 / 1024:.0f} MB on >1 CPU)')
+        baseline: float | None = None
+        for name, fn in cases.items():
+            times: list = []
+            for _ in range(args.repeat):
+                out: str = os.path.join(tmp, 'out')
+                times.append(timed(lambda: fn(out)))
+                shutil.rmtree(out)
+            best: float = min(times)
+            if name == 'store x1':
+                baseline = best
+            ratio: str = f', {baseline / best:.2f}x vs x1' if baseline else ''
+            print(f'{name:>12}: {best * 1000:8.1f} ms, '
+                  f'{total / best / 1024 / 1024:7.1f} MB/s{ratio}')
+
+
+if __name__ == '__main__':
+    main()
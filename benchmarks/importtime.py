@@ -0,0 +1,138 @@
+"""Time-to-menu budget check, using `python -X importtime`.
+
+Starts `benchmarks/upstream.py` and warms a work directory with one `ensure` (stored patches, cached metadata), as on a machine that has run the patcher before. Then, `--repeat` times each, it times in a fresh interpreter:
+
+    - `menu`: the interactive start-up path, `VBPatcher.main.main()` up to the menu prompt (imports, start checks, release metadata shown in the menu).
+    - `VBPatcher.cli.cli`: import of the headless command-line entry point.
+
+For each it reports the best wall time of the process, the slowest modules it imported (`--top`), and any heavy dependency (`requests`, `urllib3`, `tqdm`, `PyLoadBar`, `bs4`) imported although a warm start never needs it.
+
+Exits non-zero if a path exceeds `--budget-ms`, or imports a heavy dependency, so it can guard time-to-menu in CI.
+
+Usage: `python benchmarks/importtime.py [--budget-ms 250] [--repeat 5] [--top 8]`
+"""
+
+import argparse
+import builtins
+import os
+import subprocess
+import sys
+import tempfile
+from time import perf_counter
+
+ROOT: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+SUITE: str = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                          'suite.py')
+HEAVY: tuple = ('requests', 'urllib3', 'tqdm', 'PyLoadBar', 'bs4')
+
+
+def child(workdir: str, api_stable: str, api_dev: str) -> int:
+    """Run the interactive start-up path in :param:`workdir`, exiting at the menu prompt."""
+
+    import VBPatcher.appglobals.globals as g  # Changes into the package directory
+    import VBPatcher.main
+    from VBPatcher.apploggers.loggers import _LogGenerator
+
+    os.chdir(workdir)  # Use the store, caches & logs of the warm run
+    g.api_stable = api_stable
+    g.api_dev = api_dev
+    _LogGenerator._listener.handlers[0].baseFilename = os.path.join(
+        workdir, 'logs', 'VBPatcherLog.log')  # Not yet opened
+
+    def menu(prompt: str = '') -> str:
+        raise SystemExit(0)  # Menu reached
+
+    builtins.input = menu
+    sys.argv = sys.argv[:1]
+    VBPatcher.main.main()
+    return 1  # Start-up ended before the menu
+
+
+def measure(cmd: list) -> tuple[float, dict]:
+    """Run :param:`cmd` twice in fresh interpreters, returning its wall time and, from an `-X importtime` run, `{module: (self_us, cumulative_us)}`."""
+
+    env: dict = dict(os.environ, PYTHONPATH=ROOT)
+    started: float = perf_counter()
+    subprocess.run([sys.executable] + cmd,
+                   cwd=ROOT,
+                   env=env,
+                   capture_output=True,
+                   check=True)
+    wall: float = perf_counter() - started
+
+    proc = subprocess.run([sys.executable, '-X', 'importtime'] + cmd,
+                          cwd=ROOT,
+                          env=env,
+                          capture_output=True,
+                          text=True,
+                          check=True)
+    times: dict = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        times.setdefault(name.strip(), (int(own), int(cumulative)))
+    return wall, times
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--budget-ms', type=float, default=250.0)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=8)
+    args = parser.parse_args()
+
+    from upstream import Upstream  # Kept out of the timed child
+
+    upstream = Upstream(latency=0).start()
+    failed: bool = False
+
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            subprocess.run([
+                sys.executable, SUITE, '--child', workdir, upstream.api_stable,
+                upstream.api_dev, '--progress', 'none', 'ensure', '--target',
+                'game'
+            ],
+                           capture_output=True,
+                           check=True)  # Warm store & metadata cache
+
+            paths: dict = {
+                'menu': [
+                    os.path.abspath(__file__), '--child', workdir,
+                    upstream.api_stable, upstream.api_dev
+                ],
+                'VBPatcher.cli.cli': ['-c', 'import VBPatcher.cli.cli']
+            }
+            for name, cmd in paths.items():
+                wall, times = min((measure(cmd) for _ in range(args.repeat)),
+                                  key=lambda result: result[0])
+                elapsed: float = wall * 1000
+                heavy: list = sorted(name for name in times
+                                     if name.split('.')[0] in HEAVY)
+
+                over: bool = elapsed > args.budget_ms
+                failed |= over or bool(heavy)
+                print(
+                    f'{name}: {elapsed:.1f} ms (budget {args.budget_ms:.0f} ms, '
+                    f'imports {sum(own for own, _ in times.values()) / 1000:.1f} ms)'
+                    f'{"  OVER BUDGET" if over else ""}')
+                for module, (own, _) in sorted(times.items(),
+                                               key=lambda item: item[1][0],
+                                               reverse=True)[:args.top]:
+                    print(f'    {own / 1000:7.2f} ms  {module}')
+                if heavy:
+                    print(f'    heavy imports at start-up: {", ".join(heavy)}')
+    finally:
+        upstream.stop()
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        sys.exit(child(sys.argv[2], sys.argv[3], sys.argv[4]))
+    sys.exit(main())
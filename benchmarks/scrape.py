@@ -0,0 +1,114 @@
+"""Microbenchmark of the builds-page scraper against the BeautifulSoup parse it replaced.
+
+Parses a saved copy of https://builds.bepinex.dev/projects/bepinex_be (`--page`), or a generated page of `--builds` builds shaped like it, comparing:
+
+    - `bs4`: the original dev-build lookup, copied as it was; build a full `html.parser` soup of the page, `find_all` every `div.artifacts-list`, loop over them keeping the second link of the first, & slice the version out of the download link.
+    - `stream`: :class:`_ArtifactsScraper`, fed the page in 16 KB chunks as they would arrive from the network, stopping at the newest artifact; the version is taken from it as `_PatcherAssets._parse_dev` does.
+
+Reports the best time per parse over `--repeat` rounds, and how much of the page each path consumed.
+
+Usage: `python benchmarks/scrape.py [--page builds.html] [--builds 100] [--repeat 50]`
+"""
+
+import argparse
+import os
+import sys
+from time import perf_counter
+
+ROOT: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from upstream import builds_page  # noqa: E402
+
+URL: str = 'https://builds.bepinex.dev/projects/bepinex_be'
+CHUNK: int = 16 * 1024
+
+
+def parse_bs4(page: bytes) -> tuple[str, str, int]:
+    """Original dev metadata parse (`_PatcherAssets._get_dev_assets`), unchanged apart from its inputs.
+
+    Its fixed version slice predates the current artifact names, so the version it prints is wrong; it is kept so the timed work is the same.
+    """
+
+    import bs4
+
+    url: str = URL
+    retrieved: int = 0
+
+    soup = bs4.BeautifulSoup(page, 'html.parser')  # Parse response HTML.
+    results = soup.find_all(
+        'div', class_="artifacts-list"
+    )  # Get all <div> tags with class="artifacts-list".
+
+    for result in results:
+        if retrieved < 1:  # Only get 2nd <div> tag.
+            link = result.find_all('a')[1]['href']  # Get download link.
+            retrieved += 1
+
+    dl_link = (f'{url[:26]}{link}')  # Combine URL and download link.
+
+    return dl_link, dl_link[93:100], len(page)
+
+
+def parse_stream(page: bytes) -> tuple[str, str, int]:
+    """Streaming scrape, counting the bytes consumed before it stopped."""
+
+    from VBPatcher.metadata.scraper import _ArtifactsScraper
+
+    consumed: int = 0
+
+    def chunks():
+        nonlocal consumed
+        for offset in range(0, len(page), CHUNK):
+            consumed = min(offset + CHUNK, len(page))
+            yield page[offset:offset + CHUNK]
+
+    artifact = _ArtifactsScraper.scrape(chunks(), URL)
+    return artifact.url, artifact.commit[:7], consumed
+
+
+def best(fn, page: bytes, repeat: int) -> tuple[float, str, str, int]:
+    """Return the best time of :param:`repeat` calls, with the link & version found and bytes consumed."""
+
+    times: list = []
+    for _ in range(repeat):
+        started: float = perf_counter()
+        link, version, consumed = fn(page)
+        times.append(perf_counter() - started)
+    return min(times), link, version, consumed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--page', default=None)
+    parser.add_argument('--builds', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    if args.page:
+        with open(args.page, 'rb') as fh:
+            page: bytes = fh.read()
+    else:
+        page = builds_page(args.builds).encode()
+
+    import VBPatcher.metadata.scraper  # noqa: F401  (import cost not timed)
+
+    print(f'page: {len(page) / 1024:.0f} KB, {args.repeat} rounds')
+    results: dict = {}
+    for name, fn in (('bs4', parse_bs4), ('stream', parse_stream)):
+        try:
+            results[name] = best(fn, page, args.repeat)
+        except ImportError:
+            print(f'{name:>8}: unavailable (beautifulsoup4 not installed)')
+            continue
+        elapsed, link, version, consumed = results[name]
+        print(f'{name:>8}: {elapsed * 1000:8.3f} ms, '
+              f'read {consumed / 1024:.0f} KB -> {version} {link}')
+
+    if len(results) == 2:
+        print(f' speedup: {results["bs4"][0] / results["stream"][0]:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
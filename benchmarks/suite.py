@@ -0,0 +1,190 @@
+"""Offline end-to-end benchmark of VBPatcher against a local stand-in for GitHub & builds.bepinex.dev.
+
+Starts `benchmarks/upstream.py`, then times fresh `vbpatcher` processes, each pointed at it and traced with `--trace`:
+
+    - `cold`: empty work directory; resolve metadata, download, extract, validate & deploy everything.
+    - `warm`: same work directory & target again; cached metadata, stat-cached validation, nothing deployed.
+    - `redeploy`: same store, new target; validation and a full deployment.
+    - `verify-deep`: rehash every stored & deployed file.
+    - `fanout`: deploy to ten new targets in one pass.
+
+Each run reports process wall time, the share of it spent on interpreter start-up & imports, and the wall time, CPU time, bytes & files of every traced phase; download throughput is derived from the `download` spans. Results are printed and written as JSON (`--out`), keyed by commit, for comparison.
+
+Usage: `python benchmarks/suite.py [--files 40] [--size 65536] [--latency 0.05] [--rate 0] [--no-ranges] [--repeat 3] [--out results.json]`
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from time import perf_counter
+
+ROOT: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from upstream import Upstream  # noqa: E402
+
+RUNS: list = [
+    ('cold', ['ensure', '--target', 'game']),
+    ('warm', ['ensure', '--target', 'game']),
+    ('redeploy', ['ensure', '--target', 'game2']),
+    ('verify-deep', ['verify', '--deep', '--target', 'game']),
+    ('fanout', ['ensure', '--target'] + [f'fleet{i}' for i in range(10)]),
+]  # Name & command of each run, in order; later runs reuse earlier state
+
+
+def child(workdir: str, api_stable: str, api_dev: str, argv: list) -> int:
+    """Run a headless command in :param:`workdir`, with release metadata pointed at the local upstream."""
+
+    import VBPatcher.appglobals.globals as g  # Changes into the package directory
+    import VBPatcher.cli.cli
+    from VBPatcher.apploggers.loggers import _LogGenerator
+
+    os.chdir(workdir)  # Keep store, caches & downloads in the work directory
+    for path in ('patch-files/stable', 'patch-files/development', 'logs'):
+        os.makedirs(path, exist_ok=True)
+
+    g.api_stable = api_stable
+    g.api_dev = api_dev
+    _LogGenerator._listener.handlers[0].baseFilename = os.path.join(
+        workdir, 'logs', 'VBPatcherLog.log')  # Not yet opened
+
+    return VBPatcher.cli.cli.main(argv, workdir)
+
+
+def run(workdir: str, upstream: Upstream, name: str, argv: list,
+        i: int) -> dict:
+    """Time one command in a fresh process, returning its wall time & traced phases."""
+
+    trace: str = os.path.join(workdir, f'trace-{name}-{i}.jsonl')
+    cmd: list = [
+        sys.executable,
+        os.path.abspath(__file__), '--child', workdir, upstream.api_stable,
+        upstream.api_dev, '--progress', 'none', '--trace', trace
+    ] + argv
+
+    started: float = perf_counter()
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    wall: float = perf_counter() - started
+
+    phases: dict = {}
+    if os.path.exists(trace):
+        with open(trace) as fh:
+            for line in fh:
+                span: dict = json.loads(line)
+                phase: dict = phases.setdefault(
+                    span['name'], {
+                        'count': 0,
+                        'wall_ms': 0.0,
+                        'cpu_ms': 0.0,
+                        'bytes': 0,
+                        'files': 0
+                    })
+                phase['count'] += 1
+                for key in ('wall_ms', 'cpu_ms', 'bytes', 'files'):
+                    phase[key] += span[key]
+
+    if proc.returncode:
+        sys.stderr.write(proc.stdout + proc.stderr)
+
+    command: float = phases.get('command', {}).get('wall_ms', 0.0)
+    return {
+        'exit': proc.returncode,
+        'wall_ms': wall * 1000,
+        'startup_ms': wall * 1000 - command,  # Interpreter start & imports
+        'phases': phases
+    }
+
+
+def summarize(results: list) -> dict:
+    """Reduce repeated runs to the best wall time, with the phases of that run and its download throughput."""
+
+    best: dict = min(results, key=lambda result: result['wall_ms'])
+    download: dict | None = best['phases'].get('download')
+    summary: dict = {
+        'exit': max(result['exit'] for result in results),
+        'wall_ms': best['wall_ms'],
+        'wall_ms_all': [result['wall_ms'] for result in results],
+        'startup_ms': best['startup_ms'],
+        'phases': best['phases']
+    }
+    if download and download['wall_ms']:
+        summary['download_mb_s'] = (download['bytes'] / 2**20) / (
+            download['wall_ms'] / 1000 / download['count'])
+    return summary
+
+
+def commit() -> str | None:
+    """Return the checked out commit, if any."""
+
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                              cwd=ROOT,
+                              capture_output=True,
+                              text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--files', type=int, default=40)
+    parser.add_argument('--size', type=int, default=64 * 1024)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--rate', type=float, default=0)
+    parser.add_argument('--no-ranges', action='store_true')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--out', default=None)
+    args = parser.parse_args()
+
+    upstream = Upstream(args.files, args.size, args.latency, args.rate,
+                        not args.no_ranges).start()
+    runs: dict = {name: [] for name, _ in RUNS}
+
+    try:
+        for i in range(args.repeat):
+            with tempfile.TemporaryDirectory() as workdir:
+                for name, argv in RUNS:
+                    runs[name].append(run(workdir, upstream, name, argv, i))
+    finally:
+        upstream.stop()
+
+    report: dict = {
+        'commit': commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'params': vars(args),
+        'archive_bytes': upstream.archive_bytes,
+        'runs': {
+            name: summarize(results)
+            for name, results in runs.items()
+        }
+    }
+
+    print(f'{args.files} files x {args.size} B, latency {args.latency}s, '
+          f'rate {args.rate or "unthrottled"}, commit {report["commit"]}')
+    for name, summary in report['runs'].items():
+        phases: str = ', '.join(f'{phase} {stats["wall_ms"]:.0f}'
+                                for phase, stats in summary['phases'].items()
+                                if phase != 'command')
+        throughput: str = (f', {summary["download_mb_s"]:.1f} MB/s'
+                           if 'download_mb_s' in summary else '')
+        print(
+            f'{name:>12}: {summary["wall_ms"]:8.1f} ms '
+            f'(exit {summary["exit"]}, start-up {summary["startup_ms"]:.0f} ms'
+            f'{throughput}) [{phases}]')
+
+    if args.out:
+        with open(args.out, 'w') as fh:
+            json.dump(report, fh, indent=2)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        sys.exit(child(sys.argv[2], sys.argv[3], sys.argv[4], sys.argv[5:]))
+    main()
@@ -0,0 +1,259 @@
+"""Local stand-in for the GitHub releases API and builds.bepinex.dev, serving synthetic BepInEx patches.
+
+Serves:
+
+    - `/repos/BepInEx/BepInEx/releases/latest`: GitHub release JSON, whose second asset is the stable archive.
+    - `/projects/bepinex_be`: builds page listing `builds` builds, newest first, with the markup scraped for the dev build.
+    - The stable & dev archives linked from both: zips shaped like BepInEx releases, of configurable file count & size.
+
+Responses carry `ETag`s and honour `If-None-Match`, `Range` & `If-Range`; `latency` delays every response and `rate` throttles bodies.
+
+Used by `benchmarks/suite.py`; run directly to serve until interrupted:
+
+    `python benchmarks/upstream.py [--files 40] [--size 65536] [--latency 0.05] [--rate 0]`
+"""
+
+import argparse
+import hashlib
+import http.server
+import io
+import json
+import random
+import threading
+import time
+import zipfile
+
+STABLE_VERSION: str = '5.4.22.0'
+DEV_BUILD: str = '577'
+DEV_HASH: str = 'ec79ad0'
+
+
+def build_zip(files: int, size: int, seed: int) -> bytes:
+    """Return a zip archive shaped like a BepInEx release, with :param:`files` plugin assemblies of :param:`size` bytes."""
+
+    rng = random.Random(seed)
+
+    def blob(n: int) -> bytes:
+        half: int = n // 2  # Half random, half compressible, like real assemblies
+        return rng.randbytes(half) + bytes(n - half)
+
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('doorstop_config.ini',
+                         '[UnityDoorstop]\nenabled=true\n')
+        archive.writestr('winhttp.dll', blob(size))
+        archive.writestr('changelog.txt', f'BepInEx build {seed}\n')
+        archive.writestr('BepInEx/config/BepInEx.cfg', '[Logging]\n')
+        for i in range(files):
+            folder: str = 'core' if i % 3 else 'plugins'
+            archive.writestr(f'BepInEx/{folder}/Assembly{i:03d}.dll',
+                             blob(size))
+    return buf.getvalue()
+
+
+def dev_link(build: int = int(DEV_BUILD), commit: str = DEV_HASH) -> str:
+    """Return builds-page link of a dev archive."""
+
+    return f'/projects/bepinex_be/{build}/BepInEx_UnityMono_x64_{commit}_6.0.0-be.{build}.zip'
+
+
+def builds_page(builds: int = 1) -> str:
+    """Return a builds page listing :param:`builds` builds, newest (:data:`DEV_BUILD`) first, shaped like builds.bepinex.dev."""
+
+    rng = random.Random(builds)
+    items: list = []
+    for i in range(builds):
+        build: int = int(DEV_BUILD) - i
+        commit: str = DEV_HASH if not i else f'{rng.getrandbits(28):07x}'
+        changes: str = ''.join(
+            f'<li><code>{rng.getrandbits(28):07x}</code> Change {n} of build {build}</li>'
+            for n in range(rng.randint(1, 6)))
+        links: str = ''.join(
+            f'<a class="artifact-link" href="{dev_link(build, commit).replace("UnityMono_x64", flavour)}">'
+            f'BepInEx {flavour.replace("_", " ")}</a>' for flavour in (
+                'UnityIL2CPP_x64', 'UnityMono_x64', 'UnityMono_x86',
+                'UnityIL2CPP_x86', 'NetLauncher', 'NET.Framework'))
+        items.append(
+            '<div class="artifact-item"><div class="artifact-details">'
+            f'<span class="artifact-id">#{build}</span>'
+            f'<a class="hash-button" href="https://github.com/BepInEx/BepInEx/commit/{commit}">{commit}</a>'
+            f'<span class="build-date">2022-0{1 + i % 9}-1{i % 10}</span></div>'
+            f'<div class="changelog"><ul>{changes}</ul></div>'
+            f'<div class="artifacts-list">{links}</div></div>')
+
+    return ('<!DOCTYPE html><html><head><title>BepInEx Bleeding Edge builds'
+            '</title><link rel="stylesheet" href="/static/style.css"></head>'
+            '<body><header><nav><a href="/">Home</a></nav></header><main>'
+            f'{"".join(items)}</main></body></html>')
+
+
+class Upstream:
+    """Threaded HTTP server standing in for the GitHub API & builds.bepinex.dev."""
+
+    def __init__(self,
+                 files: int = 40,
+                 size: int = 64 * 1024,
+                 latency: float = 0.0,
+                 rate: float = 0.0,
+                 ranges: bool = True,
+                 builds: int = 20) -> None:
+        self.latency = latency  # Seconds before each response
+        self.rate = rate  # Body bytes per second, 0 for unthrottled
+        self.ranges = ranges
+        self.hits: list = []  # (method, path, status)
+        self._lock = threading.Lock()
+
+        upstream = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def do_HEAD(self) -> None:
+                upstream._serve(self, head=True)
+
+            def do_GET(self) -> None:
+                upstream._serve(self)
+
+        self.server = http.server.ThreadingHTTPServer(('127.0.0.1', 0),
+                                                      Handler)
+        self.server.daemon_threads = True
+        host: str = f'http://127.0.0.1:{self.server.server_port}'
+        self.base: str = host
+
+        stable: bytes = build_zip(files, size, 1)
+        dev: bytes = build_zip(files + files // 10, size, 2)
+        stable_path: str = f'/releases/download/v{STABLE_VERSION}/BepInEx_x64_{STABLE_VERSION}.zip'
+        dev_path: str = dev_link()
+
+        release: dict = {
+            'tag_name':
+            f'v{STABLE_VERSION}',
+            'assets': [{
+                'name': f'BepInEx_x86_{STABLE_VERSION}.zip',
+                'browser_download_url': f'{host}/missing.zip'
+            }, {
+                'name': f'BepInEx_x64_{STABLE_VERSION}.zip',
+                'browser_download_url': f'{host}{stable_path}'
+            }]
+        }
+        page: str = builds_page(builds)
+
+        self.files: dict = {
+            '/repos/BepInEx/BepInEx/releases/latest':
+            (json.dumps(release).encode(), 'application/json'),
+            '/projects/bepinex_be': (page.encode(), 'text/html'),
+            stable_path: (stable, 'application/zip'),
+            dev_path: (dev, 'application/zip')
+        }
+        self.etags: dict = {
+            path: f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+            for path, (body, _) in self.files.items()
+        }
+
+    @property
+    def api_stable(self) -> str:
+        return f'{self.base}/repos/BepInEx/BepInEx/releases/latest'
+
+    @property
+    def api_dev(self) -> str:
+        return f'{self.base}/projects/bepinex_be'
+
+    @property
+    def archive_bytes(self) -> int:
+        return sum(
+            len(body) for body, kind in self.files.values()
+            if kind == 'application/zip')
+
+    def start(self) -> 'Upstream':
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _serve(self, handler, head: bool = False) -> None:
+        """Answer one request, honouring conditional & range headers."""
+
+        path: str = '/' + '/'.join(p for p in handler.path.split('/') if p)
+        if self.latency:
+            time.sleep(self.latency)
+
+        if path not in self.files:
+            return self._reply(handler, 404, path, b'', {}, head)
+
+        body, kind = self.files[path]
+        etag: str = self.etags[path]
+        headers: dict = {'ETag': etag, 'Content-Type': kind}
+        if self.ranges:
+            headers['Accept-Ranges'] = 'bytes'
+
+        if handler.headers.get('If-None-Match') == etag:
+            return self._reply(handler, 304, path, b'', headers, head)
+
+        rng: str | None = handler.headers.get('Range')
+        if_range: str | None = handler.headers.get('If-Range')
+        if self.ranges and rng and if_range in (None, etag):
+            first, last = rng.split('=', 1)[1].split('-')
+            start: int = int(first)
+            end: int = min(int(last), len(body) - 1) if last else len(body) - 1
+            if start >= len(body):
+                headers['Content-Range'] = f'bytes */{len(body)}'
+                return self._reply(handler, 416, path, b'', headers, head)
+            headers['Content-Range'] = f'bytes {start}-{end}/{len(body)}'
+            return self._reply(handler, 206, path, body[start:end + 1],
+                               headers, head)
+
+        return self._reply(handler, 200, path, body, headers, head)
+
+    def _reply(self, handler, status: int, path: str, body: bytes,
+               headers: dict, head: bool) -> None:
+        """Send a response, throttling its body to :attr:`rate` bytes per second."""
+
+        with self._lock:
+            self.hits.append((handler.command, path, status))
+
+        handler.send_response(status)
+        for name, value in headers.items():
+            handler.send_header(name, value)
+        handler.send_header('Content-Length', str(len(body)))
+        handler.end_headers()
+        if head or not body:
+            return
+
+        chunk: int = 64 * 1024
+        started: float = time.perf_counter()
+        try:
+            for offset in range(0, len(body), chunk):
+                handler.wfile.write(body[offset:offset + chunk])
+                if self.rate:
+                    ahead: float = (offset + chunk) / self.rate - (
+                        time.perf_counter() - started)
+                    if ahead > 0:
+                        time.sleep(ahead)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--files', type=int, default=40)
+    parser.add_argument('--size', type=int, default=64 * 1024)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--rate', type=float, default=0)
+    args = parser.parse_args()
+
+    upstream = Upstream(args.files, args.size, args.latency, args.rate)
+    print(f'api_stable = {upstream.api_stable}')
+    print(f'api_dev = {upstream.api_dev}')
+    try:
+        upstream.server.serve_forever()
+    except KeyboardInterrupt:
+        upstream.stop()
+
+
+if __name__ == '__main__':
+    main()